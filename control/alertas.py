@@ -0,0 +1,205 @@
+import heapq
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from modelo.Entidades.Equipo import Equipo
+from modelo.Entidades.TareaMantenimiento import TareaMantenimiento
+from modelo.Entidades.TipoMantenimiento import TipoMantenimiento
+from modelo.SistemaMantenimiento import SistemaMantenimiento
+
+# Un equipo entra en alerta cuando pasan más de 3 días completos sin mantenimiento
+# preventivo, es decir, a partir de 4 días después de la última fecha de referencia.
+PLAZO_ALERTA = timedelta(days=4)
+
+
+class MotorAlertas:
+    """
+    Clase que mantiene de forma incremental los equipos que requieren mantenimiento.
+
+    Se suscribe a las notificaciones del sistema y conserva, por equipo, la última fecha
+    programada de mantenimiento preventivo, el conjunto de equipos que superan sus horas
+    de mantenimiento y un montículo con la próxima fecha de vencimiento de cada equipo.
+    """
+
+    def __init__(self, sistema: SistemaMantenimiento):
+        """
+        Inicializador de la clase MotorAlertas.
+
+        :param sistema: Instancia del sistema de mantenimiento a vigilar.
+        """
+        self.sistema = sistema
+        self._orden: Dict[str, int] = {}
+        self._siguiente_orden = 0
+        self._ultima_preventiva: Dict[str, datetime] = {}
+        # Tareas preventivas conocidas: ID de tarea -> (ID de equipo, fecha programada)
+        self._preventivas: Dict[str, Tuple[str, datetime]] = {}
+        self._por_horas: Set[str] = set()
+        self._vencimiento: Dict[str, datetime] = {}
+        self._monticulo: List[Tuple[datetime, int, str]] = []
+        self._vencidos: Set[str] = set()
+
+        for equipo in sistema.equipos:
+            self._alta_equipo(equipo)
+        # El historial diferido no se carga: basta la última preventiva de cada equipo
+        for tarea in sistema.tareas_por_tipo(TipoMantenimiento.PREVENTIVO, cargar=False):
+            self._registrar_preventiva(tarea)
+        for equipo_id, fecha in sistema.ultimas_preventivas_pendientes().items():
+            ultima = self._ultima_preventiva.get(equipo_id)
+            if ultima is None or fecha > ultima:
+                self._ultima_preventiva[equipo_id] = fecha
+                self._programar_vencimiento(equipo_id)
+        sistema.suscribir(self._al_modificar_sistema)
+
+    def alertas(self, hoy: Optional[datetime] = None) -> List[Equipo]:
+        """
+        Devuelve los equipos que requieren atención de mantenimiento.
+
+        Las consultas sucesivas deben usar fechas de referencia no decrecientes.
+
+        :param hoy: Fecha de referencia. Por defecto, la fecha actual.
+        :return: Lista de equipos en alerta, en orden de registro.
+        """
+        hoy = hoy or datetime.now()
+        while self._monticulo and self._monticulo[0][0] <= hoy:
+            vencimiento, _, equipo_id = heapq.heappop(self._monticulo)
+            # Las entradas obsoletas (el vencimiento del equipo cambió) se descartan
+            if self._vencimiento.get(equipo_id) == vencimiento:
+                self._vencidos.add(equipo_id)
+
+        ids = sorted(self._por_horas | self._vencidos, key=self._orden.__getitem__)
+        return [self.sistema.obtener_equipo(equipo_id) for equipo_id in ids]
+
+    def _al_modificar_sistema(self, operacion: str, coleccion: str, entidad):
+        """
+        Actualiza el estado del motor ante una modificación del sistema.
+
+        :param operacion: "alta", "cambio", "baja" o "carga".
+        :param coleccion: Colección afectada.
+        :param entidad: Entidad afectada.
+        """
+        if coleccion == "equipos":
+            if operacion == "alta":
+                self._alta_equipo(entidad)
+            elif operacion == "baja":
+                self._baja_equipo(entidad.id)
+            else:
+                self._actualizar_horas(entidad)
+                self._programar_vencimiento(entidad.id)
+        elif coleccion == "tareas":
+            self._olvidar_preventiva(entidad.id)
+            if operacion != "baja" and entidad.tipo == TipoMantenimiento.PREVENTIVO:
+                self._registrar_preventiva(entidad)
+
+    def _alta_equipo(self, equipo: Equipo):
+        """
+        Registra un equipo nuevo en el motor.
+
+        :param equipo: Equipo registrado.
+        """
+        self._orden[equipo.id] = self._siguiente_orden
+        self._siguiente_orden += 1
+        self._actualizar_horas(equipo)
+        self._programar_vencimiento(equipo.id)
+
+    def _baja_equipo(self, equipo_id: str):
+        """
+        Elimina del motor toda la información de un equipo.
+
+        :param equipo_id: Identificador del equipo eliminado.
+        """
+        self._orden.pop(equipo_id, None)
+        self._ultima_preventiva.pop(equipo_id, None)
+        self._vencimiento.pop(equipo_id, None)
+        self._por_horas.discard(equipo_id)
+        self._vencidos.discard(equipo_id)
+
+    def _actualizar_horas(self, equipo: Equipo):
+        """
+        Actualiza la alerta por horas de uso de un equipo.
+
+        :param equipo: Equipo a evaluar.
+        """
+        if equipo.horas_uso >= equipo.horas_mantenimiento:
+            self._por_horas.add(equipo.id)
+        else:
+            self._por_horas.discard(equipo.id)
+
+    def _registrar_preventiva(self, tarea: TareaMantenimiento):
+        """
+        Toma en cuenta una tarea preventiva para la última fecha de mantenimiento de su equipo.
+
+        :param tarea: Tarea preventiva.
+        """
+        equipo_id = tarea.equipo.id
+        self._preventivas[tarea.id] = (equipo_id, tarea.fecha_programada)
+        ultima = self._ultima_preventiva.get(equipo_id)
+        if ultima is None or tarea.fecha_programada > ultima:
+            self._ultima_preventiva[equipo_id] = tarea.fecha_programada
+            self._programar_vencimiento(equipo_id)
+
+    def _olvidar_preventiva(self, tarea_id: str):
+        """
+        Descarta una tarea preventiva conocida. Solo si era la más reciente de su equipo
+        se recalcula la última fecha a partir de las tareas del equipo.
+
+        :param tarea_id: Identificador de la tarea.
+        """
+        conocida = self._preventivas.pop(tarea_id, None)
+        if conocida is None:
+            return
+        equipo_id, fecha = conocida
+        if self._ultima_preventiva.get(equipo_id) != fecha:
+            return
+
+        fechas = [self._preventivas[t.id][1] for t in self.sistema.tareas_por_equipo(equipo_id)
+                  if t.id in self._preventivas]
+        if fechas:
+            self._ultima_preventiva[equipo_id] = max(fechas)
+        else:
+            self._ultima_preventiva.pop(equipo_id, None)
+        self._programar_vencimiento(equipo_id)
+
+    def _programar_vencimiento(self, equipo_id: str):
+        """
+        Calcula la fecha a partir de la cual el equipo entra en alerta por falta de
+        mantenimiento preventivo y la agrega al montículo.
+
+        :param equipo_id: Identificador del equipo.
+        """
+        equipo = self.sistema.obtener_equipo(equipo_id)
+        if equipo is None:
+            return
+        referencia = self._ultima_preventiva.get(equipo_id, equipo.fecha_instalacion)
+        vencimiento = referencia + PLAZO_ALERTA
+        if self._vencimiento.get(equipo_id) == vencimiento:
+            return
+        self._vencimiento[equipo_id] = vencimiento
+        self._vencidos.discard(equipo_id)
+        heapq.heappush(self._monticulo, (vencimiento, self._orden[equipo_id], equipo_id))
+
+        # Reconstruir el montículo cuando las entradas obsoletas superan a las vigentes
+        if len(self._monticulo) > 2 * len(self._vencimiento) + 64:
+            self._monticulo = [(v, self._orden[e], e) for e, v in self._vencimiento.items()
+                               if e not in self._vencidos]
+            heapq.heapify(self._monticulo)
+
+
+def alertas_desde_historial(sistema: SistemaMantenimiento, historial,
+                            hoy: Optional[datetime] = None) -> List[Equipo]:
+    """
+    Calcula los equipos que requieren atención a partir de un HistorialColumnar, con el
+    mismo criterio que MotorAlertas pero sin estado incremental.
+
+    :param sistema: Instancia del sistema de mantenimiento.
+    :param historial: Historial columnar de las tareas del sistema.
+    :param hoy: Fecha de referencia. Por defecto, la fecha actual.
+    :return: Lista de equipos en alerta, en orden de registro.
+    """
+    hoy = hoy or datetime.now()
+    ultima_preventiva = historial.ultima_preventiva_por_equipo()
+    for equipo_id, fecha in sistema.ultimas_preventivas_pendientes().items():
+        if equipo_id not in ultima_preventiva or fecha > ultima_preventiva[equipo_id]:
+            ultima_preventiva[equipo_id] = fecha
+    return [equipo for equipo in sistema.equipos
+            if equipo.horas_uso >= equipo.horas_mantenimiento
+            or ultima_preventiva.get(equipo.id, equipo.fecha_instalacion) + PLAZO_ALERTA <= hoy]
@@ -0,0 +1,238 @@
+import json
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+from control.alertas import PLAZO_ALERTA
+from control.historial import ResumenHistorial
+from control.reportes import aporte_tarea
+from modelo.Entidades.EstadoTarea import EstadoTarea
+from modelo.Entidades.TareaMantenimiento import TareaMantenimiento
+from modelo.SistemaMantenimiento import SistemaMantenimiento
+from modelo.persistencia import dict_a_tarea, escribir_json_atomico, serializar_fecha, tarea_a_dict
+
+# Estados de las tareas que ya no cambian y pueden archivarse
+ESTADOS_ARCHIVABLES = (EstadoTarea.COMPLETADA, EstadoTarea.CANCELADA)
+
+# Antigüedad por defecto a partir de la cual se archivan las tareas
+ANTIGUEDAD_ARCHIVO = timedelta(days=365)
+
+
+class ArchivoHistorico:
+    """
+    Clase que archiva las tareas terminadas y antiguas en segmentos mensuales inmutables.
+
+    Cada archivado escribe, por mes de la fecha programada, un segmento NDJSON nuevo con
+    una tarea por línea y nunca modifica los existentes. Un índice guarda el resumen de
+    cada segmento, de modo que los reportes suman lo archivado sin leer los segmentos;
+    el detalle de un mes se lee solo cuando se pide. El índice también registra los
+    equipos y técnicos de cada segmento, que no deben eliminarse del sistema mientras
+    tengan tareas archivadas.
+    """
+
+    def __init__(self, carpeta: str = "datos/archivo"):
+        """
+        Inicializador de la clase ArchivoHistorico.
+
+        :param carpeta: Carpeta donde se guardan los segmentos y el índice.
+        """
+        self.carpeta = Path(carpeta)
+        self.carpeta.mkdir(parents=True, exist_ok=True)
+        self.archivo_indice = self.carpeta / "indice.json"
+        self._segmentos: Dict[str, dict] = {}
+        self._resumen: Optional[ResumenHistorial] = None
+        self._equipos: Set[str] = set()
+        self._tecnicos: Set[str] = set()
+
+        if self.archivo_indice.exists():
+            with open(self.archivo_indice, 'r') as f:
+                self._segmentos = json.load(f)["segmentos"]
+
+        for segmento in self._segmentos.values():
+            self._equipos.update(segmento["equipos"])
+            self._tecnicos.update(segmento["tecnicos"])
+
+    def meses(self) -> List[str]:
+        """
+        Devuelve los meses con tareas archivadas, en formato AAAA-MM y en orden.
+        """
+        return sorted({segmento["mes"] for segmento in self._segmentos.values()})
+
+    def cantidad(self) -> int:
+        """
+        Devuelve la cantidad total de tareas archivadas.
+        """
+        return sum(segmento["tareas"] for segmento in self._segmentos.values())
+
+    def equipo_tiene_tareas(self, equipo_id: str) -> bool:
+        """
+        Indica si un equipo tiene tareas archivadas.
+
+        :param equipo_id: Identificador del equipo.
+        """
+        return equipo_id in self._equipos
+
+    def tecnico_tiene_tareas(self, tecnico_id: str) -> bool:
+        """
+        Indica si un técnico tiene tareas archivadas, completadas o canceladas.
+
+        :param tecnico_id: Identificador del técnico.
+        """
+        return tecnico_id in self._tecnicos
+
+    def resumen(self) -> ResumenHistorial:
+        """
+        Devuelve la suma de los resúmenes de todos los segmentos.
+        """
+        if self._resumen is None:
+            resumen = ResumenHistorial.vacio()
+            for segmento in self._segmentos.values():
+                resumen = resumen.combinar(ResumenHistorial(**segmento["resumen"]))
+            self._resumen = resumen
+        return self._resumen
+
+    def archivar(self, sistema: SistemaMantenimiento, antes_de: Optional[datetime] = None,
+                 guardar: Optional[Callable[[], object]] = None) -> int:
+        """
+        Mueve al archivo las tareas completadas o canceladas programadas antes de una fecha
+        y las elimina del sistema.
+
+        Los segmentos y el índice se escriben antes de eliminar las tareas, de modo que una
+        interrupción nunca pierde una tarea, aunque puede dejarla a la vez en el archivo y
+        en los datos guardados. Para acortar ese intervalo, las eliminaciones se guardan
+        enseguida con la función guardar. Si aun así quedó alguna, el siguiente archivado
+        la reconoce por su ID y solo la elimina del sistema, sin volver a escribirla.
+
+        :param sistema: Instancia del sistema de mantenimiento.
+        :param antes_de: Fecha de corte. Por defecto, un año antes de hoy.
+        :param guardar: Función que guarda el sistema de inmediato, como
+            GuardadoDiferido.guardar_ahora. Por defecto no se guarda.
+        :return: Cantidad de tareas archivadas.
+        :raises ValueError: Si la fecha de corte es demasiado reciente: las tareas
+            preventivas de los últimos días aún intervienen en las alertas.
+        """
+        antes_de = antes_de or datetime.now() - ANTIGUEDAD_ARCHIVO
+        if antes_de > datetime.now() - PLAZO_ALERTA:
+            raise ValueError(f"La fecha de corte debe ser anterior a {PLAZO_ALERTA.days} días atrás")
+
+        with sistema.bloqueo:
+            por_mes: Dict[str, List[TareaMantenimiento]] = defaultdict(list)
+            for estado in ESTADOS_ARCHIVABLES:
+                for tarea in sistema.tareas_por_estado(estado):
+                    if tarea.fecha_programada < antes_de:
+                        por_mes[f"{tarea.fecha_programada:%Y-%m}"].append(tarea)
+            if not por_mes:
+                return 0
+
+            nuevos = False
+            for mes in sorted(por_mes):
+                ya_archivadas = self._ids_archivados(mes)
+                tareas = [tarea for tarea in por_mes[mes] if tarea.id not in ya_archivadas]
+                if tareas:
+                    self._escribir_segmento(mes, tareas)
+                    nuevos = True
+            if nuevos:
+                self._guardar_indice()
+
+            archivadas = 0
+            for tareas in por_mes.values():
+                for tarea in tareas:
+                    sistema.eliminar_tarea(tarea.id)
+                    archivadas += 1
+            if guardar is not None:
+                guardar()
+        return archivadas
+
+    def tareas_archivadas(self, sistema: SistemaMantenimiento, mes: str) -> Iterator[TareaMantenimiento]:
+        """
+        Lee las tareas archivadas de un mes, enlazadas con los equipos y técnicos del sistema.
+
+        Las tareas cuyo equipo o técnico ya no existe se informan y se omiten; no debería
+        haberlas, porque los equipos y técnicos con tareas archivadas no se eliminan.
+
+        :param sistema: Sistema con los equipos y técnicos actuales.
+        :param mes: Mes en formato AAAA-MM.
+        :return: Iterador de tareas, que no pertenecen al sistema.
+        """
+        equipos = {equipo.id: equipo for equipo in sistema.equipos}
+        tecnicos = {tecnico.id: tecnico for tecnico in sistema.tecnicos}
+        vistas = set()
+        for datos in self._leer_mes(mes):
+            # Un segmento escrito por un archivado anterior que no llegó a guardarse puede
+            # repetir tareas de otro
+            if datos["id"] in vistas:
+                continue
+            vistas.add(datos["id"])
+            tarea = dict_a_tarea(datos, equipos, tecnicos)
+            if tarea:
+                yield tarea
+
+    def _leer_mes(self, mes: str) -> Iterator[dict]:
+        """
+        Lee las tareas serializadas de los segmentos de un mes, en orden de escritura.
+
+        :param mes: Mes en formato AAAA-MM.
+        :return: Iterador de diccionarios de tareas.
+        """
+        for nombre in sorted(n for n, segmento in self._segmentos.items() if segmento["mes"] == mes):
+            with open(self.carpeta / nombre, 'r') as f:
+                for linea in f:
+                    yield json.loads(linea)
+
+    def _ids_archivados(self, mes: str) -> Set[str]:
+        """
+        Devuelve los IDs de las tareas ya archivadas en un mes.
+
+        :param mes: Mes en formato AAAA-MM.
+        """
+        return {datos["id"] for datos in self._leer_mes(mes)}
+
+    def _escribir_segmento(self, mes: str, tareas: List[TareaMantenimiento]):
+        """
+        Escribe un segmento nuevo con las tareas de un mes y registra su resumen.
+
+        :param mes: Mes en formato AAAA-MM.
+        :param tareas: Tareas a archivar.
+        """
+        parte = 1 + sum(1 for segmento in self._segmentos.values() if segmento["mes"] == mes)
+        nombre = f"{mes}.{parte}.ndjson"
+        ruta = self.carpeta / nombre
+        temporal = ruta.with_suffix(ruta.suffix + ".tmp")
+
+        resumen = ResumenHistorial.vacio()
+        por_equipo, por_tecnico, fallas = defaultdict(int), defaultdict(int), defaultdict(int)
+        with open(temporal, 'w') as f:
+            for tarea in tareas:
+                f.write(json.dumps(tarea_a_dict(tarea),
+                                   default=serializar_fecha) + "\n")
+                equipo_id, tecnico_id, tipo, duracion, falla = aporte_tarea(tarea)
+                por_equipo[equipo_id] += 1
+                if tecnico_id is not None:
+                    por_tecnico[tecnico_id] += 1
+                resumen.por_tipo[tipo] = resumen.por_tipo.get(tipo, 0) + 1
+                if duracion is not None:
+                    resumen.suma_duracion += duracion
+                    resumen.cantidad_duracion += 1
+                if falla is not None:
+                    fallas[falla] += 1
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, ruta)
+
+        resumen.por_equipo = dict(por_equipo)
+        resumen.completadas_por_tecnico = dict(por_tecnico)
+        resumen.fallas_por_equipo = dict(fallas)
+        tecnicos = sorted({tarea.tecnico_asignado.id for tarea in tareas})
+        self._segmentos[nombre] = {"mes": mes, "tareas": len(tareas), "resumen": vars(resumen),
+                                   "equipos": sorted(por_equipo), "tecnicos": tecnicos}
+        self._equipos.update(por_equipo)
+        self._tecnicos.update(tecnicos)
+        self._resumen = None
+
+    def _guardar_indice(self):
+        """
+        Reescribe el índice de segmentos de forma atómica.
+        """
+        escribir_json_atomico(self.archivo_indice, {"segmentos": self._segmentos})
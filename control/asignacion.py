@@ -0,0 +1,176 @@
+import heapq
+from typing import AbstractSet, Callable, Dict, Iterable, List, Optional, Tuple
+
+from modelo.Entidades.EstadoTarea import EstadoTarea
+from modelo.Entidades.TareaMantenimiento import TareaMantenimiento
+from modelo.Entidades.Tecnico import Tecnico
+from modelo.SistemaMantenimiento import SistemaMantenimiento
+
+# Duración supuesta de una tarea abierta, que aún no tiene duración registrada
+DURACION_ESTIMADA_MINUTOS = 60
+
+# Estados de las tareas que forman parte de la carga de trabajo de un técnico
+ESTADOS_ABIERTOS = (EstadoTarea.PENDIENTE, EstadoTarea.EN_PROCESO)
+
+
+def _clave_especialidad(especialidad: str) -> str:
+    """
+    Normaliza una especialidad para compararla sin distinguir mayúsculas ni espacios.
+
+    :param especialidad: Especialidad tal como fue ingresada.
+    :return: Especialidad normalizada.
+    """
+    return especialidad.strip().casefold()
+
+
+class MotorAsignacion:
+    """
+    Clase que asigna técnicos a tareas pendientes repartiendo la carga de trabajo.
+
+    La carga de un técnico son los minutos estimados de sus tareas abiertas. Cada tarea
+    se asigna al técnico activo con menos carga entre los de la especialidad que requiere,
+    tomado de un montículo por especialidad; las tareas más largas se asignan primero,
+    lo que reparte mejor la carga. Un lote de n tareas cuesta O(n log n).
+
+    Con un calendario, solo se elige un técnico libre en el horario de la tarea: los más
+    descargados que están ocupados se saltean y vuelven al montículo.
+    """
+
+    def __init__(self, sistema: SistemaMantenimiento,
+                 especialidad_requerida: Optional[Callable[[TareaMantenimiento], Optional[str]]] = None,
+                 duracion_estimada: Optional[Callable[[TareaMantenimiento], int]] = None,
+                 calendario=None):
+        """
+        Inicializador de la clase MotorAsignacion.
+
+        :param sistema: Instancia del sistema de mantenimiento.
+        :param especialidad_requerida: Función que devuelve la especialidad que requiere una
+            tarea, o None si cualquier técnico puede hacerla. Por defecto, la especialidad
+            del técnico asignado actualmente.
+        :param duracion_estimada: Función que devuelve los minutos estimados de una tarea
+            abierta. Por defecto, DURACION_ESTIMADA_MINUTOS.
+        :param calendario: CalendarioTecnicos opcional con la agenda de los técnicos. Por
+            defecto no se verifican los horarios.
+        """
+        self.sistema = sistema
+        self.calendario = calendario
+        self.especialidad_requerida = especialidad_requerida or (lambda tarea: tarea.tecnico_asignado.especialidad)
+        self.duracion_estimada = duracion_estimada or (lambda tarea: DURACION_ESTIMADA_MINUTOS)
+
+    def duracion(self, tarea: TareaMantenimiento) -> int:
+        """
+        Devuelve los minutos con los que una tarea cuenta en la carga de su técnico.
+
+        :param tarea: Tarea abierta.
+        :return: Duración registrada o estimada, al menos un minuto.
+        """
+        return max(1, tarea.duracion_minutos or self.duracion_estimada(tarea))
+
+    def cargas(self, excluir: AbstractSet[str] = frozenset()) -> Dict[str, int]:
+        """
+        Calcula la carga de trabajo de cada técnico activo.
+
+        :param excluir: IDs de tareas que no se cuentan.
+        :return: Minutos de tareas abiertas por ID de técnico.
+        """
+        cargas = {tecnico.id: 0 for tecnico in self.sistema.tecnicos if tecnico.activo}
+        for estado in ESTADOS_ABIERTOS:
+            for tarea in self.sistema.tareas_por_estado(estado):
+                tecnico_id = tarea.tecnico_asignado.id
+                if tecnico_id in cargas and tarea.id not in excluir:
+                    cargas[tecnico_id] += self.duracion(tarea)
+        return cargas
+
+    def asignar(self, tareas: Optional[Iterable[TareaMantenimiento]] = None
+                ) -> Tuple[List[Tuple[TareaMantenimiento, Tecnico]], List[TareaMantenimiento]]:
+        """
+        Reparte un lote de tareas pendientes entre los técnicos activos.
+
+        Las tareas del lote no cuentan en la carga inicial de su técnico actual. Las
+        asignaciones se aplican con el bloqueo del sistema tomado durante todo el lote, y
+        cada una en cuanto se decide, para que su horario ya ocupe la agenda del técnico
+        elegido al asignar las siguientes. Con calendario, el técnico actual de una tarea
+        siempre está libre para ella.
+
+        :param tareas: Tareas a asignar; se ignoran las que no están pendientes. Por
+            defecto, todas las tareas pendientes.
+        :return: Tupla con la lista de pares (tarea, técnico asignado) y la lista de tareas
+            sin ningún técnico activo de la especialidad requerida libre en su horario, que
+            conservan su técnico.
+        """
+        with self.sistema.bloqueo:
+            if tareas is None:
+                lote = self.sistema.tareas_por_estado(EstadoTarea.PENDIENTE)
+            else:
+                lote = [tarea for tarea in tareas if tarea.estado == EstadoTarea.PENDIENTE]
+            cargas = self.cargas(excluir={tarea.id for tarea in lote})
+
+            # Un montículo (carga, orden, técnico) por especialidad y uno con todos (None).
+            # Al cambiar la carga de un técnico se agrega una entrada nueva en sus dos
+            # montículos; las entradas viejas se descartan al salir.
+            orden: Dict[str, int] = {}
+            monticulos: Dict[Optional[str], list] = {None: []}
+            for tecnico in self.sistema.tecnicos:
+                if tecnico.activo:
+                    orden[tecnico.id] = len(orden)
+                    entrada = (cargas[tecnico.id], orden[tecnico.id], tecnico)
+                    monticulos[None].append(entrada)
+                    monticulos.setdefault(_clave_especialidad(tecnico.especialidad), []).append(entrada)
+            for monticulo in monticulos.values():
+                heapq.heapify(monticulo)
+
+            asignaciones, sin_tecnico = [], []
+            duraciones = {tarea.id: self.duracion(tarea) for tarea in lote}
+            for tarea in sorted(lote, key=lambda t: (-duraciones[t.id], t.fecha_programada)):
+                requerida = self.especialidad_requerida(tarea)
+                clave = None if requerida is None else _clave_especialidad(requerida)
+                tecnico = self._menos_cargado(monticulos.get(clave), cargas, self._libre_para(tarea))
+                if tecnico is None:
+                    sin_tecnico.append(tarea)
+                    continue
+                cargas[tecnico.id] += duraciones[tarea.id]
+                entrada = (cargas[tecnico.id], orden[tecnico.id], tecnico)
+                heapq.heappush(monticulos[None], entrada)
+                heapq.heappush(monticulos[_clave_especialidad(tecnico.especialidad)], entrada)
+                asignaciones.append((tarea, tecnico))
+                tarea.tecnico_asignado = tecnico
+        return asignaciones, sin_tecnico
+
+    def _libre_para(self, tarea: TareaMantenimiento) -> Optional[Callable[[Tecnico], bool]]:
+        """
+        Devuelve la función que indica si un técnico está libre en el horario de una tarea.
+
+        :param tarea: Tarea a asignar.
+        :return: Función que recibe un técnico, o None si no hay calendario.
+        """
+        if self.calendario is None:
+            return None
+        minutos = self.calendario.duracion(tarea)
+        return lambda tecnico: (tecnico.id == tarea.tecnico_asignado.id or
+                                self.calendario.esta_libre(tecnico.id, tarea.fecha_programada, minutos))
+
+    def _menos_cargado(self, monticulo: Optional[list], cargas: Dict[str, int],
+                       libre: Optional[Callable[[Tecnico], bool]] = None) -> Optional[Tecnico]:
+        """
+        Saca del montículo el técnico con menos carga, descartando las entradas obsoletas.
+
+        :param monticulo: Montículo de entradas (carga, orden, técnico), o None.
+        :param cargas: Carga actual por ID de técnico.
+        :param libre: Función que indica si un técnico está libre; los que no lo están se
+            devuelven al montículo. Por defecto, todos lo están.
+        :return: Técnico libre con menos carga, o None si el montículo no tiene ninguno.
+        """
+        ocupados = []
+        elegido = None
+        while monticulo:
+            entrada = heapq.heappop(monticulo)
+            carga, _, tecnico = entrada
+            if carga != cargas[tecnico.id]:
+                continue
+            if libre is None or libre(tecnico):
+                elegido = tecnico
+                break
+            ocupados.append(entrada)
+        for entrada in ocupados:
+            heapq.heappush(monticulo, entrada)
+        return elegido
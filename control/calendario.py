@@ -0,0 +1,311 @@
+import random
+from datetime import datetime, time, timedelta
+from typing import Callable, Dict, Optional, Tuple
+
+from control.asignacion import DURACION_ESTIMADA_MINUTOS, ESTADOS_ABIERTOS
+from modelo.Entidades.TareaMantenimiento import TareaMantenimiento
+from modelo.SistemaMantenimiento import SistemaMantenimiento
+
+Clave = Tuple[datetime, str]
+
+# Horario de trabajo en el que se buscan los horarios libres al ajustar una tarea; dura
+# lo mismo que control.recorridos.JORNADA_MINUTOS
+INICIO_JORNADA = time(8)
+FIN_JORNADA = time(16)
+
+
+class _Nodo:
+    """
+    Nodo de un árbol de intervalos: un intervalo [inicio, fin) identificado por su tarea.
+    """
+
+    __slots__ = ("clave", "fin", "prioridad", "izquierdo", "derecho", "fin_maximo")
+
+    def __init__(self, clave: Clave, fin: datetime):
+        """
+        Inicializador de la clase _Nodo.
+
+        :param clave: Tupla (inicio, ID de tarea).
+        :param fin: Fin del intervalo.
+        """
+        self.clave = clave
+        self.fin = fin
+        self.prioridad = random.random()
+        self.izquierdo: Optional[_Nodo] = None
+        self.derecho: Optional[_Nodo] = None
+        self.fin_maximo = fin
+
+    def actualizar(self):
+        """
+        Recalcula el mayor fin del subárbol a partir de los hijos.
+        """
+        fin = self.fin
+        if self.izquierdo is not None and self.izquierdo.fin_maximo > fin:
+            fin = self.izquierdo.fin_maximo
+        if self.derecho is not None and self.derecho.fin_maximo > fin:
+            fin = self.derecho.fin_maximo
+        self.fin_maximo = fin
+
+
+class ArbolIntervalos:
+    """
+    Árbol de intervalos ordenado por inicio: un treap en el que cada nodo guarda el mayor
+    fin de su subárbol. Inserciones, bajas y consultas cuestan O(log n) esperado.
+    """
+
+    def __init__(self):
+        """
+        Inicializador de la clase ArbolIntervalos.
+        """
+        self._raiz: Optional[_Nodo] = None
+        self._cantidad = 0
+
+    def __len__(self) -> int:
+        return self._cantidad
+
+    def agregar(self, clave: Clave, fin: datetime):
+        """
+        Agrega un intervalo.
+
+        :param clave: Tupla (inicio, ID de tarea), única en el árbol.
+        :param fin: Fin del intervalo, excluido.
+        """
+        menores, mayores = self._dividir(self._raiz, clave)
+        self._raiz = self._unir(self._unir(menores, _Nodo(clave, fin)), mayores)
+        self._cantidad += 1
+
+    def quitar(self, clave: Clave):
+        """
+        Quita un intervalo, si existe.
+
+        :param clave: Tupla (inicio, ID de tarea) con la que se agregó.
+        """
+        self._raiz, quitado = self._quitar(self._raiz, clave)
+        if quitado:
+            self._cantidad -= 1
+
+    def fin_maximo_antes_de(self, limite: datetime) -> Optional[datetime]:
+        """
+        Devuelve el mayor fin entre los intervalos que empiezan antes de un límite.
+
+        Un intervalo [a, b) está libre si este valor para b no existe o es menor o igual
+        que a: todos los intervalos que empiezan antes de b terminan antes de a.
+
+        :param limite: Límite para el inicio, excluido.
+        :return: Mayor fin, o None si ningún intervalo empieza antes del límite.
+        """
+        resultado = None
+        nodo = self._raiz
+        while nodo is not None:
+            if nodo.clave[0] < limite:
+                if resultado is None or nodo.fin > resultado:
+                    resultado = nodo.fin
+                izquierdo = nodo.izquierdo
+                if izquierdo is not None and (resultado is None or izquierdo.fin_maximo > resultado):
+                    resultado = izquierdo.fin_maximo
+                nodo = nodo.derecho
+            else:
+                nodo = nodo.izquierdo
+        return resultado
+
+    def _dividir(self, nodo: Optional[_Nodo], clave: Clave) -> Tuple[Optional[_Nodo], Optional[_Nodo]]:
+        """
+        Divide un subárbol en las claves menores que la indicada y las mayores o iguales.
+        """
+        if nodo is None:
+            return None, None
+        if nodo.clave < clave:
+            nodo.derecho, mayores = self._dividir(nodo.derecho, clave)
+            nodo.actualizar()
+            return nodo, mayores
+        menores, nodo.izquierdo = self._dividir(nodo.izquierdo, clave)
+        nodo.actualizar()
+        return menores, nodo
+
+    def _unir(self, menores: Optional[_Nodo], mayores: Optional[_Nodo]) -> Optional[_Nodo]:
+        """
+        Une dos subárboles en los que todas las claves del primero son menores.
+        """
+        if menores is None:
+            return mayores
+        if mayores is None:
+            return menores
+        if menores.prioridad > mayores.prioridad:
+            menores.derecho = self._unir(menores.derecho, mayores)
+            menores.actualizar()
+            return menores
+        mayores.izquierdo = self._unir(menores, mayores.izquierdo)
+        mayores.actualizar()
+        return mayores
+
+    def _quitar(self, nodo: Optional[_Nodo], clave: Clave) -> Tuple[Optional[_Nodo], bool]:
+        """
+        Quita una clave de un subárbol.
+
+        :return: Tupla con el subárbol resultante y si la clave estaba.
+        """
+        if nodo is None:
+            return None, False
+        if nodo.clave == clave:
+            return self._unir(nodo.izquierdo, nodo.derecho), True
+        if clave < nodo.clave:
+            nodo.izquierdo, quitado = self._quitar(nodo.izquierdo, clave)
+        else:
+            nodo.derecho, quitado = self._quitar(nodo.derecho, clave)
+        nodo.actualizar()
+        return nodo, quitado
+
+
+class CalendarioTecnicos:
+    """
+    Clase que mantiene la agenda de cada técnico para detectar tareas superpuestas.
+
+    Cada tarea abierta ocupa el intervalo que va desde su fecha programada hasta el fin
+    de su duración estimada. Se guarda un árbol de intervalos por técnico, actualizado con
+    las notificaciones del sistema, de modo que saber si un horario está libre o buscar el
+    siguiente horario libre no requiere recorrer las tareas.
+    """
+
+    def __init__(self, sistema: SistemaMantenimiento,
+                 duracion_estimada: Optional[Callable[[TareaMantenimiento], int]] = None,
+                 inicio_jornada: time = INICIO_JORNADA, fin_jornada: time = FIN_JORNADA):
+        """
+        Inicializador de la clase CalendarioTecnicos.
+
+        :param sistema: Instancia del sistema de mantenimiento.
+        :param duracion_estimada: Función que devuelve los minutos que ocupa una tarea sin
+            duración registrada. Por defecto, DURACION_ESTIMADA_MINUTOS.
+        :param inicio_jornada: Hora de inicio de la jornada de trabajo.
+        :param fin_jornada: Hora de fin de la jornada de trabajo.
+        :raises ValueError: Si la jornada no termina después de empezar.
+        """
+        if fin_jornada <= inicio_jornada:
+            raise ValueError("La jornada debe terminar después de empezar")
+        self.sistema = sistema
+        self.inicio_jornada = inicio_jornada
+        self.fin_jornada = fin_jornada
+        self.duracion_estimada = duracion_estimada or (lambda tarea: DURACION_ESTIMADA_MINUTOS)
+        self._arboles: Dict[str, ArbolIntervalos] = {}
+        # Intervalo registrado de cada tarea: ID de tarea -> (ID de técnico, clave)
+        self._intervalos: Dict[str, Tuple[str, Clave]] = {}
+
+        for estado in ESTADOS_ABIERTOS:
+            for tarea in sistema.tareas_por_estado(estado):
+                self.reservar(tarea)
+        sistema.suscribir(self._al_modificar_sistema)
+
+    def duracion(self, tarea: TareaMantenimiento) -> int:
+        """
+        Devuelve los minutos que ocupa una tarea en la agenda de su técnico.
+
+        :param tarea: Tarea abierta.
+        :return: Duración registrada o estimada, al menos un minuto.
+        """
+        return max(1, tarea.duracion_minutos or self.duracion_estimada(tarea))
+
+    def esta_libre(self, tecnico_id: str, inicio: datetime, minutos: int) -> bool:
+        """
+        Indica si un técnico no tiene tareas abiertas en un horario.
+
+        :param tecnico_id: Identificador del técnico.
+        :param inicio: Inicio del horario.
+        :param minutos: Duración del horario.
+        :return: True si ninguna tarea abierta del técnico se superpone con el horario.
+        """
+        arbol = self._arboles.get(tecnico_id)
+        if arbol is None:
+            return True
+        fin_maximo = arbol.fin_maximo_antes_de(inicio + timedelta(minutes=minutos))
+        return fin_maximo is None or fin_maximo <= inicio
+
+    def siguiente_libre(self, tecnico_id: str, desde: datetime, minutos: int,
+                        en_jornada: bool = False) -> datetime:
+        """
+        Busca el primer horario libre de un técnico a partir de una fecha.
+
+        Cada paso salta al mayor fin de las tareas que se superponen con el horario
+        probado, por lo que la cantidad de pasos no depende del total de tareas sino de
+        cuántos bloques ocupados consecutivos hay a partir de la fecha.
+
+        :param tecnico_id: Identificador del técnico.
+        :param desde: Fecha a partir de la cual se busca.
+        :param minutos: Duración del horario buscado.
+        :param en_jornada: Indica si el horario debe caer dentro de la jornada de trabajo.
+            Uno que no cabe antes del fin de la jornada pasa al inicio de la siguiente.
+        :return: Inicio del primer horario libre.
+        """
+        arbol = self._arboles.get(tecnico_id)
+        duracion = timedelta(minutes=minutos)
+        inicio = desde
+        while True:
+            if en_jornada:
+                inicio = self._dentro_de_jornada(inicio, duracion)
+            fin_maximo = arbol.fin_maximo_antes_de(inicio + duracion) if arbol is not None else None
+            if fin_maximo is None or fin_maximo <= inicio:
+                return inicio
+            inicio = fin_maximo
+
+    def _dentro_de_jornada(self, inicio: datetime, duracion: timedelta) -> datetime:
+        """
+        Devuelve el primer inicio, a partir del indicado, de un horario dentro de la jornada.
+
+        Un horario más largo que la jornada empieza al inicio de una y se extiende después
+        de su fin.
+
+        :param inicio: Inicio propuesto.
+        :param duracion: Duración del horario.
+        :return: Inicio ajustado a la jornada.
+        """
+        comienzo = inicio.replace(hour=self.inicio_jornada.hour, minute=self.inicio_jornada.minute,
+                                  second=0, microsecond=0)
+        if inicio < comienzo:
+            return comienzo
+        fin = inicio.replace(hour=self.fin_jornada.hour, minute=self.fin_jornada.minute, second=0, microsecond=0)
+        if inicio > comienzo and inicio + duracion > fin:
+            return comienzo + timedelta(days=1)
+        return inicio
+
+    def reservar(self, tarea: TareaMantenimiento):
+        """
+        Registra el horario de una tarea en la agenda de su técnico, reemplazando el que
+        tuviera. Las tareas se registran solas al agregarse al sistema; reservar sirve para
+        ocupar el horario de una tarea que todavía no se agregó.
+
+        :param tarea: Tarea a registrar.
+        """
+        self.liberar(tarea.id)
+        tecnico_id = tarea.tecnico_asignado.id
+        clave = (tarea.fecha_programada, tarea.id)
+        fin = tarea.fecha_programada + timedelta(minutes=self.duracion(tarea))
+        self._arboles.setdefault(tecnico_id, ArbolIntervalos()).agregar(clave, fin)
+        self._intervalos[tarea.id] = (tecnico_id, clave)
+
+    def liberar(self, tarea_id: str):
+        """
+        Quita de la agenda el horario de una tarea, si estaba registrado.
+
+        :param tarea_id: Identificador de la tarea.
+        """
+        registrado = self._intervalos.pop(tarea_id, None)
+        if registrado is None:
+            return
+        tecnico_id, clave = registrado
+        arbol = self._arboles[tecnico_id]
+        arbol.quitar(clave)
+        if not arbol:
+            del self._arboles[tecnico_id]
+
+    def _al_modificar_sistema(self, operacion: str, coleccion: str, entidad):
+        """
+        Actualiza las agendas ante una modificación de una tarea.
+
+        :param operacion: "alta", "cambio", "baja" o "carga".
+        :param coleccion: Colección afectada.
+        :param entidad: Entidad afectada.
+        """
+        if coleccion != "tareas":
+            return
+        if operacion != "baja" and entidad.estado in ESTADOS_ABIERTOS:
+            self.reservar(entidad)
+        else:
+            self.liberar(entidad.id)
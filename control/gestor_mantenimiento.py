@@ -1,6 +1,10 @@
-from datetime import datetime
-from typing import List
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 
+from control.alertas import MotorAlertas, alertas_desde_historial
+from control.asignacion import DURACION_ESTIMADA_MINUTOS, ESTADOS_ABIERTOS, MotorAsignacion
+from control.calendario import CalendarioTecnicos
+from control.recorridos import ADELANTO_DIAS, JORNADA_MINUTOS, PlanDia, PlanificadorRecorridos
 from modelo.Entidades.Equipo import Equipo
 from modelo.Entidades.EstadoTarea import EstadoTarea
 from modelo.Entidades.TareaMantenimiento import TareaMantenimiento
@@ -8,6 +12,7 @@ from modelo.Entidades.Tecnico import Tecnico
 from modelo.Entidades.TipoMantenimiento import TipoMantenimiento
 from modelo.Entidades.Ubicacion import Ubicacion
 from modelo.SistemaMantenimiento import SistemaMantenimiento
+from modelo.identificadores import nuevo_id, nuevos_ids
 
 
 class GestorMantenimiento:
@@ -16,13 +21,20 @@ class GestorMantenimiento:
     técnicos, ubicaciones y tareas en el sistema.
     """
 
-    def __init__(self, sistema: SistemaMantenimiento):
+    def __init__(self, sistema: SistemaMantenimiento, historial=None):
         """
         Inicializador de la clase GestorMantenimiento.
 
         :param sistema: Instancia del sistema de mantenimiento.
+        :param historial: HistorialColumnar opcional. Si se indica, las alertas se calculan
+            recorriendo sus columnas en lugar de mantener el motor incremental.
         """
         self.sistema = sistema
+        self.historial = historial
+        self.motor_alertas = MotorAlertas(sistema) if historial is None else None
+        self.calendario = CalendarioTecnicos(sistema)
+        self.motor_asignacion = MotorAsignacion(sistema, calendario=self.calendario)
+        self.planificador_recorridos = PlanificadorRecorridos(sistema)
 
     def registrar_equipo(self, id: str, nombre: str, ubicacion: Ubicacion,
                          fecha_instalacion: datetime, horas_uso: int = 0) -> Equipo:
@@ -40,16 +52,17 @@ class GestorMantenimiento:
         self.sistema.agregar_equipo(equipo)
         return equipo
 
-    def registrar_tecnico(self, id: str, nombre: str, especialidad: str) -> Tecnico:
+    def registrar_tecnico(self, id: str, nombre: str, especialidad: str, activo: bool = True) -> Tecnico:
         """
         Registra un nuevo técnico en el sistema.
 
         :param id: Identificador único del técnico.
         :param nombre: Nombre del técnico.
         :param especialidad: Especialidad del técnico.
+        :param activo: Indica si el técnico está activo.
         :return: Instancia del técnico registrado.
         """
-        tecnico = Tecnico(id, nombre, especialidad)
+        tecnico = Tecnico(id, nombre, especialidad, activo)
         self.sistema.agregar_tecnico(tecnico)
         return tecnico
 
@@ -69,28 +82,162 @@ class GestorMantenimiento:
         return ubicacion
 
     def planificar_mantenimiento_preventivo(self, equipo_id: str, tecnico_id: str,
-                                            fecha_programada: datetime) -> TareaMantenimiento:
+                                            fecha_programada: datetime,
+                                            ajustar_horario: bool = False) -> TareaMantenimiento:
         """
         Planifica una tarea de mantenimiento preventivo para un equipo.
 
         :param equipo_id: Identificador del equipo.
         :param tecnico_id: Identificador del técnico asignado.
         :param fecha_programada: Fecha programada para el mantenimiento.
+        :param ajustar_horario: Indica si, cuando el técnico ya tiene una tarea abierta en
+            ese horario o el horario cae fuera de la jornada de trabajo, la tarea se
+            programa en su siguiente horario libre dentro de la jornada en lugar de
+            rechazarse.
         :return: Instancia de la tarea de mantenimiento creada.
+        :raises ValueError: Si el equipo o el técnico no existen, o si el técnico no está
+            libre en ese horario y no se pidió ajustarlo.
         """
-        equipo = next(e for e in self.sistema.equipos if e.id == equipo_id)
-        tecnico = next(t for t in self.sistema.tecnicos if t.id == tecnico_id)
+        with self.sistema.bloqueo:
+            equipo, tecnico = self._obtener_equipo_y_tecnico(equipo_id, tecnico_id)
+
+            tarea = TareaMantenimiento(
+                id=nuevo_id("TAR"),
+                tipo=TipoMantenimiento.PREVENTIVO,
+                equipo=equipo,
+                tecnico_asignado=tecnico,
+                fecha_programada=fecha_programada
+            )
+            tarea.fecha_programada = self._horario_libre(tarea, ajustar_horario)
+
+            self.sistema.agregar_tarea(tarea)
+        return tarea
 
-        tarea = TareaMantenimiento(
-            id=f"TAR-{datetime.now().timestamp()}",
-            tipo=TipoMantenimiento.PREVENTIVO,
-            equipo=equipo,
-            tecnico_asignado=tecnico,
-            fecha_programada=fecha_programada
-        )
+    def planificar_mantenimiento_preventivo_masivo(
+            self, tecnico_id: str, fecha_programada: Union[datetime, Callable[[Equipo], datetime]],
+            equipo_ids: Optional[Iterable[str]] = None, ubicacion_id: Optional[str] = None,
+            en_alerta: bool = False, ajustar_horario: bool = True) -> List[TareaMantenimiento]:
+        """
+        Planifica tareas de mantenimiento preventivo para varios equipos de una vez.
+
+        Los equipos se eligen por sus IDs o, si no se indican, entre todos los del sistema;
+        en ambos casos pueden filtrarse por ubicación y por estar en alerta. Las tareas se
+        crean en una sola pasada y se agregan al sistema como un único lote.
+
+        :param tecnico_id: Identificador del técnico asignado a todas las tareas.
+        :param fecha_programada: Fecha de todas las tareas, o función que recibe cada equipo
+            y devuelve la fecha de su tarea.
+        :param equipo_ids: Identificadores de los equipos. Por defecto, todos.
+        :param ubicacion_id: Identificador de la ubicación a la que deben pertenecer.
+        :param en_alerta: Indica si solo se incluyen los equipos en alerta de mantenimiento.
+        :param ajustar_horario: Indica si cada tarea que se superpone con otra abierta del
+            técnico, incluidas las del propio lote, o que cae fuera de la jornada de trabajo,
+            pasa al siguiente horario libre dentro de la jornada. Con False, una
+            superposición rechaza el lote completo.
+        :return: Lista de tareas creadas, en el orden de los equipos.
+        :raises ValueError: Si algún equipo o el técnico no existen, o si hay una
+            superposición que no se pidió ajustar. En ese caso no se crea ninguna tarea.
+        """
+        with self.sistema.bloqueo:
+            tecnico = self.sistema.obtener_tecnico(tecnico_id)
+            if tecnico is None:
+                raise ValueError(f"No existe el técnico {tecnico_id}")
+            if equipo_ids is None:
+                equipos = list(self.sistema.equipos)
+            else:
+                equipos = [self._obtener_equipo(equipo_id) for equipo_id in equipo_ids]
+            if ubicacion_id is not None:
+                equipos = [equipo for equipo in equipos if equipo.ubicacion.id == ubicacion_id]
+            if en_alerta:
+                alerta = {equipo.id for equipo in self.verificar_alertas_mantenimiento()}
+                equipos = [equipo for equipo in equipos if equipo.id in alerta]
+
+            fecha_de = fecha_programada if callable(fecha_programada) else lambda equipo: fecha_programada
+            ids = nuevos_ids(len(equipos), "TAR")
+            tareas = [TareaMantenimiento(
+                id=tarea_id,
+                tipo=TipoMantenimiento.PREVENTIVO,
+                equipo=equipo,
+                tecnico_asignado=tecnico,
+                fecha_programada=fecha_de(equipo)
+            ) for tarea_id, equipo in zip(ids, equipos)]
+
+            # Cada tarea ocupa su horario antes de crear la siguiente, para que no se superpongan
+            cursores: Dict[Tuple[str, datetime, int], datetime] = {}
+            try:
+                for tarea in tareas:
+                    tarea.fecha_programada = self._horario_libre(tarea, ajustar_horario, cursores)
+                    self.calendario.reservar(tarea)
+                self.sistema.agregar_tareas(tareas)
+            except ValueError:
+                for tarea in tareas:
+                    self.calendario.liberar(tarea.id)
+                raise
+        return tareas
+
+    def planificar_preventivo_por_horas(self, equipos: Iterable[Equipo],
+                                        fecha_programada: Optional[datetime] = None) -> List[TareaMantenimiento]:
+        """
+        Planifica una tarea preventiva para cada equipo que superó sus horas de mantenimiento
+        y no tiene ya una preventiva abierta. Cada tarea se asigna al técnico activo con
+        menos carga de trabajo, en su siguiente horario libre.
 
-        self.sistema.agregar_tarea(tarea)
-        return tarea
+        :param equipos: Equipos que superaron sus horas de mantenimiento.
+        :param fecha_programada: Fecha a partir de la cual se programan. Por defecto, ahora.
+        :return: Lista de tareas creadas; vacía si no hay técnicos activos.
+        """
+        fecha_programada = fecha_programada or datetime.now().replace(second=0, microsecond=0)
+        with self.sistema.bloqueo:
+            con_preventiva = {tarea.equipo.id for estado in ESTADOS_ABIERTOS
+                              for tarea in self.sistema.tareas_por_estado(estado)
+                              if tarea.tipo == TipoMantenimiento.PREVENTIVO}
+            cargas = self.motor_asignacion.cargas()
+            if not cargas:
+                return []
+
+            por_tecnico: Dict[str, List[str]] = {}
+            for equipo in equipos:
+                if equipo.id in con_preventiva or self.sistema.obtener_equipo(equipo.id) is not equipo:
+                    continue
+                con_preventiva.add(equipo.id)
+                tecnico_id = min(cargas, key=cargas.__getitem__)
+                cargas[tecnico_id] += DURACION_ESTIMADA_MINUTOS
+                por_tecnico.setdefault(tecnico_id, []).append(equipo.id)
+
+            tareas = []
+            for tecnico_id, equipo_ids in por_tecnico.items():
+                tareas.extend(self.planificar_mantenimiento_preventivo_masivo(
+                    tecnico_id, fecha_programada, equipo_ids=equipo_ids))
+        return tareas
+
+    def _horario_libre(self, tarea: TareaMantenimiento, ajustar: bool,
+                       cursores: Optional[Dict[Tuple[str, datetime, int], datetime]] = None) -> datetime:
+        """
+        Verifica que el técnico de una tarea nueva esté libre en su horario.
+
+        :param tarea: Tarea aún no agregada al sistema.
+        :param ajustar: Indica si, en lugar de fallar, se busca el siguiente horario libre
+            dentro de la jornada de trabajo.
+        :param cursores: En un lote, último horario encontrado por (técnico, fecha pedida,
+            duración). Entre la fecha pedida y ese horario no había lugar, y las reservas
+            posteriores no lo crean, así que la búsqueda sigue desde ahí en lugar de volver
+            a recorrer las tareas ya ubicadas del lote.
+        :return: Fecha programada, la de la tarea o la ajustada.
+        :raises ValueError: Si el técnico no está libre y no se pidió ajustar.
+        """
+        tecnico_id = tarea.tecnico_asignado.id
+        minutos = self.calendario.duracion(tarea)
+        clave = (tecnico_id, tarea.fecha_programada, minutos)
+        desde = cursores.get(clave, tarea.fecha_programada) if cursores is not None else tarea.fecha_programada
+        siguiente = self.calendario.siguiente_libre(tecnico_id, desde, minutos, en_jornada=ajustar)
+        if cursores is not None:
+            cursores[clave] = siguiente
+        if siguiente == tarea.fecha_programada:
+            return siguiente
+        if not ajustar:
+            raise ValueError(f"El técnico {tarea.tecnico_asignado.nombre} ya tiene una tarea a esa hora; "
+                             f"su siguiente horario libre es {siguiente:%Y-%m-%d %H:%M}")
+        return siguiente
 
     def registrar_mantenimiento_correctivo(self, equipo_id: str, tecnico_id: str,
                                            observaciones: str) -> TareaMantenimiento:
@@ -101,12 +248,12 @@ class GestorMantenimiento:
         :param tecnico_id: Identificador del técnico asignado.
         :param observaciones: Observaciones sobre el mantenimiento.
         :return: Instancia de la tarea de mantenimiento creada.
+        :raises ValueError: Si el equipo o el técnico no existen.
         """
-        equipo = next(e for e in self.sistema.equipos if e.id == equipo_id)
-        tecnico = next(t for t in self.sistema.tecnicos if t.id == tecnico_id)
+        equipo, tecnico = self._obtener_equipo_y_tecnico(equipo_id, tecnico_id)
 
         tarea = TareaMantenimiento(
-            id=f"TAR-{datetime.now().timestamp()}",
+            id=nuevo_id("TAR"),
             tipo=TipoMantenimiento.CORRECTIVO,
             equipo=equipo,
             tecnico_asignado=tecnico,
@@ -119,6 +266,34 @@ class GestorMantenimiento:
         self.sistema.agregar_tarea(tarea)
         return tarea
 
+    def _obtener_equipo(self, equipo_id: str) -> Equipo:
+        """
+        Busca un equipo por su identificador.
+
+        :param equipo_id: Identificador del equipo.
+        :return: Equipo encontrado.
+        :raises ValueError: Si el equipo no existe.
+        """
+        equipo = self.sistema.obtener_equipo(equipo_id)
+        if equipo is None:
+            raise ValueError(f"No existe el equipo {equipo_id}")
+        return equipo
+
+    def _obtener_equipo_y_tecnico(self, equipo_id: str, tecnico_id: str) -> Tuple[Equipo, Tecnico]:
+        """
+        Busca un equipo y un técnico por sus identificadores.
+
+        :param equipo_id: Identificador del equipo.
+        :param tecnico_id: Identificador del técnico.
+        :return: Tupla con el equipo y el técnico.
+        :raises ValueError: Si alguno de los dos no existe.
+        """
+        equipo = self._obtener_equipo(equipo_id)
+        tecnico = self.sistema.obtener_tecnico(tecnico_id)
+        if tecnico is None:
+            raise ValueError(f"No existe el técnico {tecnico_id}")
+        return equipo, tecnico
+
     def ejecutar_tarea(self, tarea_id: str, duracion_minutos: int, observaciones: str = "") -> bool:
         """
         Ejecuta una tarea de mantenimiento pendiente.
@@ -128,22 +303,68 @@ class GestorMantenimiento:
         :param observaciones: Observaciones adicionales sobre la tarea.
         :return: True si la tarea fue ejecutada exitosamente, False en caso contrario.
         """
-        tarea = next((t for t in self.sistema.tareas if t.id == tarea_id), None)
-        if tarea and tarea.estado == EstadoTarea.PENDIENTE:
-            tarea.estado = EstadoTarea.COMPLETADA
-            tarea.fecha_realizacion = datetime.now()
-            tarea.duracion_minutos = duracion_minutos
-            tarea.observaciones = observaciones
-            return True
+        with self.sistema.bloqueo:
+            tarea = self.sistema.obtener_tarea(tarea_id)
+            if tarea and tarea.estado == EstadoTarea.PENDIENTE:
+                tarea.fecha_realizacion = datetime.now()
+                tarea.duracion_minutos = duracion_minutos
+                tarea.observaciones = observaciones
+                # El cambio de estado se asigna al final para que los observadores la
+                # reciban completada con sus datos de ejecución
+                tarea.estado = EstadoTarea.COMPLETADA
+                return True
         return False
 
+    def asignar_tecnicos(self, tarea_ids: Optional[Iterable[str]] = None
+                         ) -> Tuple[List[Tuple[TareaMantenimiento, Tecnico]], List[TareaMantenimiento]]:
+        """
+        Reasigna técnicos a tareas pendientes repartiendo la carga de trabajo entre los
+        técnicos activos de la especialidad de cada tarea que estén libres en su horario
+        (ver MotorAsignacion).
+
+        :param tarea_ids: Identificadores de las tareas. Por defecto, todas las pendientes.
+        :return: Tupla con los pares (tarea, técnico asignado) y las tareas que no tienen
+            técnico activo de su especialidad libre en su horario.
+        :raises ValueError: Si alguna tarea no existe.
+        """
+        with self.sistema.bloqueo:
+            tareas = None
+            if tarea_ids is not None:
+                tareas = []
+                for tarea_id in tarea_ids:
+                    tarea = self.sistema.obtener_tarea(tarea_id)
+                    if tarea is None:
+                        raise ValueError(f"No existe la tarea {tarea_id}")
+                    tareas.append(tarea)
+            return self.motor_asignacion.asignar(tareas)
+
+    def planificar_recorridos(self, tecnico_id: Optional[str] = None, desde: Optional[date] = None,
+                              jornada_minutos: int = JORNADA_MINUTOS,
+                              adelanto_dias: int = ADELANTO_DIAS) -> Dict[str, List[PlanDia]]:
+        """
+        Arma planes diarios por técnico que agrupan las tareas pendientes por ubicación
+        (ver PlanificadorRecorridos). No modifica las tareas.
+
+        :param tecnico_id: Técnico a planificar. Por defecto, todos.
+        :param desde: Primer día del plan. Por defecto, hoy.
+        :param jornada_minutos: Minutos de trabajo por día.
+        :param adelanto_dias: Días que una tarea puede adelantarse para agruparla.
+        :return: Diccionario ID de técnico -> planes diarios en orden de fecha.
+        :raises ValueError: Si el técnico no existe o la jornada no es positiva.
+        """
+        if tecnico_id is not None and self.sistema.obtener_tecnico(tecnico_id) is None:
+            raise ValueError(f"No existe el técnico {tecnico_id}")
+        if jornada_minutos <= 0:
+            raise ValueError("La jornada debe tener al menos un minuto")
+        return self.planificador_recorridos.planificar(tecnico_id, desde, jornada_minutos, max(0, adelanto_dias))
+
     def obtener_tareas_pendientes(self) -> List[TareaMantenimiento]:
         """
         Obtiene todas las tareas de mantenimiento pendientes.
 
         :return: Lista de tareas pendientes.
         """
-        return [t for t in self.sistema.tareas if t.estado == EstadoTarea.PENDIENTE]
+        return self.sistema.tareas_por_estado(EstadoTarea.PENDIENTE)
 
     def obtener_tareas_por_equipo(self, equipo_id: str) -> List[TareaMantenimiento]:
         """
@@ -152,7 +373,7 @@ class GestorMantenimiento:
         :param equipo_id: Identificador del equipo.
         :return: Lista de tareas asociadas al equipo.
         """
-        return [t for t in self.sistema.tareas if t.equipo.id == equipo_id]
+        return self.sistema.tareas_por_equipo(equipo_id)
 
     def obtener_tareas_por_tecnico(self, tecnico_id: str) -> List[TareaMantenimiento]:
         """
@@ -161,7 +382,7 @@ class GestorMantenimiento:
         :param tecnico_id: Identificador del técnico.
         :return: Lista de tareas asignadas al técnico.
         """
-        return [t for t in self.sistema.tareas if t.tecnico_asignado.id == tecnico_id]
+        return self.sistema.tareas_por_tecnico(tecnico_id)
 
     def verificar_alertas_mantenimiento(self) -> List[Equipo]:
         """
@@ -169,26 +390,8 @@ class GestorMantenimiento:
 
         :return: Lista de equipos que requieren atención de mantenimiento.
         """
-        alertas = []
-        hoy = datetime.now()
-
-        for equipo in self.sistema.equipos:
-            # Alertas por horas de uso
-            if equipo.horas_uso >= equipo.horas_mantenimiento:
-                alertas.append(equipo)
-                continue
-
-            # Alertas por falta de mantenimiento preventivo
-            tareas = [t for t in self.sistema.tareas
-                      if t.equipo.id == equipo.id and t.tipo == TipoMantenimiento.PREVENTIVO]
-
-            if tareas:
-                ultima_tarea = max(tareas, key=lambda t: t.fecha_programada)
-                if (hoy - ultima_tarea.fecha_programada).days > 3:
-                    alertas.append(equipo)
-            else:
-                # Nunca se ha hecho mantenimiento
-                if (hoy - equipo.fecha_instalacion).days > 3:
-                    alertas.append(equipo)
-
-        return alertas
+        # El motor actualiza su montículo al consultar, por eso se protege con el bloqueo
+        with self.sistema.bloqueo:
+            if self.historial is not None:
+                return alertas_desde_historial(self.sistema, self.historial)
+            return self.motor_alertas.alertas()
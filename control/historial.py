@@ -0,0 +1,309 @@
+from array import array
+from collections import Counter
+from datetime import datetime
+from itertools import compress, repeat
+from operator import eq
+from typing import Dict, List, Optional
+
+from modelo.Entidades.EstadoTarea import EstadoTarea
+from modelo.Entidades.TareaMantenimiento import TareaMantenimiento, describe_falla
+from modelo.Entidades.TipoMantenimiento import TipoMantenimiento
+from modelo.SistemaMantenimiento import SistemaMantenimiento
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él se usan iteradores de la biblioteca estándar
+    np = None
+
+_COMPLETADA = EstadoTarea.COMPLETADA.value
+_PREVENTIVO = TipoMantenimiento.PREVENTIVO.value
+
+
+class ResumenHistorial:
+    """
+        Clase con los conteos de un tramo del historial, con los mismos nombres que
+        AgregadosMantenimiento para que los reportes puedan usar cualquiera de los dos.
+    """
+
+    def __init__(self, por_equipo: Dict[str, int], completadas_por_tecnico: Dict[str, int],
+                 por_tipo: Dict[str, int], fallas_por_equipo: Dict[str, int],
+                 suma_duracion: int, cantidad_duracion: int):
+        """
+        Inicializador de la clase ResumenHistorial.
+
+        :param por_equipo: Cantidad de tareas por ID de equipo.
+        :param completadas_por_tecnico: Cantidad de tareas completadas por ID de técnico.
+        :param por_tipo: Cantidad de tareas por nombre de tipo de mantenimiento.
+        :param fallas_por_equipo: Cantidad de fallas correctivas por ID de equipo.
+        :param suma_duracion: Suma de las duraciones de las tareas completadas.
+        :param cantidad_duracion: Cantidad de tareas completadas con duración.
+        """
+        self.por_equipo = por_equipo
+        self.completadas_por_tecnico = completadas_por_tecnico
+        self.por_tipo = por_tipo
+        self.fallas_por_equipo = fallas_por_equipo
+        self.suma_duracion = suma_duracion
+        self.cantidad_duracion = cantidad_duracion
+
+    @classmethod
+    def vacio(cls) -> "ResumenHistorial":
+        """
+        Crea un resumen sin tareas.
+        """
+        return cls({}, {}, {tipo.name: 0 for tipo in TipoMantenimiento}, {}, 0, 0)
+
+    def combinar(self, otro) -> "ResumenHistorial":
+        """
+        Suma a este resumen los conteos de otro.
+
+        :param otro: ResumenHistorial o AgregadosMantenimiento.
+        :return: Nuevo resumen con la suma de ambos.
+        """
+        return ResumenHistorial(
+            dict(Counter(self.por_equipo) + Counter(otro.por_equipo)),
+            dict(Counter(self.completadas_por_tecnico) + Counter(otro.completadas_por_tecnico)),
+            {tipo: self.por_tipo.get(tipo, 0) + otro.por_tipo.get(tipo, 0)
+             for tipo in [*self.por_tipo, *(t for t in otro.por_tipo if t not in self.por_tipo)]},
+            dict(Counter(self.fallas_por_equipo) + Counter(otro.fallas_por_equipo)),
+            self.suma_duracion + otro.suma_duracion,
+            self.cantidad_duracion + otro.cantidad_duracion)
+
+
+class HistorialColumnar:
+    """
+        Clase que guarda el historial de tareas en columnas de enteros junto a las tareas
+        del sistema, para agregarlo sin recorrer los objetos.
+
+        Cada tarea ocupa una fila con el código de su equipo y de su técnico, los valores
+        de su tipo y estado, su fecha programada en segundos desde la época, su duración
+        (0 si no tiene) y si sus observaciones describen una falla. Las columnas son
+        arreglos de array que se recorren con NumPy cuando está instalado.
+    """
+
+    def __init__(self, sistema: SistemaMantenimiento):
+        """
+        Inicializador de la clase HistorialColumnar.
+
+        :param sistema: Instancia del sistema de mantenimiento.
+        """
+        self.sistema = sistema
+        self.equipo = array('q')
+        self.tecnico = array('q')
+        self.tipo = array('b')
+        self.estado = array('b')
+        self.fecha = array('q')
+        self.duracion = array('q')
+        self.falla = array('b')
+        # Fila -> ID de tarea, e ID de tarea -> fila
+        self._ids: List[str] = []
+        self._filas: Dict[str, int] = {}
+        # Códigos de equipos y técnicos; no se reutilizan aunque la entidad se elimine
+        self._codigos_equipo: Dict[str, int] = {}
+        self._equipo_ids: List[str] = []
+        self._codigos_tecnico: Dict[str, int] = {}
+        self._tecnico_ids: List[str] = []
+
+        for tarea in sistema.tareas:
+            self._agregar_fila(tarea)
+        sistema.suscribir(self._al_modificar_sistema)
+
+    def __len__(self) -> int:
+        """
+        Devuelve la cantidad de tareas guardadas en las columnas.
+        """
+        return len(self._ids)
+
+    def _al_modificar_sistema(self, operacion: str, coleccion: str, entidad):
+        """
+        Actualiza las columnas ante una modificación de una tarea.
+
+        :param operacion: "alta", "cambio", "baja" o "carga".
+        :param coleccion: Colección afectada.
+        :param entidad: Entidad afectada.
+        """
+        if coleccion != "tareas":
+            return
+        if operacion in ("alta", "carga"):
+            self._agregar_fila(entidad)
+        elif operacion == "baja":
+            self._quitar_fila(entidad.id)
+        elif entidad.id in self._filas:
+            self._escribir_fila(self._filas[entidad.id], entidad)
+
+    def _codigo(self, codigos: Dict[str, int], ids: List[str], entidad_id: str) -> int:
+        """
+        Devuelve el código entero de un equipo o técnico, asignándole uno si no tiene.
+
+        :param codigos: Códigos ya asignados, indexados por ID.
+        :param ids: IDs indexados por código.
+        :param entidad_id: ID de la entidad.
+        :return: Código de la entidad.
+        """
+        codigo = codigos.get(entidad_id)
+        if codigo is None:
+            codigo = codigos[entidad_id] = len(ids)
+            ids.append(entidad_id)
+        return codigo
+
+    def _valores(self, tarea: TareaMantenimiento) -> tuple:
+        """
+        Calcula los valores de las columnas para una tarea.
+
+        :param tarea: Tarea a codificar.
+        :return: Tupla con un valor por columna.
+        """
+        falla = int(tarea.tipo == TipoMantenimiento.CORRECTIVO and describe_falla(tarea.observaciones))
+        return (self._codigo(self._codigos_equipo, self._equipo_ids, tarea.equipo.id),
+                self._codigo(self._codigos_tecnico, self._tecnico_ids, tarea.tecnico_asignado.id),
+                tarea.tipo.value,
+                tarea.estado.value,
+                int(tarea.fecha_programada.timestamp()),
+                tarea.duracion_minutos or 0,
+                falla)
+
+    def _columnas(self) -> tuple:
+        """
+        Devuelve las columnas en el mismo orden que los valores de _valores.
+        """
+        return (self.equipo, self.tecnico, self.tipo, self.estado, self.fecha, self.duracion, self.falla)
+
+    def _agregar_fila(self, tarea: TareaMantenimiento):
+        """
+        Agrega una tarea al final de las columnas.
+
+        :param tarea: Tarea agregada.
+        """
+        self._filas[tarea.id] = len(self._ids)
+        self._ids.append(tarea.id)
+        for columna, valor in zip(self._columnas(), self._valores(tarea)):
+            columna.append(valor)
+
+    def _escribir_fila(self, fila: int, tarea: TareaMantenimiento):
+        """
+        Sobrescribe los valores de una fila.
+
+        :param fila: Posición de la fila.
+        :param tarea: Tarea modificada.
+        """
+        for columna, valor in zip(self._columnas(), self._valores(tarea)):
+            columna[fila] = valor
+
+    def _quitar_fila(self, tarea_id: str):
+        """
+        Quita la fila de una tarea moviendo la última fila a su lugar.
+
+        :param tarea_id: ID de la tarea eliminada.
+        """
+        fila = self._filas.pop(tarea_id, None)
+        if fila is None:
+            return
+        ultima = len(self._ids) - 1
+        if fila != ultima:
+            ultimo_id = self._ids[ultima]
+            self._ids[fila] = ultimo_id
+            self._filas[ultimo_id] = fila
+            for columna in self._columnas():
+                columna[fila] = columna[ultima]
+        self._ids.pop()
+        for columna in self._columnas():
+            columna.pop()
+
+    def resumen(self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None) -> ResumenHistorial:
+        """
+        Calcula los conteos de los reportes sobre las tareas programadas en un periodo.
+
+        :param desde: Fecha programada mínima, inclusive. Por defecto, sin límite.
+        :param hasta: Fecha programada máxima, inclusive. Por defecto, sin límite.
+        :return: Resumen con los conteos del periodo.
+        """
+        if np is not None:
+            return self._resumen_numpy(desde, hasta)
+        return self._resumen_iteradores(desde, hasta)
+
+    def _resumen_numpy(self, desde: Optional[datetime], hasta: Optional[datetime]) -> ResumenHistorial:
+        """
+        Calcula el resumen con operaciones vectorizadas de NumPy sobre las columnas.
+        """
+        # Vistas sin copia de los arreglos; se liberan al salir para que puedan crecer
+        equipo = np.frombuffer(self.equipo, dtype=np.int64)
+        tecnico = np.frombuffer(self.tecnico, dtype=np.int64)
+        tipo = np.frombuffer(self.tipo, dtype=np.int8)
+        estado = np.frombuffer(self.estado, dtype=np.int8)
+        duracion = np.frombuffer(self.duracion, dtype=np.int64)
+        falla = np.frombuffer(self.falla, dtype=np.int8).astype(bool)
+
+        if desde is not None or hasta is not None:
+            fecha = np.frombuffer(self.fecha, dtype=np.int64)
+            periodo = np.ones(len(fecha), dtype=bool)
+            if desde is not None:
+                periodo &= fecha >= int(desde.timestamp())
+            if hasta is not None:
+                periodo &= fecha <= int(hasta.timestamp())
+            equipo, tecnico, tipo, estado = equipo[periodo], tecnico[periodo], tipo[periodo], estado[periodo]
+            duracion, falla = duracion[periodo], falla[periodo]
+
+        completada = estado == _COMPLETADA
+        con_duracion = completada & (duracion > 0)
+
+        return ResumenHistorial(
+            self._por_codigo(np.bincount(equipo, minlength=len(self._equipo_ids)), self._equipo_ids),
+            self._por_codigo(np.bincount(tecnico[completada], minlength=len(self._tecnico_ids)),
+                             self._tecnico_ids),
+            {t.name: int(np.count_nonzero(tipo == t.value)) for t in TipoMantenimiento},
+            self._por_codigo(np.bincount(equipo[falla], minlength=len(self._equipo_ids)), self._equipo_ids),
+            int(duracion[con_duracion].sum()),
+            int(np.count_nonzero(con_duracion)))
+
+    def _por_codigo(self, conteos, ids: List[str]) -> Dict[str, int]:
+        """
+        Convierte un conteo por código en un diccionario por ID, sin las claves en cero.
+        """
+        return {ids[codigo]: int(conteos[codigo]) for codigo in np.flatnonzero(conteos)}
+
+    def _resumen_iteradores(self, desde: Optional[datetime], hasta: Optional[datetime]) -> ResumenHistorial:
+        """
+        Calcula el resumen con iteradores de la biblioteca estándar, que recorren las
+        columnas sin crear objetos de tarea.
+        """
+        equipo, tecnico, tipo, estado = self.equipo, self.tecnico, self.tipo, self.estado
+        duracion, falla = self.duracion, self.falla
+        if desde is not None or hasta is not None:
+            inicio = int(desde.timestamp()) if desde is not None else -2 ** 63
+            fin = int(hasta.timestamp()) if hasta is not None else 2 ** 63 - 1
+            periodo = [inicio <= fecha <= fin for fecha in self.fecha]
+            equipo, tecnico, tipo, estado, duracion, falla = (
+                list(compress(columna, periodo)) for columna in (equipo, tecnico, tipo, estado, duracion, falla))
+
+        completada = list(map(eq, estado, repeat(_COMPLETADA)))
+        duraciones = [d for d in compress(duracion, completada) if d]
+        por_tipo = Counter(tipo)
+
+        return ResumenHistorial(
+            {self._equipo_ids[c]: n for c, n in Counter(equipo).items()},
+            {self._tecnico_ids[c]: n for c, n in Counter(compress(tecnico, completada)).items()},
+            {t.name: por_tipo.get(t.value, 0) for t in TipoMantenimiento},
+            {self._equipo_ids[c]: n for c, n in Counter(compress(equipo, falla)).items()},
+            sum(duraciones),
+            len(duraciones))
+
+    def ultima_preventiva_por_equipo(self) -> Dict[str, datetime]:
+        """
+        Obtiene la fecha programada más reciente de mantenimiento preventivo de cada equipo.
+
+        :return: Diccionario con el ID de equipo como clave y la fecha como valor.
+        """
+        if np is not None:
+            equipo = np.frombuffer(self.equipo, dtype=np.int64)
+            fecha = np.frombuffer(self.fecha, dtype=np.int64)
+            preventiva = np.frombuffer(self.tipo, dtype=np.int8) == _PREVENTIVO
+            ultima = np.full(len(self._equipo_ids), np.iinfo(np.int64).min, dtype=np.int64)
+            np.maximum.at(ultima, equipo[preventiva], fecha[preventiva])
+            codigos = np.flatnonzero(ultima != np.iinfo(np.int64).min)
+            return {self._equipo_ids[c]: datetime.fromtimestamp(int(ultima[c])) for c in codigos}
+
+        ultima: Dict[int, int] = {}
+        preventiva = list(map(eq, self.tipo, repeat(_PREVENTIVO)))
+        for codigo, fecha in zip(compress(self.equipo, preventiva), compress(self.fecha, preventiva)):
+            if fecha > ultima.get(codigo, fecha - 1):
+                ultima[codigo] = fecha
+        return {self._equipo_ids[c]: datetime.fromtimestamp(f) for c, f in ultima.items()}
@@ -0,0 +1,339 @@
+import csv
+import gc
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from modelo.Entidades.Equipo import Equipo
+from modelo.Entidades.EstadoTarea import EstadoTarea
+from modelo.Entidades.TareaMantenimiento import TareaMantenimiento
+from modelo.Entidades.Tecnico import Tecnico
+from modelo.Entidades.TipoMantenimiento import TipoMantenimiento
+from modelo.Entidades.Ubicacion import Ubicacion
+from modelo.SistemaMantenimiento import SistemaMantenimiento
+from modelo.identificadores import nuevo_id
+
+# Cantidad de filas que valida cada proceso del grupo por vez
+TAMANO_BLOQUE_FILAS = 20000
+
+# Columnas de cada colección, en el orden en que se validan
+COLUMNAS = {
+    "ubicaciones": ("id", "nombre", "descripcion"),
+    "equipos": ("id", "nombre", "ubicacion_id", "fecha_instalacion", "horas_uso", "horas_mantenimiento"),
+    "tecnicos": ("id", "nombre", "especialidad", "activo"),
+    "tareas": ("id", "tipo", "equipo_id", "fecha_programada", "tecnico_id", "estado", "observaciones",
+               "fecha_realizacion", "duracion_minutos"),
+}
+
+# Columnas que deben estar en el encabezado y tener valor en cada fila
+OBLIGATORIAS = {
+    "ubicaciones": ("nombre",),
+    "equipos": ("nombre", "ubicacion_id", "fecha_instalacion"),
+    "tecnicos": ("nombre", "especialidad"),
+    "tareas": ("tipo", "equipo_id", "fecha_programada", "tecnico_id"),
+}
+
+# Orden de importación: cada colección solo referencia a las anteriores
+ORDEN = ("ubicaciones", "equipos", "tecnicos", "tareas")
+
+# Prefijo de los IDs generados para las filas sin ID, como en los formularios
+PREFIJOS = {"ubicaciones": "UB", "equipos": "EQ", "tecnicos": "TEC", "tareas": "TAR"}
+
+_VERDADEROS = {"", "1", "si", "sí", "s", "true", "verdadero"}
+_FALSOS = {"0", "no", "n", "false", "falso"}
+
+
+def _fecha(texto: str) -> datetime:
+    """
+    Convierte una fecha en formato ISO (AAAA-MM-DD, con hora opcional).
+    """
+    return datetime.fromisoformat(texto)
+
+
+def _entero(texto: str, columna: str, defecto: Optional[int] = None) -> Optional[int]:
+    """
+    Convierte un entero no negativo, o devuelve el valor por defecto si el texto está vacío.
+
+    :raises ValueError: Si el texto no es un entero no negativo.
+    """
+    if not texto:
+        return defecto
+    valor = int(texto)
+    if valor < 0:
+        raise ValueError(f"{columna} no puede ser negativo")
+    return valor
+
+
+def _enum(tipo, texto: str, defecto=None):
+    """
+    Convierte el nombre de un miembro de un enum, sin distinguir mayúsculas.
+
+    :raises ValueError: Si el nombre no es un miembro del enum.
+    """
+    if not texto and defecto is not None:
+        return defecto
+    try:
+        return tipo[texto.upper()]
+    except KeyError:
+        raise ValueError(f"{texto!r} no es uno de {', '.join(tipo.__members__)}") from None
+
+
+def _validar_fila(coleccion: str, valores: List[str]) -> tuple:
+    """
+    Convierte los textos de una fila en los valores de su entidad. Las referencias a otras
+    entidades quedan como IDs.
+
+    :param coleccion: Colección de la fila.
+    :param valores: Textos de las columnas de COLUMNAS[coleccion], sin espacios alrededor.
+    :return: Valores en el orden de COLUMNAS[coleccion].
+    :raises ValueError: Si algún valor no es válido.
+    """
+    if coleccion == "ubicaciones":
+        return tuple(valores)
+    if coleccion == "equipos":
+        id, nombre, ubicacion_id, fecha_instalacion, horas_uso, horas_mantenimiento = valores
+        return (id, nombre, ubicacion_id, _fecha(fecha_instalacion), _entero(horas_uso, "horas_uso", 0),
+                _entero(horas_mantenimiento, "horas_mantenimiento", 100))
+    if coleccion == "tecnicos":
+        id, nombre, especialidad, activo = valores
+        activo = activo.casefold()
+        if activo not in _VERDADEROS and activo not in _FALSOS:
+            raise ValueError(f"activo debe ser sí o no, no {activo!r}")
+        return id, nombre, especialidad, activo in _VERDADEROS
+    id, tipo, equipo_id, fecha_programada, tecnico_id, estado, observaciones, fecha_realizacion, duracion = valores
+    return (id, _enum(TipoMantenimiento, tipo), equipo_id, _fecha(fecha_programada), tecnico_id,
+            _enum(EstadoTarea, estado, EstadoTarea.PENDIENTE), observaciones,
+            _fecha(fecha_realizacion) if fecha_realizacion else None, _entero(duracion, "duracion_minutos"))
+
+
+def _validar_bloque(coleccion: str, posiciones: Tuple[int, ...],
+                    filas: List[Tuple[int, List[str]]]) -> Tuple[List[tuple], List[Tuple[int, str]]]:
+    """
+    Valida un bloque de filas, en un proceso del grupo de importación o en el principal.
+
+    :param coleccion: Colección de las filas.
+    :param posiciones: Posición en la fila de cada columna de COLUMNAS[coleccion], o -1
+        si el archivo no la tiene.
+    :param filas: Tuplas (número de línea, campos de la fila).
+    :return: Tupla con las filas válidas, cada una como (número de línea, valores), y los
+        errores de las demás como (número de línea, mensaje).
+    """
+    obligatorias = [COLUMNAS[coleccion].index(columna) for columna in OBLIGATORIAS[coleccion]]
+    validas, errores = [], []
+    for linea, campos in filas:
+        if not any(campos):
+            continue
+        valores = [campos[p].strip() if 0 <= p < len(campos) else "" for p in posiciones]
+        faltantes = [COLUMNAS[coleccion][i] for i in obligatorias if not valores[i]]
+        if faltantes:
+            errores.append((linea, f"Faltan valores de {', '.join(faltantes)}"))
+            continue
+        try:
+            validas.append((linea, _validar_fila(coleccion, valores)))
+        except ValueError as e:
+            errores.append((linea, str(e)))
+    return validas, errores
+
+
+def coleccion_de_archivo(ruta: str) -> str:
+    """
+    Deduce la colección de un archivo por su nombre, que debe empezar con el nombre de la
+    colección (por ejemplo, equipos.csv o equipos_planta2.csv).
+
+    :param ruta: Ruta del archivo.
+    :return: Nombre de la colección.
+    :raises ValueError: Si el nombre no corresponde a ninguna colección.
+    """
+    nombre = Path(ruta).name.casefold()
+    for coleccion in ORDEN:
+        if nombre.startswith(coleccion):
+            return coleccion
+    raise ValueError(f"No se reconoce la colección del archivo {ruta}; "
+                     f"su nombre debe empezar con {', '.join(ORDEN)}")
+
+
+class ImportadorCSV:
+    """
+    Clase que importa equipos, técnicos, ubicaciones y tareas desde archivos CSV.
+
+    Los archivos se leen como flujo: las filas se validan por bloques en un grupo de
+    procesos, con una cantidad acotada de bloques en curso, y el proceso principal enlaza
+    las referencias buscándolas por ID en el sistema y agrega las entidades. Las filas
+    inválidas se informan sin interrumpir la importación. La importación no guarda: quien
+    la usa guarda el sistema una sola vez al terminar.
+
+    Cada archivo tiene un encabezado con los nombres de sus columnas (ver COLUMNAS), en
+    cualquier orden. Las filas sin ID reciben uno nuevo. Las fechas van en formato ISO.
+    """
+
+    def __init__(self, sistema: SistemaMantenimiento, procesos: int = 1, delimitador: str = ",",
+                 al_error: Optional[Callable[[str, int, str], None]] = None):
+        """
+        Inicializador de la clase ImportadorCSV.
+
+        :param sistema: Sistema que recibe las entidades.
+        :param procesos: Cantidad de procesos que validan las filas. Con 1 se validan en el
+            proceso principal.
+        :param delimitador: Separador de columnas de los archivos.
+        :param al_error: Función que recibe (archivo, número de línea, mensaje) de cada fila
+            rechazada. Por defecto se imprime.
+        """
+        self.sistema = sistema
+        self.procesos = max(1, procesos)
+        self.delimitador = delimitador
+        self.al_error = al_error or (lambda archivo, linea, mensaje: print(f"{archivo}:{linea}: {mensaje}"))
+
+    def importar(self, archivos: Dict[str, str]) -> Dict[str, Tuple[int, int]]:
+        """
+        Importa varios archivos en el orden de ORDEN, de modo que las referencias de cada
+        colección se resuelvan con las entidades ya existentes o recién importadas.
+
+        :param archivos: Diccionario colección -> ruta del archivo.
+        :return: Diccionario colección -> (filas importadas, filas rechazadas).
+        :raises ValueError: Si una colección no existe o a un archivo le faltan columnas
+            obligatorias. En ese caso no se importa ningún archivo.
+        """
+        for coleccion, archivo in archivos.items():
+            if coleccion not in COLUMNAS:
+                raise ValueError(f"Colección desconocida: {coleccion}. Opciones: {', '.join(ORDEN)}")
+            self._posiciones(coleccion, archivo)
+
+        resultados = {}
+        ejecutor = ProcessPoolExecutor(max_workers=self.procesos) if self.procesos > 1 else None
+        # Se crean muchos objetos que sobreviven: el recolector solo retrasaría la importación
+        recolector_activo = gc.isenabled()
+        gc.disable()
+        try:
+            for coleccion in ORDEN:
+                if coleccion in archivos:
+                    resultados[coleccion] = self._importar_archivo(coleccion, archivos[coleccion], ejecutor)
+        finally:
+            if recolector_activo:
+                gc.enable()
+            if ejecutor is not None:
+                ejecutor.shutdown()
+        return resultados
+
+    def _posiciones(self, coleccion: str, archivo: str) -> Tuple[int, ...]:
+        """
+        Lee el encabezado de un archivo y ubica cada columna de la colección.
+
+        :param coleccion: Colección del archivo.
+        :param archivo: Ruta del archivo.
+        :return: Posición de cada columna de COLUMNAS[coleccion], o -1 si no está.
+        :raises ValueError: Si el encabezado tiene columnas desconocidas o le faltan
+            columnas obligatorias.
+        """
+        with open(archivo, newline="", encoding="utf-8-sig") as f:
+            encabezado = [c.strip().casefold() for c in next(csv.reader(f, delimiter=self.delimitador), [])]
+        desconocidas = [c for c in encabezado if c not in COLUMNAS[coleccion]]
+        faltantes = [c for c in OBLIGATORIAS[coleccion] if c not in encabezado]
+        if desconocidas or faltantes:
+            raise ValueError(f"Encabezado inválido en {archivo}: "
+                             f"columnas desconocidas {desconocidas}, faltantes {faltantes}")
+        return tuple(encabezado.index(c) if c in encabezado else -1 for c in COLUMNAS[coleccion])
+
+    def _bloques(self, archivo: str) -> Iterator[List[Tuple[int, List[str]]]]:
+        """
+        Recorre las filas de datos de un archivo en bloques, sin leerlo completo.
+
+        :param archivo: Ruta del archivo.
+        :return: Iterador de bloques de tuplas (número de línea, campos).
+        """
+        with open(archivo, newline="", encoding="utf-8-sig") as f:
+            lector = csv.reader(f, delimiter=self.delimitador)
+            next(lector, None)
+            bloque = []
+            for campos in lector:
+                bloque.append((lector.line_num, campos))
+                if len(bloque) == TAMANO_BLOQUE_FILAS:
+                    yield bloque
+                    bloque = []
+            if bloque:
+                yield bloque
+
+    def _importar_archivo(self, coleccion: str, archivo: str,
+                          ejecutor: Optional[ProcessPoolExecutor]) -> Tuple[int, int]:
+        """
+        Valida e incorpora las filas de un archivo.
+
+        :param coleccion: Colección del archivo.
+        :param archivo: Ruta del archivo.
+        :param ejecutor: Grupo de procesos que valida las filas, o None para validarlas aquí.
+        :return: Tupla (filas importadas, filas rechazadas).
+        """
+        posiciones = self._posiciones(coleccion, archivo)
+        conteo = [0, 0]
+        if ejecutor is None:
+            for bloque in self._bloques(archivo):
+                self._incorporar(coleccion, archivo, _validar_bloque(coleccion, posiciones, bloque), conteo)
+            return conteo[0], conteo[1]
+
+        # Pocos bloques en curso: la memoria no depende del tamaño del archivo
+        en_curso = deque()
+        for bloque in self._bloques(archivo):
+            en_curso.append(ejecutor.submit(_validar_bloque, coleccion, posiciones, bloque))
+            if len(en_curso) > 2 * self.procesos:
+                self._incorporar(coleccion, archivo, en_curso.popleft().result(), conteo)
+        while en_curso:
+            self._incorporar(coleccion, archivo, en_curso.popleft().result(), conteo)
+        return conteo[0], conteo[1]
+
+    def _incorporar(self, coleccion: str, archivo: str,
+                    resultado: Tuple[List[tuple], List[Tuple[int, str]]], conteo: List[int]):
+        """
+        Crea y agrega al sistema las entidades de las filas válidas de un bloque e informa
+        las rechazadas, en el orden del archivo.
+
+        :param coleccion: Colección del bloque.
+        :param archivo: Ruta del archivo, para los mensajes de error.
+        :param resultado: Resultado de _validar_bloque.
+        :param conteo: Lista [importadas, rechazadas] que se actualiza.
+        """
+        validas, errores = resultado
+        rechazos = deque(errores)
+        with self.sistema.bloqueo:
+            for linea, valores in validas:
+                while rechazos and rechazos[0][0] < linea:
+                    self.al_error(archivo, *rechazos.popleft())
+                    conteo[1] += 1
+                try:
+                    self._agregar(coleccion, valores)
+                    conteo[0] += 1
+                except ValueError as e:
+                    self.al_error(archivo, linea, str(e))
+                    conteo[1] += 1
+        for linea, mensaje in rechazos:
+            self.al_error(archivo, linea, mensaje)
+            conteo[1] += 1
+
+    def _agregar(self, coleccion: str, valores: tuple):
+        """
+        Crea la entidad de una fila válida, enlazando sus referencias, y la agrega al sistema.
+
+        :param coleccion: Colección de la fila.
+        :param valores: Valores devueltos por _validar_fila.
+        :raises ValueError: Si una referencia no existe o el ID ya está registrado.
+        """
+        id = valores[0] or nuevo_id(PREFIJOS[coleccion])
+        sistema = self.sistema
+        if coleccion == "ubicaciones":
+            sistema.agregar_ubicacion(Ubicacion(id, *valores[1:]))
+        elif coleccion == "equipos":
+            ubicacion = sistema.obtener_ubicacion(valores[2])
+            if ubicacion is None:
+                raise ValueError(f"No existe la ubicación {valores[2]}")
+            sistema.agregar_equipo(Equipo(id, valores[1], ubicacion, *valores[3:]))
+        elif coleccion == "tecnicos":
+            sistema.agregar_tecnico(Tecnico(id, *valores[1:]))
+        else:
+            equipo = sistema.obtener_equipo(valores[2])
+            if equipo is None:
+                raise ValueError(f"No existe el equipo {valores[2]}")
+            tecnico = sistema.obtener_tecnico(valores[4])
+            if tecnico is None:
+                raise ValueError(f"No existe el técnico {valores[4]}")
+            sistema.agregar_tarea(TareaMantenimiento(id, valores[1], equipo, valores[3], tecnico, *valores[5:]))
+
@@ -0,0 +1,362 @@
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional, Tuple, ValuesView
+
+from control.asignacion import DURACION_ESTIMADA_MINUTOS
+from modelo.Entidades.Equipo import Equipo
+from modelo.Entidades.EstadoTarea import EstadoTarea
+from modelo.Entidades.TareaMantenimiento import TareaMantenimiento
+from modelo.Entidades.Tecnico import Tecnico
+from modelo.Entidades.Ubicacion import Ubicacion
+from modelo.SistemaMantenimiento import SistemaMantenimiento
+
+# Minutos de trabajo de un técnico por día
+JORNADA_MINUTOS = 480
+
+# Días que una tarea puede adelantarse para hacerla junto con otras de su ubicación
+ADELANTO_DIAS = 3
+
+
+class PlanDia:
+    """
+    Clase que representa el trabajo de un técnico en un día: las ubicaciones que visita,
+    en orden, con las tareas que hace en cada una.
+    """
+
+    __slots__ = ("tecnico", "fecha", "visitas")
+
+    def __init__(self, tecnico: Tecnico, fecha: date):
+        """
+        Inicializador de la clase PlanDia.
+
+        :param tecnico: Técnico que hace el trabajo.
+        :param fecha: Día del plan.
+        """
+        self.tecnico = tecnico
+        self.fecha = fecha
+        self.visitas: List[Tuple[Ubicacion, List[TareaMantenimiento]]] = []
+
+    @property
+    def ubicaciones(self) -> List[Ubicacion]:
+        """
+        Devuelve las ubicaciones que visita el técnico, en orden.
+        """
+        return [ubicacion for ubicacion, _ in self.visitas]
+
+    @property
+    def tareas(self) -> List[TareaMantenimiento]:
+        """
+        Devuelve las tareas del día, agrupadas por ubicación.
+        """
+        return [tarea for _, tareas in self.visitas for tarea in tareas]
+
+
+class _Pendientes:
+    """
+    Tareas pendientes de un técnico en una ubicación durante la generación de un plan.
+
+    Las tareas se ordenan por día de vencimiento; las que ya pueden hacerse en el día
+    planificado pasan a la lista de elegibles, con el total de sus minutos.
+    """
+
+    __slots__ = ("ubicacion", "futuras", "siguiente", "elegibles", "minutos")
+
+    def __init__(self, ubicacion: Ubicacion, tareas: List[Tuple[date, int, TareaMantenimiento]]):
+        """
+        Inicializador de la clase _Pendientes.
+
+        :param ubicacion: Ubicación de las tareas.
+        :param tareas: Tuplas (vencimiento, minutos, tarea).
+        """
+        self.ubicacion = ubicacion
+        self.futuras = sorted(tareas, key=lambda t: (t[0], t[2].fecha_programada))
+        self.siguiente = 0
+        self.elegibles: List[Tuple[date, int, TareaMantenimiento]] = []
+        self.minutos = 0
+
+    def habilitar(self, limite: date):
+        """
+        Pasa a elegibles las tareas que vencen hasta un día.
+
+        :param limite: Último vencimiento elegible.
+        """
+        while self.siguiente < len(self.futuras) and self.futuras[self.siguiente][0] <= limite:
+            self.elegibles.append(self.futuras[self.siguiente])
+            self.minutos += self.futuras[self.siguiente][1]
+            self.siguiente += 1
+
+    def proximo_vencimiento(self) -> Optional[date]:
+        """
+        Devuelve el vencimiento de la próxima tarea que todavía no es elegible.
+        """
+        return self.futuras[self.siguiente][0] if self.siguiente < len(self.futuras) else None
+
+    def tomar(self, disponibles: int, al_menos_una: bool) -> Tuple[List[TareaMantenimiento], int]:
+        """
+        Toma las tareas elegibles que entran en los minutos disponibles, por vencimiento.
+
+        :param disponibles: Minutos que quedan en el día.
+        :param al_menos_una: Si se toma la primera tarea aunque no entre, para que una
+            tarea más larga que la jornada también se planifique.
+        :return: Tupla con las tareas tomadas y los minutos que ocupan.
+        """
+        tomadas, restantes, ocupados = [], [], 0
+        for elegible in self.elegibles:
+            minutos = elegible[1]
+            if ocupados + minutos <= disponibles or (al_menos_una and not tomadas):
+                tomadas.append(elegible[2])
+                ocupados += minutos
+            else:
+                restantes.append(elegible)
+        self.elegibles = restantes
+        self.minutos -= ocupados
+        return tomadas, ocupados
+
+
+class PlanificadorRecorridos:
+    """
+    Clase que arma planes diarios por técnico agrupando las tareas pendientes por ubicación,
+    para reducir la cantidad de ubicaciones distintas que cada técnico visita en un día.
+
+    Mantiene dos índices actualizados con las notificaciones del sistema, ubicación ->
+    equipos y ubicación -> tareas pendientes, de modo que generar los planes no recorre
+    todas las tareas del sistema sino solo las pendientes.
+    """
+
+    def __init__(self, sistema: SistemaMantenimiento,
+                 duracion_estimada: Optional[Callable[[TareaMantenimiento], int]] = None):
+        """
+        Inicializador de la clase PlanificadorRecorridos.
+
+        :param sistema: Instancia del sistema de mantenimiento.
+        :param duracion_estimada: Función que devuelve los minutos de una tarea sin
+            duración registrada. Por defecto, DURACION_ESTIMADA_MINUTOS.
+        """
+        self.sistema = sistema
+        self.duracion_estimada = duracion_estimada or (lambda tarea: DURACION_ESTIMADA_MINUTOS)
+        # Índices: ID de ubicación -> {ID: entidad}
+        self._equipos_por_ubicacion: Dict[str, Dict[str, Equipo]] = {}
+        self._pendientes_por_ubicacion: Dict[str, Dict[str, TareaMantenimiento]] = {}
+        # Clave bajo la que está registrada cada entidad, para moverla si cambia
+        self._ubicacion_de_equipo: Dict[str, str] = {}
+        self._ubicacion_de_tarea: Dict[str, str] = {}
+
+        for equipo in sistema.equipos:
+            self._registrar_equipo(equipo)
+        for tarea in sistema.tareas_por_estado(EstadoTarea.PENDIENTE):
+            self._registrar_tarea(tarea)
+        sistema.suscribir(self._al_modificar_sistema)
+
+    def duracion(self, tarea: TareaMantenimiento) -> int:
+        """
+        Devuelve los minutos que ocupa una tarea en el día de su técnico.
+
+        :param tarea: Tarea pendiente.
+        :return: Duración registrada o estimada, al menos un minuto.
+        """
+        return max(1, tarea.duracion_minutos or self.duracion_estimada(tarea))
+
+    def equipos_en(self, ubicacion_id: str) -> ValuesView[Equipo]:
+        """
+        Devuelve los equipos de una ubicación.
+
+        :param ubicacion_id: Identificador de la ubicación.
+        :return: Vista de solo lectura de los equipos.
+        """
+        return self._equipos_por_ubicacion.get(ubicacion_id, {}).values()
+
+    def pendientes_en(self, ubicacion_id: str) -> ValuesView[TareaMantenimiento]:
+        """
+        Devuelve las tareas pendientes de los equipos de una ubicación.
+
+        :param ubicacion_id: Identificador de la ubicación.
+        :return: Vista de solo lectura de las tareas.
+        """
+        return self._pendientes_por_ubicacion.get(ubicacion_id, {}).values()
+
+    def planificar(self, tecnico_id: Optional[str] = None, desde: Optional[date] = None,
+                   jornada_minutos: int = JORNADA_MINUTOS,
+                   adelanto_dias: int = ADELANTO_DIAS) -> Dict[str, List[PlanDia]]:
+        """
+        Arma los planes diarios de las tareas pendientes.
+
+        Cada día empieza por la ubicación de la tarea que vence antes y la completa con
+        las demás tareas elegibles de esa ubicación. Si queda tiempo, sigue por otra
+        ubicación con tareas vencidas o, si no hay, por la que más minutos elegibles
+        tenga, de modo que el día se llene con la menor cantidad de ubicaciones. Una tarea
+        es elegible desde adelanto_dias antes de su fecha programada; las vencidas lo son
+        desde el primer día. Las tareas que no entran en un día pasan al siguiente.
+
+        :param tecnico_id: Técnico a planificar. Por defecto, todos los que tienen tareas
+            pendientes.
+        :param desde: Primer día del plan. Por defecto, hoy.
+        :param jornada_minutos: Minutos de trabajo por día.
+        :param adelanto_dias: Días que una tarea puede adelantarse.
+        :return: Diccionario ID de técnico -> planes diarios en orden de fecha.
+        """
+        desde = desde or date.today()
+        with self.sistema.bloqueo:
+            # Técnico -> ubicación -> tuplas (vencimiento, minutos, tarea)
+            grupos: Dict[str, Dict[str, List[Tuple[date, int, TareaMantenimiento]]]] = {}
+            for ubicacion_id, tareas in self._pendientes_por_ubicacion.items():
+                for tarea in tareas.values():
+                    if tecnico_id is not None and tarea.tecnico_asignado.id != tecnico_id:
+                        continue
+                    vencimiento = max(tarea.fecha_programada.date(), desde)
+                    grupos.setdefault(tarea.tecnico_asignado.id, {}).setdefault(ubicacion_id, []).append(
+                        (vencimiento, self.duracion(tarea), tarea))
+
+            planes = {}
+            for id_tecnico, por_ubicacion in grupos.items():
+                tecnico = next(iter(por_ubicacion.values()))[0][2].tecnico_asignado
+                pendientes = [_Pendientes(tareas[0][2].equipo.ubicacion, tareas)
+                              for tareas in por_ubicacion.values()]
+                planes[id_tecnico] = self._planificar_tecnico(
+                    tecnico, pendientes, desde, jornada_minutos, timedelta(days=adelanto_dias))
+        return planes
+
+    def _planificar_tecnico(self, tecnico: Tecnico, pendientes: List[_Pendientes], desde: date,
+                            jornada_minutos: int, adelanto: timedelta) -> List[PlanDia]:
+        """
+        Arma los planes diarios de un técnico (ver planificar).
+
+        :param tecnico: Técnico a planificar.
+        :param pendientes: Tareas pendientes del técnico, una entrada por ubicación.
+        :param desde: Primer día del plan.
+        :param jornada_minutos: Minutos de trabajo por día.
+        :param adelanto: Anticipación con la que una tarea pasa a ser elegible.
+        :return: Planes diarios en orden de fecha.
+        """
+        planes = []
+        dia = desde
+        while True:
+            for grupo in pendientes:
+                grupo.habilitar(dia + adelanto)
+            con_elegibles = [grupo for grupo in pendientes if grupo.elegibles]
+            if not con_elegibles:
+                proximos = [v for v in (grupo.proximo_vencimiento() for grupo in pendientes) if v is not None]
+                if not proximos:
+                    return planes
+                # Salta los días sin tareas elegibles
+                dia = max(dia + timedelta(days=1), min(proximos) - adelanto)
+                continue
+
+            plan = PlanDia(tecnico, dia)
+            disponibles = jornada_minutos
+            # La primera ubicación es la de la tarea que vence antes
+            grupo = min(con_elegibles, key=lambda g: (g.elegibles[0][0], -g.minutos))
+            while grupo is not None:
+                tomadas, ocupados = grupo.tomar(disponibles, al_menos_una=not plan.visitas)
+                if tomadas:
+                    plan.visitas.append((grupo.ubicacion, tomadas))
+                    disponibles -= ocupados
+                con_elegibles.remove(grupo)
+                grupo = self._siguiente_ubicacion(con_elegibles, dia, disponibles)
+            planes.append(plan)
+            dia += timedelta(days=1)
+
+    def _siguiente_ubicacion(self, candidatos: List[_Pendientes], dia: date,
+                             disponibles: int) -> Optional[_Pendientes]:
+        """
+        Elige la próxima ubicación del día: la de la tarea vencida más antigua, o si no
+        hay vencidas, la que más minutos elegibles tiene. Si ninguna de sus tareas entra
+        en el tiempo que queda, no se agrega al plan y se prueba con la siguiente.
+
+        :param candidatos: Ubicaciones con tareas elegibles aún no visitadas en el día.
+        :param dia: Día planificado.
+        :param disponibles: Minutos que quedan en el día.
+        :return: Ubicación elegida, o None si no queda tiempo ni candidatos.
+        """
+        if disponibles <= 0 or not candidatos:
+            return None
+        vencidas = [g for g in candidatos if g.elegibles[0][0] <= dia]
+        if vencidas:
+            return min(vencidas, key=lambda g: (g.elegibles[0][0], -g.minutos))
+        return max(candidatos, key=lambda g: g.minutos)
+
+    def _registrar_equipo(self, equipo: Equipo):
+        """
+        Registra un equipo bajo su ubicación actual, moviendo sus tareas pendientes si cambió.
+
+        :param equipo: Equipo a registrar.
+        """
+        nueva = equipo.ubicacion.id
+        anterior = self._ubicacion_de_equipo.get(equipo.id)
+        if anterior == nueva:
+            return
+        if anterior is not None:
+            self._quitar_equipo(equipo.id)
+            mover = [t for t in self._pendientes_por_ubicacion.get(anterior, {}).values()
+                     if t.equipo.id == equipo.id]
+            for tarea in mover:
+                self._registrar_tarea(tarea)
+        self._equipos_por_ubicacion.setdefault(nueva, {})[equipo.id] = equipo
+        self._ubicacion_de_equipo[equipo.id] = nueva
+
+    def _quitar_equipo(self, equipo_id: str):
+        """
+        Quita un equipo del índice por ubicación, si estaba.
+
+        :param equipo_id: Identificador del equipo.
+        """
+        ubicacion_id = self._ubicacion_de_equipo.pop(equipo_id, None)
+        if ubicacion_id is not None:
+            self._quitar_de_indice(self._equipos_por_ubicacion, ubicacion_id, equipo_id)
+
+    def _registrar_tarea(self, tarea: TareaMantenimiento):
+        """
+        Registra una tarea pendiente bajo la ubicación de su equipo, o la quita si ya no
+        está pendiente.
+
+        :param tarea: Tarea a registrar.
+        """
+        if tarea.estado != EstadoTarea.PENDIENTE:
+            self._quitar_tarea(tarea.id)
+            return
+        nueva = tarea.equipo.ubicacion.id
+        if self._ubicacion_de_tarea.get(tarea.id) != nueva:
+            self._quitar_tarea(tarea.id)
+            self._pendientes_por_ubicacion.setdefault(nueva, {})[tarea.id] = tarea
+            self._ubicacion_de_tarea[tarea.id] = nueva
+
+    def _quitar_tarea(self, tarea_id: str):
+        """
+        Quita una tarea del índice por ubicación, si estaba.
+
+        :param tarea_id: Identificador de la tarea.
+        """
+        ubicacion_id = self._ubicacion_de_tarea.pop(tarea_id, None)
+        if ubicacion_id is not None:
+            self._quitar_de_indice(self._pendientes_por_ubicacion, ubicacion_id, tarea_id)
+
+    def _quitar_de_indice(self, indice: dict, ubicacion_id: str, entidad_id: str):
+        """
+        Quita una entidad de una ubicación de un índice, descartando la ubicación si queda vacía.
+
+        :param indice: Índice por ubicación.
+        :param ubicacion_id: Ubicación bajo la que está la entidad.
+        :param entidad_id: Identificador de la entidad.
+        """
+        grupo = indice.get(ubicacion_id)
+        if grupo is not None:
+            grupo.pop(entidad_id, None)
+            if not grupo:
+                del indice[ubicacion_id]
+
+    def _al_modificar_sistema(self, operacion: str, coleccion: str, entidad):
+        """
+        Actualiza los índices ante una modificación de un equipo o una tarea.
+
+        :param operacion: "alta", "cambio", "baja" o "carga".
+        :param coleccion: Colección afectada.
+        :param entidad: Entidad afectada.
+        """
+        if coleccion == "equipos":
+            if operacion == "baja":
+                self._quitar_equipo(entidad.id)
+            else:
+                self._registrar_equipo(entidad)
+        elif coleccion == "tareas":
+            if operacion == "baja":
+                self._quitar_tarea(entidad.id)
+            else:
+                self._registrar_tarea(entidad)
@@ -1,25 +1,164 @@
+import heapq
 from collections import defaultdict
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 
+from control.historial import ResumenHistorial
 from modelo.Entidades.Equipo import Equipo
 from modelo.Entidades.EstadoTarea import EstadoTarea
+from modelo.Entidades.TareaMantenimiento import PALABRAS_CLAVE_FALLA, TareaMantenimiento, describe_falla
 from modelo.Entidades.Tecnico import Tecnico
 from modelo.Entidades.TipoMantenimiento import TipoMantenimiento
 from modelo.SistemaMantenimiento import SistemaMantenimiento
 
+# Aporte de una tarea a los agregados:
+# (ID de equipo, ID de técnico si está completada, tipo, duración contabilizada, ID de equipo con falla)
+Aporte = Tuple[str, Optional[str], str, Optional[int], Optional[str]]
+
+
+def aporte_tarea(tarea: TareaMantenimiento) -> Aporte:
+    """
+    Calcula lo que aporta una tarea a cada contador de los reportes.
+
+    :param tarea: Tarea a evaluar.
+    :return: Tupla con el aporte de la tarea.
+    """
+    completada = tarea.estado == EstadoTarea.COMPLETADA
+    duracion = tarea.duracion_minutos if completada and tarea.duracion_minutos else None
+    falla = None
+    if tarea.tipo == TipoMantenimiento.CORRECTIVO and describe_falla(tarea.observaciones):
+        falla = tarea.equipo.id
+    return (tarea.equipo.id,
+            tarea.tecnico_asignado.id if completada else None,
+            tarea.tipo.name,
+            duracion,
+            falla)
+
+
+class AgregadosMantenimiento:
+    """
+        Clase que mantiene materializados los contadores usados por los reportes.
+
+        Se suscribe a las notificaciones del sistema y actualiza los conteos por equipo,
+        por técnico, por tipo y de fallas, además de la suma y cantidad de duraciones,
+        restando el aporte anterior de cada tarea modificada y sumando el nuevo.
+    """
+
+    def __init__(self, sistema: SistemaMantenimiento):
+        """
+        Inicializador de la clase AgregadosMantenimiento.
+
+        :param sistema: Instancia del sistema de mantenimiento.
+        """
+        self.por_equipo: Dict[str, int] = defaultdict(int)
+        self.completadas_por_tecnico: Dict[str, int] = defaultdict(int)
+        self.por_tipo: Dict[str, int] = {tipo.name: 0 for tipo in TipoMantenimiento}
+        self.fallas_por_equipo: Dict[str, int] = defaultdict(int)
+        self.suma_duracion = 0
+        self.cantidad_duracion = 0
+        self._aportes: Dict[str, Aporte] = {}
+
+        for tarea in sistema.tareas:
+            self._sumar(tarea.id, aporte_tarea(tarea))
+        sistema.suscribir(self._al_modificar_sistema)
+
+    def _al_modificar_sistema(self, operacion: str, coleccion: str, entidad):
+        """
+        Actualiza los agregados ante una modificación de una tarea.
+
+        :param operacion: "alta", "cambio", "baja" o "carga".
+        :param coleccion: Colección afectada.
+        :param entidad: Entidad afectada.
+        """
+        if coleccion != "tareas":
+            return
+        anterior = self._aportes.pop(entidad.id, None)
+        if anterior is not None:
+            self._restar(anterior)
+        if operacion != "baja":
+            self._sumar(entidad.id, aporte_tarea(entidad))
+
+    def _sumar(self, tarea_id: str, aporte: Aporte):
+        """
+        Suma el aporte de una tarea a los contadores.
+
+        :param tarea_id: Identificador de la tarea.
+        :param aporte: Aporte de la tarea.
+        """
+        self._aportes[tarea_id] = aporte
+        equipo_id, tecnico_id, tipo, duracion, falla = aporte
+        self.por_equipo[equipo_id] += 1
+        if tecnico_id is not None:
+            self.completadas_por_tecnico[tecnico_id] += 1
+        self.por_tipo[tipo] = self.por_tipo.get(tipo, 0) + 1
+        if duracion is not None:
+            self.suma_duracion += duracion
+            self.cantidad_duracion += 1
+        if falla is not None:
+            self.fallas_por_equipo[falla] += 1
+
+    def _restar(self, aporte: Aporte):
+        """
+        Resta de los contadores el aporte anterior de una tarea.
+
+        :param aporte: Aporte de la tarea.
+        """
+        equipo_id, tecnico_id, tipo, duracion, falla = aporte
+        self._decrementar(self.por_equipo, equipo_id)
+        if tecnico_id is not None:
+            self._decrementar(self.completadas_por_tecnico, tecnico_id)
+        self.por_tipo[tipo] -= 1
+        if duracion is not None:
+            self.suma_duracion -= duracion
+            self.cantidad_duracion -= 1
+        if falla is not None:
+            self._decrementar(self.fallas_por_equipo, falla)
+
+    def _decrementar(self, contador: Dict[str, int], clave: str):
+        """
+        Resta uno a un contador, descartando la clave cuando llega a cero.
+
+        :param contador: Diccionario de conteos.
+        :param clave: Clave a decrementar.
+        """
+        contador[clave] -= 1
+        if not contador[clave]:
+            del contador[clave]
+
 
 class GeneradorReportes:
     """
         Clase que genera reportes basados en los datos del sistema de mantenimiento.
     """
 
-    def __init__(self, sistema: SistemaMantenimiento):
+    def __init__(self, sistema: SistemaMantenimiento, historial=None, archivo=None):
         """
         Inicializador de la clase GeneradorReportes.
 
         :param sistema: Instancia del sistema de mantenimiento.
+        :param historial: HistorialColumnar opcional. Si se indica, cada reporte se calcula
+            recorriendo sus columnas en lugar de mantener contadores materializados.
+        :param archivo: ArchivoHistorico opcional cuyos resúmenes se suman a los conteos
+            de las tareas del sistema.
         """
         self.sistema = sistema
+        self.historial = historial
+        self.archivo = archivo
+        self.agregados = AgregadosMantenimiento(sistema) if historial is None else None
+
+    def _conteos(self):
+        """
+        Devuelve los conteos usados por los reportes: los agregados materializados o un
+        resumen recién calculado sobre el historial columnar, más los conteos del historial
+        diferido que aún no se cargó y los resúmenes de las tareas archivadas si hay un
+        archivo histórico.
+        """
+        conteos = self.historial.resumen() if self.historial is not None else self.agregados
+        pendiente = self.sistema.resumen_historial_pendiente()
+        if pendiente is not None:
+            conteos = ResumenHistorial(**pendiente).combinar(conteos)
+        if self.archivo is not None:
+            return self.archivo.resumen().combinar(conteos)
+        return conteos
 
     def equipos_con_mas_mantenimientos(self, top_n: int = 5) -> List[Tuple[Equipo, int]]:
         """
@@ -28,17 +167,10 @@ class GeneradorReportes:
                 :param top_n: Número máximo de equipos a incluir en el reporte.
                 :return: Lista de tuplas con los equipos y la cantidad de mantenimientos realizados.
         """
-        conteo = defaultdict(int)
-        for tarea in self.sistema.tareas:
-            conteo[tarea.equipo.id] += 1
-
-        equipos_ordenados = sorted(
-            self.sistema.equipos,
-            key=lambda e: conteo[e.id],
-            reverse=True
-        )
+        conteo = self._conteos().por_equipo
+        equipos_ordenados = heapq.nlargest(top_n, self.sistema.equipos, key=lambda e: conteo.get(e.id, 0))
 
-        return [(e, conteo[e.id]) for e in equipos_ordenados[:top_n]]
+        return [(e, conteo.get(e.id, 0)) for e in equipos_ordenados]
 
     def tecnicos_mas_activos(self, top_n: int = 5) -> List[Tuple[Tecnico, int]]:
         """
@@ -47,18 +179,10 @@ class GeneradorReportes:
                 :param top_n: Número máximo de técnicos a incluir en el reporte.
                 :return: Lista de tuplas con los técnicos y la cantidad de tareas completadas.
         """
-        conteo = defaultdict(int)
-        for tarea in self.sistema.tareas:
-            if tarea.estado == EstadoTarea.COMPLETADA:
-                conteo[tarea.tecnico_asignado.id] += 1
-
-        tecnicos_ordenados = sorted(
-            self.sistema.tecnicos,
-            key=lambda t: conteo[t.id],
-            reverse=True
-        )
+        conteo = self._conteos().completadas_por_tecnico
+        tecnicos_ordenados = heapq.nlargest(top_n, self.sistema.tecnicos, key=lambda t: conteo.get(t.id, 0))
 
-        return [(t, conteo[t.id]) for t in tecnicos_ordenados[:top_n]]
+        return [(t, conteo.get(t.id, 0)) for t in tecnicos_ordenados]
 
     def fallas_recurrentes(self) -> Dict[str, int]:
         """
@@ -66,20 +190,11 @@ class GeneradorReportes:
 
                 :return: Diccionario con los nombres de los equipos y la cantidad de fallas registradas.
         """
-        palabras_clave = [
-            "falla", "avería", "daño", "roto", "descompuesto",
-            "mal funcionamiento", "error", "problema"
-        ]
-
         conteo = defaultdict(int)
-        for tarea in self.sistema.tareas:
-            if tarea.tipo == TipoMantenimiento.CORRECTIVO and tarea.observaciones:
-                observacion = tarea.observaciones.lower()
-                for palabra in palabras_clave:
-                    if palabra in observacion:
-                        equipo_nombre = tarea.equipo.nombre
-                        conteo[equipo_nombre] += 1
-                        break
+        for equipo_id, fallas in self._conteos().fallas_por_equipo.items():
+            equipo = self.sistema.obtener_equipo(equipo_id)
+            if equipo is not None:
+                conteo[equipo.nombre] += fallas
 
         return dict(conteo)
 
@@ -89,16 +204,11 @@ class GeneradorReportes:
 
                 :return: Tiempo promedio en minutos. Devuelve 0.0 si no hay tareas completadas.
         """
-        tareas_completadas = [
-            t for t in self.sistema.tareas
-            if t.estado == EstadoTarea.COMPLETADA and t.duracion_minutos
-        ]
-
-        if not tareas_completadas:
+        conteos = self._conteos()
+        if not conteos.cantidad_duracion:
             return 0.0
 
-        total = sum(t.duracion_minutos for t in tareas_completadas)
-        return total / len(tareas_completadas)
+        return conteos.suma_duracion / conteos.cantidad_duracion
 
     def mantenimientos_por_tipo(self) -> Dict[str, int]:
         """
@@ -106,12 +216,4 @@ class GeneradorReportes:
 
                 :return: Diccionario con el tipo de mantenimiento como clave y la cantidad como valor.
         """
-        conteo = {
-            "PREVENTIVO": 0,
-            "CORRECTIVO": 0
-        }
-
-        for tarea in self.sistema.tareas:
-            conteo[tarea.tipo.name] += 1
-
-        return conteo
+        return dict(self._conteos().por_tipo)
@@ -0,0 +1,401 @@
+import math
+import os
+import selectors
+import socket
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from control.gestor_mantenimiento import GestorMantenimiento
+from modelo.Entidades.Equipo import Equipo
+
+# Bytes leídos como máximo de cada fuente por vuelta, para repartir el tiempo entre fuentes
+TAMANO_LECTURA = 1 << 20
+
+
+class FuenteTelemetria(ABC):
+    """
+    Interfaz de las fuentes de lecturas de horas de uso.
+
+    Cada lectura es una línea "ID de equipo,horas", donde las horas son el incremento de
+    uso desde la lectura anterior del mismo equipo y pueden tener decimales.
+    """
+
+    @abstractmethod
+    def leer(self) -> bytes:
+        """
+        Devuelve las líneas completas recibidas desde la llamada anterior, sin esperar.
+
+        :return: Bytes con cero o más líneas terminadas en salto de línea.
+        """
+        pass
+
+    def cerrar(self):
+        """
+        Libera los recursos de la fuente.
+        """
+        pass
+
+
+def _separar_lineas(datos: bytes) -> tuple:
+    """
+    Separa los datos en las líneas completas y el resto sin terminar.
+
+    :param datos: Bytes recibidos.
+    :return: Tupla (líneas completas, resto).
+    """
+    fin = datos.rfind(b"\n") + 1
+    return datos[:fin], datos[fin:]
+
+
+class FuenteCSV(FuenteTelemetria):
+    """
+    Fuente que sigue un archivo CSV al que otro proceso agrega lecturas, como tail -f.
+
+    Si el archivo se trunca o se reemplaza por otro (rotación), se vuelve a leer desde
+    el principio.
+    """
+
+    def __init__(self, ruta: str, desde_inicio: bool = False):
+        """
+        Inicializador de la clase FuenteCSV.
+
+        :param ruta: Ruta del archivo.
+        :param desde_inicio: Indica si se leen las líneas que el archivo ya tiene. Por
+            defecto, solo las que se agreguen.
+        """
+        self.ruta = Path(ruta)
+        self._archivo = None
+        self._inodo = None
+        self._resto = b""
+        self._abrir(desde_inicio)
+
+    def _abrir(self, desde_inicio: bool):
+        """
+        Abre el archivo, si existe, al principio o al final.
+
+        :param desde_inicio: Indica si se lee desde el principio.
+        """
+        try:
+            self._archivo = open(self.ruta, "rb")
+        except FileNotFoundError:
+            return
+        self._inodo = os.fstat(self._archivo.fileno()).st_ino
+        if not desde_inicio:
+            self._archivo.seek(0, os.SEEK_END)
+        self._resto = b""
+
+    def leer(self) -> bytes:
+        if self._archivo is None:
+            self._abrir(desde_inicio=True)
+            if self._archivo is None:
+                return b""
+        datos = self._archivo.read(TAMANO_LECTURA)
+        if not datos:
+            try:
+                estado = os.stat(self.ruta)
+            except FileNotFoundError:
+                return b""
+            if estado.st_ino != self._inodo or estado.st_size < self._archivo.tell():
+                self.cerrar()
+                self._abrir(desde_inicio=True)
+            return b""
+        lineas, self._resto = _separar_lineas(self._resto + datos)
+        return lineas
+
+    def cerrar(self):
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+
+
+class FuenteSocket(FuenteTelemetria):
+    """
+    Fuente que recibe lecturas por un socket UNIX local. Acepta varios clientes a la vez;
+    cada uno envía sus lecturas una por línea.
+    """
+
+    def __init__(self, ruta: str):
+        """
+        Inicializador de la clase FuenteSocket. Crea el socket, reemplazando uno anterior
+        que haya quedado en la misma ruta.
+
+        :param ruta: Ruta del socket.
+        :raises OSError: Si el sistema operativo no tiene sockets UNIX.
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Los sockets UNIX no están disponibles en este sistema")
+        self.ruta = Path(ruta)
+        if self.ruta.is_socket():
+            self.ruta.unlink()
+        self._servidor = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._servidor.bind(str(self.ruta))
+        self._servidor.listen()
+        self._servidor.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._servidor, selectors.EVENT_READ)
+        # Resto sin terminar de cada cliente
+        self._restos: Dict[socket.socket, bytes] = {}
+
+    def leer(self) -> bytes:
+        partes = []
+        for clave, _ in self._selector.select(timeout=0):
+            conexion = clave.fileobj
+            if conexion is self._servidor:
+                cliente, _ = self._servidor.accept()
+                cliente.setblocking(False)
+                self._selector.register(cliente, selectors.EVENT_READ)
+                self._restos[cliente] = b""
+                continue
+            try:
+                datos = conexion.recv(TAMANO_LECTURA)
+            except (BlockingIOError, InterruptedError):
+                continue
+            except OSError:
+                datos = b""
+            if datos:
+                lineas, self._restos[conexion] = _separar_lineas(self._restos[conexion] + datos)
+                partes.append(lineas)
+            else:
+                # El cliente cerró: su última línea cuenta aunque no termine en salto de línea
+                resto = self._restos.pop(conexion)
+                if resto:
+                    partes.append(resto + b"\n")
+                self._selector.unregister(conexion)
+                conexion.close()
+        return b"".join(partes)
+
+    def cerrar(self):
+        for cliente in list(self._restos):
+            self._selector.unregister(cliente)
+            cliente.close()
+        self._restos.clear()
+        self._selector.unregister(self._servidor)
+        self._selector.close()
+        self._servidor.close()
+        if self.ruta.is_socket():
+            self.ruta.unlink()
+
+
+class FuenteCarpeta(FuenteTelemetria):
+    """
+    Fuente que procesa los archivos de lecturas que se depositan en una carpeta.
+
+    Cada archivo se lee completo y se mueve a la carpeta de procesados. Para que no se
+    lea un archivo a medio escribir, quien lo deposita debe escribirlo con otro nombre
+    (por ejemplo, terminado en .tmp) y renombrarlo al terminar.
+    """
+
+    def __init__(self, carpeta: str, patron: str = "*.csv", procesados: Optional[str] = None):
+        """
+        Inicializador de la clase FuenteCarpeta.
+
+        :param carpeta: Carpeta vigilada.
+        :param patron: Patrón de los nombres de archivo a procesar.
+        :param procesados: Carpeta a la que se mueven los archivos leídos. Por defecto,
+            la subcarpeta "procesados".
+        """
+        self.carpeta = Path(carpeta)
+        self.patron = patron
+        self.procesados = Path(procesados) if procesados else self.carpeta / "procesados"
+        self.procesados.mkdir(parents=True, exist_ok=True)
+
+    def leer(self) -> bytes:
+        partes, leidos = [], 0
+        for ruta in sorted(self.carpeta.glob(self.patron), key=lambda r: (r.stat().st_mtime, r.name)):
+            if leidos >= TAMANO_LECTURA:
+                break
+            datos = ruta.read_bytes()
+            os.replace(ruta, self.procesados / ruta.name)
+            if datos and not datos.endswith(b"\n"):
+                datos += b"\n"
+            partes.append(datos)
+            leidos += len(datos)
+        return b"".join(partes)
+
+
+class IngestaTelemetria:
+    """
+    Clase que incorpora al sistema las lecturas de horas de uso de los equipos.
+
+    Un hilo lee las fuentes, acumula los incrementos por equipo y cada intervalo_ms los
+    aplica como un lote, con el bloqueo del sistema tomado una sola vez, de modo que el
+    guardado diferido escribe el lote en un solo guardado. Cada equipo cambia una vez por
+    lote aunque tenga muchas lecturas, y el cambio actualiza las alertas de forma
+    incremental. Las fracciones de hora se acumulan hasta completar una hora.
+
+    Cuando un equipo alcanza sus horas de mantenimiento en un lote, se llama a
+    al_superar con los equipos que lo hicieron y, si se pidió, se planifica su tarea
+    preventiva (ver GestorMantenimiento.planificar_preventivo_por_horas).
+    """
+
+    def __init__(self, fuentes: List[FuenteTelemetria], intervalo_ms: int = 200,
+                 planificar: bool = False,
+                 al_superar: Optional[Callable[[List[Equipo]], None]] = None):
+        """
+        Inicializador de la clase IngestaTelemetria.
+
+        :param fuentes: Fuentes de lecturas.
+        :param intervalo_ms: Tiempo máximo entre la llegada de una lectura y su aplicación.
+        :param planificar: Indica si se planifica una tarea preventiva para los equipos que
+            alcanzan sus horas de mantenimiento.
+        :param al_superar: Función que recibe los equipos que alcanzaron sus horas de
+            mantenimiento en un lote. Se llama desde el hilo de ingesta, con el bloqueo
+            del sistema tomado.
+        """
+        self.fuentes = list(fuentes)
+        self.intervalo_ms = intervalo_ms
+        self.planificar = planificar
+        self.al_superar = al_superar
+        self.lecturas = 0
+        self.rechazadas = 0
+        self.desconocidas = 0
+        self._gestor: Optional[GestorMantenimiento] = None
+        # Incrementos sin aplicar: ID de equipo en bytes -> horas
+        self._pendientes: Dict[bytes, float] = {}
+        # Fracciones de hora ya recibidas que todavía no suman una hora completa
+        self._fracciones: Dict[str, float] = {}
+        self._bloqueo = threading.Lock()
+        self._activo = False
+        self._hilo: Optional[threading.Thread] = None
+
+    def vincular(self, gestor: GestorMantenimiento):
+        """
+        Empieza a aplicar las lecturas al sistema de un gestor, iniciando el hilo de
+        ingesta si aún no corre. Hasta vincular un gestor, las fuentes no se leen.
+
+        :param gestor: Gestor del sistema que recibe las lecturas.
+        """
+        with self._bloqueo:
+            self._gestor = gestor
+        if self._hilo is None:
+            self._activo = True
+            self._hilo = threading.Thread(target=self._ejecutar, name="telemetria", daemon=True)
+            self._hilo.start()
+
+    def cerrar(self):
+        """
+        Detiene el hilo de ingesta, aplica las lecturas pendientes y cierra las fuentes.
+        Si nunca se vinculó un gestor, las fuentes se cierran sin leerlas, para no
+        descartar lecturas que no tienen dónde aplicarse.
+        """
+        self._activo = False
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+        if self._gestor is not None:
+            self._leer_fuentes()
+            self.aplicar()
+        for fuente in self.fuentes:
+            fuente.cerrar()
+
+    def procesar(self, datos: bytes):
+        """
+        Acumula las lecturas de un bloque de líneas. Las líneas vacías se ignoran; las
+        que no tienen un incremento de horas válido, no negativo, se cuentan como
+        rechazadas.
+
+        :param datos: Líneas "ID de equipo,horas" terminadas en salto de línea.
+        """
+        lecturas = rechazadas = 0
+        with self._bloqueo:
+            pendientes = self._pendientes
+            for linea in datos.split(b"\n"):
+                equipo_id, _, horas = linea.partition(b",")
+                try:
+                    valor = float(horas)
+                except ValueError:
+                    if linea.strip():
+                        rechazadas += 1
+                    continue
+                if not 0.0 <= valor < math.inf:
+                    rechazadas += 1
+                    continue
+                pendientes[equipo_id] = pendientes.get(equipo_id, 0.0) + valor
+                lecturas += 1
+            self.lecturas += lecturas
+            self.rechazadas += rechazadas
+
+    def aplicar(self) -> List[Equipo]:
+        """
+        Aplica al sistema los incrementos acumulados, como un lote.
+
+        :return: Equipos que alcanzaron sus horas de mantenimiento en este lote.
+        """
+        with self._bloqueo:
+            gestor = self._gestor
+            if gestor is None or not self._pendientes:
+                return []
+            pendientes, self._pendientes = self._pendientes, {}
+
+        # Un mismo equipo puede llegar con distintos bytes (espacios, por ejemplo)
+        incrementos: Dict[str, float] = {}
+        for equipo_id, horas in pendientes.items():
+            clave = equipo_id.decode("utf-8", "replace").strip()
+            incrementos[clave] = incrementos.get(clave, 0.0) + horas
+
+        superados = []
+        sistema = gestor.sistema
+        with sistema.bloqueo:
+            for equipo_id, horas in incrementos.items():
+                equipo = sistema.obtener_equipo(equipo_id)
+                if equipo is None:
+                    self.desconocidas += 1
+                    continue
+                horas += self._fracciones.pop(equipo_id, 0.0)
+                enteras = int(horas)
+                if horas > enteras:
+                    self._fracciones[equipo_id] = horas - enteras
+                if not enteras:
+                    continue
+                estaba = equipo.necesita_mantenimiento()
+                equipo.horas_uso += enteras
+                if not estaba and equipo.necesita_mantenimiento():
+                    superados.append(equipo)
+
+            if superados:
+                if self.planificar:
+                    gestor.planificar_preventivo_por_horas(superados)
+                if self.al_superar is not None:
+                    self.al_superar(superados)
+        return superados
+
+    def _leer_fuentes(self) -> int:
+        """
+        Lee una vez cada fuente y acumula sus lecturas. Una fuente que falla se informa
+        y no detiene a las demás.
+
+        :return: Cantidad de bytes leídos.
+        """
+        leidos = 0
+        for fuente in self.fuentes:
+            try:
+                datos = fuente.leer()
+            except OSError as e:
+                print(f"Error al leer la telemetría de {fuente.__class__.__name__}: {e}")
+                continue
+            if datos:
+                self.procesar(datos)
+                leidos += len(datos)
+        return leidos
+
+    def _ejecutar(self):
+        """
+        Bucle del hilo de ingesta: lee las fuentes sin pausa mientras llegan datos y
+        aplica un lote cada intervalo_ms.
+        """
+        intervalo = self.intervalo_ms / 1000
+        proximo_lote = time.monotonic() + intervalo
+        while self._activo:
+            leidos = self._leer_fuentes()
+            ahora = time.monotonic()
+            if ahora >= proximo_lote:
+                try:
+                    self.aplicar()
+                except Exception as e:
+                    print(f"Error al aplicar la telemetría: {e}")
+                proximo_lote = ahora + intervalo
+            if not leidos:
+                time.sleep(min(intervalo, 0.05))
@@ -0,0 +1,226 @@
+import queue
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Set
+
+
+class TrabajoCancelado(Exception):
+    """
+    Excepción que interrumpe un trabajo cuando detecta que fue cancelado.
+    """
+
+
+class Trabajo:
+    """
+    Clase que representa un trabajo enviado al ejecutor en segundo plano.
+
+    La función del trabajo recibe esta instancia como primer argumento para reportar
+    su avance y consultar si fue cancelada.
+    """
+
+    def __init__(self, descripcion: str, cola: queue.Queue, cancelable: bool = True,
+                 al_terminar: Optional[Callable] = None, al_error: Optional[Callable] = None,
+                 al_progreso: Optional[Callable] = None, al_cancelar: Optional[Callable] = None):
+        """
+        Inicializador de la clase Trabajo.
+
+        :param descripcion: Texto que describe el trabajo.
+        :param cola: Cola de eventos del ejecutor.
+        :param cancelable: Indica si el trabajo admite cancelación.
+        :param al_terminar: Función que recibe el resultado del trabajo.
+        :param al_error: Función que recibe la excepción lanzada por el trabajo.
+        :param al_progreso: Función que recibe (avance, mensaje).
+        :param al_cancelar: Función sin argumentos llamada si el trabajo se cancela.
+        """
+        self.descripcion = descripcion
+        self.cancelable = cancelable
+        self.al_terminar = al_terminar
+        self.al_error = al_error
+        self.al_progreso = al_progreso
+        self.al_cancelar = al_cancelar
+        self.futuro: Optional[Future] = None
+        self._cola = cola
+        self._cancelado = threading.Event()
+
+    @property
+    def cancelado(self) -> bool:
+        """
+        Indica si se solicitó la cancelación del trabajo.
+        """
+        return self._cancelado.is_set()
+
+    def cancelar(self) -> bool:
+        """
+        Solicita la cancelación del trabajo.
+
+        Si todavía no empezó, no llega a ejecutarse; si ya está en curso, se detiene en
+        la siguiente llamada a verificar_cancelacion.
+
+        :return: True si la cancelación fue aceptada.
+        """
+        if not self.cancelable or self.cancelado:
+            return False
+        self._cancelado.set()
+        if self.futuro is not None and self.futuro.cancel():
+            # Nunca llegó a ejecutarse, así que nadie más avisará de la cancelación
+            self._cola.put(("cancelado", self, None))
+        return True
+
+    def verificar_cancelacion(self):
+        """
+        Interrumpe el trabajo si fue cancelado.
+
+        :raises TrabajoCancelado: Si se solicitó la cancelación.
+        """
+        if self.cancelado:
+            raise TrabajoCancelado(self.descripcion)
+
+    def reportar_progreso(self, avance: float, mensaje: str = ""):
+        """
+        Envía al hilo principal el avance del trabajo.
+
+        :param avance: Fracción completada, entre 0 y 1.
+        :param mensaje: Texto opcional que describe el paso actual.
+        """
+        self._cola.put(("progreso", self, (avance, mensaje)))
+
+
+class EjecutorTrabajos:
+    """
+    Clase que ejecuta trabajos en un grupo de hilos y entrega sus resultados al hilo
+    principal a través de una cola.
+
+    Los trabajos se envían y sus resultados se procesan siempre desde el hilo principal,
+    que debe llamar periódicamente a procesar_pendientes (por ejemplo con root.after).
+    Así, las funciones de respuesta pueden usar la interfaz gráfica sin riesgo.
+    """
+
+    def __init__(self, max_hilos: int = 2):
+        """
+        Inicializador de la clase EjecutorTrabajos.
+
+        :param max_hilos: Cantidad máxima de hilos de trabajo.
+        """
+        self._ejecutor = ThreadPoolExecutor(max_workers=max_hilos, thread_name_prefix="trabajo")
+        self._cola: queue.Queue = queue.Queue()
+        self._en_curso: Set[Trabajo] = set()
+
+    @property
+    def en_curso(self) -> Set[Trabajo]:
+        """
+        Devuelve los trabajos enviados cuyo resultado aún no fue procesado.
+        """
+        return set(self._en_curso)
+
+    def enviar(self, funcion: Callable, *args, descripcion: str = "", bloqueo=None,
+               cancelable: bool = True, al_terminar: Optional[Callable] = None,
+               al_error: Optional[Callable] = None, al_progreso: Optional[Callable] = None,
+               al_cancelar: Optional[Callable] = None) -> Trabajo:
+        """
+        Envía un trabajo para ejecutarse en segundo plano.
+
+        :param funcion: Función a ejecutar; recibe el trabajo y luego los argumentos.
+        :param args: Argumentos adicionales de la función.
+        :param descripcion: Texto que describe el trabajo.
+        :param bloqueo: Bloqueo que se mantiene durante toda la ejecución, por ejemplo
+            el del sistema de mantenimiento.
+        :param cancelable: Indica si el trabajo admite cancelación.
+        :param al_terminar: Función que recibe el resultado del trabajo.
+        :param al_error: Función que recibe la excepción lanzada por el trabajo.
+        :param al_progreso: Función que recibe (avance, mensaje).
+        :param al_cancelar: Función sin argumentos llamada si el trabajo se cancela.
+        :return: El trabajo enviado.
+        """
+        trabajo = Trabajo(descripcion, self._cola, cancelable, al_terminar, al_error, al_progreso, al_cancelar)
+        self._en_curso.add(trabajo)
+        trabajo.futuro = self._ejecutor.submit(self._ejecutar, trabajo, funcion, args, bloqueo)
+        return trabajo
+
+    def en_hilo_principal(self, funcion: Callable, *args):
+        """
+        Programa una función para que se ejecute en el hilo principal. Puede llamarse
+        desde cualquier hilo.
+
+        :param funcion: Función a ejecutar.
+        :param args: Argumentos de la función.
+        """
+        self._cola.put(("llamada", None, (funcion, args)))
+
+    def procesar_pendientes(self) -> int:
+        """
+        Atiende los eventos acumulados en la cola: avances, resultados, errores,
+        cancelaciones y llamadas programadas. Debe llamarse desde el hilo principal.
+
+        :return: Cantidad de eventos atendidos.
+        """
+        atendidos = 0
+        while True:
+            try:
+                tipo, trabajo, dato = self._cola.get_nowait()
+            except queue.Empty:
+                return atendidos
+            atendidos += 1
+
+            if tipo == "llamada":
+                funcion, args = dato
+                funcion(*args)
+                continue
+            if tipo == "progreso":
+                if trabajo.al_progreso is not None and not trabajo.cancelado:
+                    trabajo.al_progreso(*dato)
+                continue
+
+            # Resultado final del trabajo
+            if trabajo not in self._en_curso:
+                continue
+            self._en_curso.discard(trabajo)
+            if trabajo.cancelado or tipo == "cancelado":
+                # Un trabajo cancelado no entrega su resultado aunque haya llegado a terminar
+                if trabajo.al_cancelar is not None:
+                    trabajo.al_cancelar()
+            elif tipo == "error":
+                if trabajo.al_error is not None:
+                    trabajo.al_error(dato)
+            elif trabajo.al_terminar is not None:
+                trabajo.al_terminar(dato)
+
+    def cancelar_todos(self):
+        """
+        Solicita la cancelación de todos los trabajos cancelables en curso.
+        """
+        for trabajo in list(self._en_curso):
+            trabajo.cancelar()
+
+    def cerrar(self, esperar: bool = True):
+        """
+        Cancela los trabajos cancelables y detiene los hilos de trabajo.
+
+        :param esperar: Indica si se espera a que terminen los trabajos que no se
+            pueden cancelar.
+        """
+        self.cancelar_todos()
+        self._ejecutor.shutdown(wait=esperar)
+
+    def _ejecutar(self, trabajo: Trabajo, funcion: Callable, args: tuple, bloqueo):
+        """
+        Ejecuta un trabajo en un hilo de trabajo y deja su resultado en la cola.
+
+        :param trabajo: Trabajo a ejecutar.
+        :param funcion: Función del trabajo.
+        :param args: Argumentos adicionales de la función.
+        :param bloqueo: Bloqueo a mantener durante la ejecución, o None.
+        """
+        try:
+            trabajo.verificar_cancelacion()
+            if bloqueo is None:
+                resultado = funcion(trabajo, *args)
+            else:
+                with bloqueo:
+                    trabajo.verificar_cancelacion()
+                    resultado = funcion(trabajo, *args)
+        except TrabajoCancelado:
+            self._cola.put(("cancelado", trabajo, None))
+        except Exception as e:
+            self._cola.put(("error", trabajo, e))
+        else:
+            self._cola.put(("terminado", trabajo, resultado))
@@ -0,0 +1,111 @@
+"""
+Comparación de los códecs de compresión de las instantáneas.
+
+Genera un sistema de prueba y, para cada formato (JSON y NDJSON) y cada códec, informa
+el tamaño del archivo y los tiempos de guardado y de carga sin caché. Uso:
+
+    python -m herramientas.comparar_compresion [cantidad de tareas] [carpeta]
+
+La carpeta por defecto es una temporal; conviene indicar una en el almacenamiento real
+(por ejemplo, la unidad de red) para que los tiempos incluyan su latencia.
+"""
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from modelo.Entidades.Equipo import Equipo
+from modelo.Entidades.EstadoTarea import EstadoTarea
+from modelo.Entidades.TareaMantenimiento import TareaMantenimiento
+from modelo.Entidades.Tecnico import Tecnico
+from modelo.Entidades.TipoMantenimiento import TipoMantenimiento
+from modelo.Entidades.Ubicacion import Ubicacion
+from modelo.SistemaMantenimiento import SistemaMantenimiento
+from modelo.compresion import CODECS
+from modelo.persistencia import PersistenciaJSON
+from modelo.persistencia_ndjson import PersistenciaNDJSON
+
+
+def sistema_de_prueba(cantidad: int) -> SistemaMantenimiento:
+    """
+    Crea un sistema con datos variados, para que la compresión sea representativa.
+
+    :param cantidad: Cantidad de tareas.
+    :return: Sistema con 20 ubicaciones, una cantidad de equipos proporcional a las
+        tareas, 50 técnicos y las tareas indicadas.
+    """
+    azar = random.Random(0)
+    sistema = SistemaMantenimiento()
+    ubicaciones = [Ubicacion(f"UB-{i}", f"Nave {i}", f"Sector {i % 4}") for i in range(20)]
+    for ubicacion in ubicaciones:
+        sistema.agregar_ubicacion(ubicacion)
+    equipos = [Equipo(f"EQ-{i}", f"Equipo {i}", azar.choice(ubicaciones),
+                      datetime(2015, 1, 1) + timedelta(days=azar.randint(0, 3000)),
+                      azar.randint(0, 5000), azar.choice((100, 250, 500)))
+               for i in range(max(1, cantidad // 50))]
+    for equipo in equipos:
+        sistema.agregar_equipo(equipo)
+    tecnicos = [Tecnico(f"TEC-{i}", f"Técnico {i}", azar.choice(("Eléctrica", "Mecánica", "General")))
+                for i in range(50)]
+    for tecnico in tecnicos:
+        sistema.agregar_tecnico(tecnico)
+
+    inicio = datetime(2020, 1, 1)
+    for i in range(cantidad):
+        fecha = inicio + timedelta(minutes=azar.randint(0, 3_000_000))
+        estado = azar.choice(list(EstadoTarea))
+        completada = estado == EstadoTarea.COMPLETADA
+        sistema.agregar_tarea(TareaMantenimiento(
+            f"TAR-{i}", azar.choice(list(TipoMantenimiento)), azar.choice(equipos), fecha,
+            azar.choice(tecnicos), estado, azar.choice(("", "Sin novedad", "Cambio de filtro")),
+            fecha + timedelta(hours=azar.randint(1, 48)) if completada else None,
+            azar.randint(15, 480) if completada else None))
+    return sistema
+
+
+def comparar(cantidad: int = 100_000,
+             carpeta: Optional[str] = None) -> List[Tuple[str, str, int, float, float]]:
+    """
+    Guarda y vuelve a cargar el sistema de prueba con cada formato y códec.
+
+    :param cantidad: Cantidad de tareas del sistema de prueba.
+    :param carpeta: Carpeta donde se escriben los archivos; se crea si no existe. Por
+        defecto, una temporal.
+    :return: Lista de tuplas (formato, códec, bytes, segundos al guardar, segundos al cargar).
+    """
+    if carpeta is not None:
+        Path(carpeta).mkdir(parents=True, exist_ok=True)
+    sistema = sistema_de_prueba(cantidad)
+    resultados = []
+    with tempfile.TemporaryDirectory(dir=carpeta) as directorio:
+        for formato in ("JSON", "NDJSON"):
+            for codec in (None, *CODECS):
+                ruta = str(Path(directorio) / f"prueba.{formato.lower()}")
+                if formato == "JSON":
+                    persistencia = PersistenciaJSON(ruta, usar_cache=False, compresion=codec)
+                else:
+                    persistencia = PersistenciaNDJSON(ruta, None, usar_cache=False, compresion=codec)
+
+                inicio = time.perf_counter()
+                persistencia.guardar(sistema)
+                guardado = time.perf_counter() - inicio
+                inicio = time.perf_counter()
+                cargado = persistencia.cargar()
+                carga = time.perf_counter() - inicio
+
+                assert len(cargado.tareas) == cantidad
+                resultados.append((formato, codec or "ninguno", persistencia.archivo.stat().st_size,
+                                   guardado, carga))
+    return resultados
+
+
+if __name__ == "__main__":
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    carpeta = sys.argv[2] if len(sys.argv) > 2 else None
+    print(f"{cantidad} tareas")
+    print(f"{'formato':8} {'códec':8} {'tamaño (KB)':>12} {'guardar (s)':>12} {'cargar (s)':>11}")
+    for formato, codec, tamano, guardado, carga in comparar(cantidad, carpeta):
+        print(f"{formato:8} {codec:8} {tamano / 1024:12.0f} {guardado:12.2f} {carga:11.2f}")
@@ -0,0 +1,95 @@
+"""
+Importación masiva de ubicaciones, equipos, técnicos y tareas desde archivos CSV.
+
+Carga los datos guardados, importa los archivos indicados y guarda una sola vez al
+terminar. La colección de cada archivo se deduce de su nombre (ubicaciones*.csv,
+equipos*.csv, tecnicos*.csv, tareas*.csv). Uso, con la aplicación cerrada:
+
+    python -m herramientas.importar_csv [--procesos N] [--errores rechazos.csv] archivo.csv ...
+
+Las columnas de cada colección están en control.importacion.COLUMNAS; las filas
+rechazadas se informan con su número de línea y no interrumpen la importación.
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+
+from control.importacion import ImportadorCSV, coleccion_de_archivo
+from modelo.persistencia_bitacora import PersistenciaBitacora
+from modelo.persistencia_ndjson import PersistenciaNDJSON
+
+
+def main(argumentos=None) -> int:
+    """
+    Ejecuta la importación desde la línea de comandos.
+
+    :param argumentos: Argumentos de la línea de comandos. Por defecto, los del proceso.
+    :return: Código de salida: 0 si no hubo filas rechazadas, 1 si las hubo, 2 si no se
+        pudo importar.
+    """
+    parser = argparse.ArgumentParser(description="Importa datos desde archivos CSV.")
+    parser.add_argument("archivos", nargs="+", help="Archivos CSV a importar")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1,
+                        help="Procesos que validan las filas (por defecto, uno por CPU)")
+    parser.add_argument("--delimitador", default=",", help="Separador de columnas")
+    parser.add_argument("--errores", help="Archivo CSV donde se escriben las filas rechazadas")
+    parser.add_argument("--datos", default="datos/mantenimiento.json",
+                        help="Archivo de datos del sistema; con extensión .ndjson se usa PersistenciaNDJSON, "
+                             "que guarda sin armar el documento completo en memoria")
+    opciones = parser.parse_args(argumentos)
+
+    try:
+        archivos = {}
+        for archivo in opciones.archivos:
+            coleccion = coleccion_de_archivo(archivo)
+            if coleccion in archivos:
+                raise ValueError(f"Hay más de un archivo de {coleccion}")
+            archivos[coleccion] = archivo
+    except ValueError as e:
+        print(e)
+        return 2
+
+    if opciones.datos.endswith(".ndjson"):
+        persistencia = PersistenciaNDJSON(opciones.datos, None)
+    else:
+        persistencia = PersistenciaBitacora(opciones.datos)
+    sistema = persistencia.cargar()
+
+    reporte = open(opciones.errores, "w", newline="", encoding="utf-8") if opciones.errores else None
+    try:
+        al_error = None
+        if reporte is not None:
+            escritor = csv.writer(reporte)
+            escritor.writerow(("archivo", "linea", "error"))
+            al_error = lambda archivo, linea, mensaje: escritor.writerow((archivo, linea, mensaje))
+        importador = ImportadorCSV(sistema, opciones.procesos, opciones.delimitador, al_error)
+
+        inicio = time.perf_counter()
+        try:
+            resultados = importador.importar(archivos)
+        except (OSError, ValueError) as e:
+            print(f"No se pudo importar: {e}")
+            return 2
+        importacion = time.perf_counter() - inicio
+    finally:
+        if reporte is not None:
+            reporte.close()
+
+    # Un único guardado con todo lo importado; si no se importó nada no hay qué guardar
+    inicio = time.perf_counter()
+    if any(importadas for importadas, _ in resultados.values()):
+        persistencia.guardar(sistema)
+    guardado = time.perf_counter() - inicio
+
+    rechazadas = 0
+    for coleccion, (importadas, rechazos) in resultados.items():
+        print(f"{coleccion}: {importadas} importadas, {rechazos} rechazadas")
+        rechazadas += rechazos
+    print(f"Importación: {importacion:.1f} s; guardado: {guardado:.1f} s")
+    return 1 if rechazadas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
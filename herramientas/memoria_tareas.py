@@ -0,0 +1,79 @@
+"""
+Medición del consumo de memoria por tarea de mantenimiento.
+
+Crea una cantidad grande de tareas sobre un mismo equipo y técnico y usa tracemalloc
+para informar los bytes que ocupa cada una, junto con los de una réplica de la tarea
+anterior a __slots__ que guarda sus atributos en un diccionario por instancia. Uso:
+
+    python -m herramientas.memoria_tareas [cantidad]
+"""
+import sys
+import tracemalloc
+from datetime import datetime
+from typing import Callable
+
+from modelo.Entidades.Equipo import Equipo
+from modelo.Entidades.EstadoTarea import EstadoTarea
+from modelo.Entidades.TareaMantenimiento import TareaMantenimiento
+from modelo.Entidades.Tecnico import Tecnico
+from modelo.Entidades.TipoMantenimiento import TipoMantenimiento
+from modelo.Entidades.Ubicacion import Ubicacion
+
+
+class TareaConDiccionario:
+    """
+    Réplica de TareaMantenimiento sin __slots__, como referencia para la medición.
+
+    Guarda los mismos atributos que guardaba la tarea antes de declarar __slots__, en el
+    __dict__ de cada instancia; el observador era un atributo de clase.
+    """
+
+    _observador = None
+
+    def __init__(self, id, tipo, equipo, fecha_programada, tecnico_asignado,
+                 estado=EstadoTarea.PENDIENTE, observaciones="", fecha_realizacion=None,
+                 duracion_minutos=None):
+        self.id = id
+        self._tipo = tipo
+        self._equipo = equipo
+        self._fecha_programada = fecha_programada
+        self._tecnico_asignado = tecnico_asignado
+        self._estado = estado
+        self.observaciones = observaciones
+        self.fecha_realizacion = fecha_realizacion
+        self.duracion_minutos = duracion_minutos
+
+
+def medir_bytes_por_tarea(cantidad: int = 1_000_000, clase: Callable = TareaMantenimiento) -> float:
+    """
+    Mide la memoria que ocupan las tareas creadas, sin contar sus IDs.
+
+    :param cantidad: Cantidad de tareas a crear.
+    :param clase: Clase de las tareas; TareaConDiccionario para medir la referencia.
+    :return: Bytes promedio por tarea, incluida su referencia en la lista que las contiene.
+    """
+    ubicacion = Ubicacion("U-1", "Planta")
+    equipo = Equipo("EQ-1", "Equipo", ubicacion, datetime(2020, 1, 1))
+    tecnico = Tecnico("TEC-1", "Técnico", "General")
+    fecha = datetime(2024, 1, 1)
+    # Los IDs se crean antes de medir: su tamaño no depende de la representación de la tarea
+    ids = [f"TAR-{i}" for i in range(cantidad)]
+
+    tracemalloc.start()
+    try:
+        inicial = tracemalloc.get_traced_memory()[0]
+        tareas = [clase(id, TipoMantenimiento.PREVENTIVO, equipo, fecha, tecnico) for id in ids]
+        final = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    del tareas
+    return (final - inicial) / cantidad
+
+
+if __name__ == "__main__":
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    antes = medir_bytes_por_tarea(cantidad, TareaConDiccionario)
+    despues = medir_bytes_por_tarea(cantidad)
+    print(f"{cantidad} tareas: {antes:.1f} bytes por tarea con __dict__, "
+          f"{despues:.1f} con __slots__ ({despues - antes:+.1f})")
@@ -3,11 +3,15 @@ Módulo principal del sistema de gestión de mantenimiento industrial.
 
 Este módulo inicializa los componentes principales del sistema, carga los datos
 existentes desde el almacenamiento, y lanza la interfaz gráfica para la interacción
-con el usuario. Al finalizar, guarda los datos actualizados.
+con el usuario. Los cambios se guardan en segundo plano y lo pendiente se escribe al salir.
 """
+from control.archivo_historico import ArchivoHistorico
 from control.gestor_mantenimiento import GestorMantenimiento
 from control.reportes import GeneradorReportes
-from modelo.persistencia import PersistenciaJSON
+from control.telemetria import FuenteCarpeta, IngestaTelemetria
+from modelo.SistemaMantenimiento import SistemaMantenimiento
+from modelo.guardado_diferido import GuardadoDiferido, LOTES
+from modelo.persistencia_bitacora import PersistenciaBitacora
 from vista.main_window import MainWindow
 
 
@@ -16,25 +20,31 @@ def main():
        Función principal del sistema.
 
        Realiza las siguientes operaciones:
-       - Carga los datos existentes desde un archivo de persistencia.
-       - Inicializa los componentes del sistema, como el gestor de mantenimiento y el generador de reportes.
-       - Crea y ejecuta la interfaz gráfica principal.
-       - Guarda los datos actualizados al salir del sistema.
+       - Crea la interfaz gráfica principal con un sistema vacío.
+       - Carga en segundo plano los datos existentes desde la instantánea JSON y su bitácora de cambios.
+       - Ejecuta la interfaz gráfica principal, agrupando los cambios en guardados por lotes.
+       - Aplica las lecturas de horas de uso que llegan a la carpeta de telemetría.
+       - Guarda los cambios pendientes al salir del sistema.
     """
-    # Cargar datos existentes
-    persistencia = PersistenciaJSON()
-    sistema = persistencia.cargar()
-
-    # Inicializar componentes del sistema
+    # Inicializar componentes con un sistema vacío hasta que termine la carga
+    persistencia = PersistenciaBitacora()
+    sistema = SistemaMantenimiento()
     gestor = GestorMantenimiento(sistema)
-    generador_reportes = GeneradorReportes(sistema)
-
-    # Crear y mostrar la interfaz gráfica
-    app = MainWindow(gestor, generador_reportes)
+    archivo_historico = ArchivoHistorico()
+    generador_reportes = GeneradorReportes(sistema, archivo=archivo_historico)
+    # Modos disponibles: INMEDIATO, LOTES (cada intervalo_ms) o AL_SALIR
+    guardado = GuardadoDiferido(persistencia, modo=LOTES, intervalo_ms=500)
+    # Lecturas de horas de uso depositadas en datos/telemetria; también hay FuenteCSV y
+    # FuenteSocket. Con planificar=True se crea la preventiva del equipo que alcanza sus horas.
+    telemetria = IngestaTelemetria([FuenteCarpeta("datos/telemetria")], planificar=False)
+
+    # Crear y mostrar la interfaz gráfica; los datos se cargan sin bloquearla
+    app = MainWindow(gestor, generador_reportes, persistencia, guardado, archivo_historico, telemetria)
+    app.cargar_datos()
     app.ejecutar()
 
-    # Guardar datos al salir
-    persistencia.guardar(sistema)
+    # Guardar lo pendiente al salir, solo si la carga llegó a completarse
+    app.finalizar()
 
 
 if __name__ == "__main__":
@@ -2,15 +2,19 @@ from datetime import datetime
 
 from modelo.Entidades.Identificable import Identificable
 from modelo.Entidades.Mantenible import Mantenible
+from modelo.Entidades.Observable import Observable
 from modelo.Entidades.Ubicacion import Ubicacion
 
 
 # Clase Equipo con herencia múltiple
-class Equipo(Identificable, Mantenible):
+class Equipo(Identificable, Mantenible, Observable):
     """
         Clase que representa un equipo que puede requerir mantenimiento.
     """
 
+    __slots__ = ("_id", "_nombre", "_ubicacion", "_fecha_instalacion", "_horas_uso",
+                 "_horas_mantenimiento")
+
     def __init__(self, id: str, nombre: str, ubicacion: Ubicacion,
                  fecha_instalacion: datetime, horas_uso: int = 0,
                  horas_mantenimiento: int = 100):
@@ -24,12 +28,13 @@ class Equipo(Identificable, Mantenible):
                 :param horas_uso: Horas de uso acumuladas del equipo.
                 :param horas_mantenimiento: Horas de uso requeridas para mantenimiento.
         """
+        self._observador = None
         self._id = id
-        self.nombre = nombre
-        self.ubicacion = ubicacion
-        self.fecha_instalacion = fecha_instalacion
-        self.horas_uso = horas_uso
-        self.horas_mantenimiento = horas_mantenimiento
+        self._nombre = nombre
+        self._ubicacion = ubicacion
+        self._fecha_instalacion = fecha_instalacion
+        self._horas_uso = horas_uso
+        self._horas_mantenimiento = horas_mantenimiento
 
     @property
     def id(self) -> str:
@@ -38,6 +43,86 @@ class Equipo(Identificable, Mantenible):
         """
         return self._id
 
+    @property
+    def nombre(self) -> str:
+        """
+                Devuelve el nombre del equipo.
+        """
+        return self._nombre
+
+    @nombre.setter
+    def nombre(self, valor: str):
+        """
+                Cambia el nombre del equipo.
+        """
+        anterior, self._nombre = self._nombre, valor
+        if anterior != valor:
+            self._avisar_cambio("nombre", anterior)
+
+    @property
+    def ubicacion(self) -> Ubicacion:
+        """
+                Devuelve la ubicación del equipo.
+        """
+        return self._ubicacion
+
+    @ubicacion.setter
+    def ubicacion(self, valor: Ubicacion):
+        """
+                Traslada el equipo a otra ubicación.
+        """
+        anterior, self._ubicacion = self._ubicacion, valor
+        if anterior is not valor:
+            self._avisar_cambio("ubicacion", anterior)
+
+    @property
+    def fecha_instalacion(self) -> datetime:
+        """
+                Devuelve la fecha de instalación del equipo.
+        """
+        return self._fecha_instalacion
+
+    @fecha_instalacion.setter
+    def fecha_instalacion(self, valor: datetime):
+        """
+                Cambia la fecha de instalación del equipo.
+        """
+        anterior, self._fecha_instalacion = self._fecha_instalacion, valor
+        if anterior != valor:
+            self._avisar_cambio("fecha_instalacion", anterior)
+
+    @property
+    def horas_uso(self) -> int:
+        """
+                Devuelve las horas de uso acumuladas del equipo.
+        """
+        return self._horas_uso
+
+    @horas_uso.setter
+    def horas_uso(self, valor: int):
+        """
+                Actualiza las horas de uso acumuladas del equipo.
+        """
+        anterior, self._horas_uso = self._horas_uso, valor
+        if anterior != valor:
+            self._avisar_cambio("horas_uso", anterior)
+
+    @property
+    def horas_mantenimiento(self) -> int:
+        """
+                Devuelve las horas de uso requeridas para mantenimiento.
+        """
+        return self._horas_mantenimiento
+
+    @horas_mantenimiento.setter
+    def horas_mantenimiento(self, valor: int):
+        """
+                Cambia las horas de uso requeridas para mantenimiento.
+        """
+        anterior, self._horas_mantenimiento = self._horas_mantenimiento, valor
+        if anterior != valor:
+            self._avisar_cambio("horas_mantenimiento", anterior)
+
     def necesita_mantenimiento(self) -> bool:
         """
                 Indica si el equipo necesita mantenimiento basado en las horas de uso.
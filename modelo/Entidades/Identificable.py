@@ -5,6 +5,8 @@ class Identificable(ABC):
     Interfaz abstracta que define un identificador único para las clases que la implementen.
     """
 
+    __slots__ = ()
+
     @property
     @abstractmethod
     def id(self) -> str:
@@ -6,6 +6,8 @@ class Mantenible(ABC):
     Interfaz abstracta que define el comportamiento de los objetos que requieren mantenimiento.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def necesita_mantenimiento(self) -> bool:
         """
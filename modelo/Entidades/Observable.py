@@ -0,0 +1,20 @@
+class Observable:
+    """
+    Clase base para entidades que avisan a un observador cuando cambia alguno de sus
+    atributos guardados.
+
+    El observador debe ofrecer el método entidad_modificada(entidad, atributo, anterior).
+    Las subclases deben inicializar _observador en None.
+    """
+
+    __slots__ = ("_observador",)
+
+    def _avisar_cambio(self, atributo: str, anterior):
+        """
+        Avisa al observador que un atributo cambió de valor.
+
+        :param atributo: Nombre del atributo modificado.
+        :param anterior: Valor que tenía el atributo antes del cambio.
+        """
+        if self._observador is not None:
+            self._observador.entidad_modificada(self, atributo, anterior)
@@ -1,8 +1,13 @@
-class Persona:
+from modelo.Entidades.Observable import Observable
+
+
+class Persona(Observable):
     """
     Clase base que representa a una persona con un identificador y un nombre.
     """
 
+    __slots__ = ("_id", "_nombre")
+
     def __init__(self, id: str, nombre: str):
         """
         Inicializador de la clase Persona.
@@ -10,8 +15,9 @@ class Persona:
         :param id: Identificador único de la persona.
         :param nombre: Nombre de la persona.
         """
+        self._observador = None
         self._id = id
-        self.nombre = nombre
+        self._nombre = nombre
 
     @property
     def id(self) -> str:
@@ -19,3 +25,19 @@ class Persona:
         Devuelve el identificador único de la persona.
         """
         return self._id
+
+    @property
+    def nombre(self) -> str:
+        """
+        Devuelve el nombre de la persona.
+        """
+        return self._nombre
+
+    @nombre.setter
+    def nombre(self, valor: str):
+        """
+        Cambia el nombre de la persona.
+        """
+        anterior, self._nombre = self._nombre, valor
+        if anterior != valor:
+            self._avisar_cambio("nombre", anterior)
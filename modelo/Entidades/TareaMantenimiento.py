@@ -3,15 +3,40 @@ from typing import Optional
 
 from modelo.Entidades.Equipo import Equipo
 from modelo.Entidades.EstadoTarea import EstadoTarea
+from modelo.Entidades.Observable import Observable
 from modelo.Entidades.Tecnico import Tecnico
 from modelo.Entidades.TipoMantenimiento import TipoMantenimiento
 
+# Palabras que, en las observaciones de una tarea correctiva, indican una falla del equipo
+PALABRAS_CLAVE_FALLA = [
+    "falla", "avería", "daño", "roto", "descompuesto",
+    "mal funcionamiento", "error", "problema"
+]
 
-class TareaMantenimiento:
+
+def describe_falla(observaciones: Optional[str]) -> bool:
+    """
+    Indica si las observaciones de una tarea describen una falla del equipo.
+
+    :param observaciones: Observaciones de la tarea.
+    :return: True si contienen alguna de las PALABRAS_CLAVE_FALLA.
+    """
+    if not observaciones:
+        return False
+    observacion = observaciones.lower()
+    return any(palabra in observacion for palabra in PALABRAS_CLAVE_FALLA)
+
+class TareaMantenimiento(Observable):
     """
         Clase que representa una tarea de mantenimiento asignada a un equipo.
+
+        Las tareas son la población dominante del sistema, por lo que se declaran con
+        __slots__ para no reservar un diccionario por instancia.
     """
 
+    __slots__ = ("id", "_tipo", "_equipo", "_fecha_programada", "_tecnico_asignado",
+                 "_estado", "_observaciones", "_fecha_realizacion", "_duracion_minutos")
+
     def __init__(self, id: str, tipo: TipoMantenimiento, equipo: Equipo,
                  fecha_programada: datetime, tecnico_asignado: Tecnico,
                  estado: EstadoTarea = EstadoTarea.PENDIENTE,
@@ -30,12 +55,141 @@ class TareaMantenimiento:
                 :param fecha_realizacion: Fecha en la que se realizó la tarea (opcional).
                 :param duracion_minutos: Duración de la tarea en minutos (opcional).
         """
+        self._observador = None
         self.id = id
-        self.tipo = tipo
-        self.equipo = equipo
-        self.fecha_programada = fecha_programada
-        self.tecnico_asignado = tecnico_asignado
-        self.estado = EstadoTarea.PENDIENTE
-        self.observaciones = observaciones
-        self.fecha_realizacion = fecha_realizacion
-        self.duracion_minutos = duracion_minutos
+        self._tipo = tipo
+        self._equipo = equipo
+        self._fecha_programada = fecha_programada
+        self._tecnico_asignado = tecnico_asignado
+        self._estado = estado
+        self._observaciones = observaciones
+        self._fecha_realizacion = fecha_realizacion
+        self._duracion_minutos = duracion_minutos
+
+    @property
+    def tipo(self) -> TipoMantenimiento:
+        """
+                Devuelve el tipo de mantenimiento de la tarea.
+        """
+        return self._tipo
+
+    @tipo.setter
+    def tipo(self, valor: TipoMantenimiento):
+        """
+                Cambia el tipo de mantenimiento de la tarea.
+        """
+        anterior, self._tipo = self._tipo, valor
+        if anterior is not valor:
+            self._avisar_cambio("tipo", anterior)
+
+    @property
+    def equipo(self) -> Equipo:
+        """
+                Devuelve el equipo al que pertenece la tarea.
+        """
+        return self._equipo
+
+    @equipo.setter
+    def equipo(self, valor: Equipo):
+        """
+                Cambia el equipo al que pertenece la tarea.
+        """
+        anterior, self._equipo = self._equipo, valor
+        if anterior is not valor:
+            self._avisar_cambio("equipo", anterior)
+
+    @property
+    def fecha_programada(self) -> datetime:
+        """
+                Devuelve la fecha programada de la tarea.
+        """
+        return self._fecha_programada
+
+    @fecha_programada.setter
+    def fecha_programada(self, valor: datetime):
+        """
+                Cambia la fecha programada de la tarea.
+        """
+        anterior, self._fecha_programada = self._fecha_programada, valor
+        if anterior != valor:
+            self._avisar_cambio("fecha_programada", anterior)
+
+    @property
+    def tecnico_asignado(self) -> Tecnico:
+        """
+                Devuelve el técnico asignado a la tarea.
+        """
+        return self._tecnico_asignado
+
+    @tecnico_asignado.setter
+    def tecnico_asignado(self, valor: Tecnico):
+        """
+                Asigna la tarea a otro técnico.
+        """
+        anterior, self._tecnico_asignado = self._tecnico_asignado, valor
+        if anterior is not valor:
+            self._avisar_cambio("tecnico_asignado", anterior)
+
+    @property
+    def estado(self) -> EstadoTarea:
+        """
+                Devuelve el estado actual de la tarea.
+        """
+        return self._estado
+
+    @estado.setter
+    def estado(self, valor: EstadoTarea):
+        """
+                Cambia el estado de la tarea.
+        """
+        anterior, self._estado = self._estado, valor
+        if anterior is not valor:
+            self._avisar_cambio("estado", anterior)
+
+    @property
+    def observaciones(self) -> str:
+        """
+                Devuelve las observaciones de la tarea.
+        """
+        return self._observaciones
+
+    @observaciones.setter
+    def observaciones(self, valor: str):
+        """
+                Cambia las observaciones de la tarea.
+        """
+        anterior, self._observaciones = self._observaciones, valor
+        if anterior != valor:
+            self._avisar_cambio("observaciones", anterior)
+
+    @property
+    def fecha_realizacion(self) -> Optional[datetime]:
+        """
+                Devuelve la fecha en la que se realizó la tarea, o None.
+        """
+        return self._fecha_realizacion
+
+    @fecha_realizacion.setter
+    def fecha_realizacion(self, valor: Optional[datetime]):
+        """
+                Cambia la fecha en la que se realizó la tarea.
+        """
+        anterior, self._fecha_realizacion = self._fecha_realizacion, valor
+        if anterior != valor:
+            self._avisar_cambio("fecha_realizacion", anterior)
+
+    @property
+    def duracion_minutos(self) -> Optional[int]:
+        """
+                Devuelve la duración de la tarea en minutos, o None.
+        """
+        return self._duracion_minutos
+
+    @duracion_minutos.setter
+    def duracion_minutos(self, valor: Optional[int]):
+        """
+                Cambia la duración de la tarea en minutos.
+        """
+        anterior, self._duracion_minutos = self._duracion_minutos, valor
+        if anterior != valor:
+            self._avisar_cambio("duracion_minutos", anterior)
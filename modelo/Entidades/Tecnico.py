@@ -6,6 +6,8 @@ class Tecnico(Persona):
         Clase que representa a un técnico encargado de realizar mantenimientos.
     """
 
+    __slots__ = ("_especialidad", "_activo")
+
     def __init__(self, id: str, nombre: str, especialidad: str, activo: bool = True):
         """
                 Inicializador de la clase Técnico.
@@ -16,5 +18,37 @@ class Tecnico(Persona):
                 :param activo: Indica si el técnico está activo.
         """
         super().__init__(id, nombre)
-        self.especialidad = especialidad
-        self.activo = activo
+        self._especialidad = especialidad
+        self._activo = activo
+
+    @property
+    def especialidad(self) -> str:
+        """
+                Devuelve la especialidad del técnico.
+        """
+        return self._especialidad
+
+    @especialidad.setter
+    def especialidad(self, valor: str):
+        """
+                Cambia la especialidad del técnico.
+        """
+        anterior, self._especialidad = self._especialidad, valor
+        if anterior != valor:
+            self._avisar_cambio("especialidad", anterior)
+
+    @property
+    def activo(self) -> bool:
+        """
+                Indica si el técnico está activo.
+        """
+        return self._activo
+
+    @activo.setter
+    def activo(self, valor: bool):
+        """
+                Activa o desactiva al técnico.
+        """
+        anterior, self._activo = self._activo, valor
+        if anterior != valor:
+            self._avisar_cambio("activo", anterior)
@@ -1,8 +1,13 @@
-class Ubicacion:
+from modelo.Entidades.Observable import Observable
+
+
+class Ubicacion(Observable):
     """
     Clase que representa una ubicación dentro del sistema.
     """
 
+    __slots__ = ("id", "_nombre", "_descripcion")
+
     def __init__(self, id: str, nombre: str, descripcion: str = ""):
         """
             Inicializador de la clase Ubicación.
@@ -11,6 +16,39 @@ class Ubicacion:
             :param nombre: Nombre de la ubicación.
             :param descripcion: Descripción opcional de la ubicación.
         """
+        self._observador = None
         self.id = id
-        self.nombre = nombre
-        self.descripcion = descripcion
+        self._nombre = nombre
+        self._descripcion = descripcion
+
+    @property
+    def nombre(self) -> str:
+        """
+            Devuelve el nombre de la ubicación.
+        """
+        return self._nombre
+
+    @nombre.setter
+    def nombre(self, valor: str):
+        """
+            Cambia el nombre de la ubicación.
+        """
+        anterior, self._nombre = self._nombre, valor
+        if anterior != valor:
+            self._avisar_cambio("nombre", anterior)
+
+    @property
+    def descripcion(self) -> str:
+        """
+            Devuelve la descripción de la ubicación.
+        """
+        return self._descripcion
+
+    @descripcion.setter
+    def descripcion(self, valor: str):
+        """
+            Cambia la descripción de la ubicación.
+        """
+        anterior, self._descripcion = self._descripcion, valor
+        if anterior != valor:
+            self._avisar_cambio("descripcion", anterior)
@@ -1,10 +1,20 @@
-from typing import List
+import threading
+from datetime import datetime
+from typing import AbstractSet, Callable, Dict, List, Optional, ValuesView
 
 from modelo.Entidades.Equipo import Equipo
+from modelo.Entidades.EstadoTarea import EstadoTarea
 from modelo.Entidades.TareaMantenimiento import TareaMantenimiento
 from modelo.Entidades.Tecnico import Tecnico
+from modelo.Entidades.TipoMantenimiento import TipoMantenimiento
 from modelo.Entidades.Ubicacion import Ubicacion
 
+# Firma de los observadores: (operacion, coleccion, entidad)
+# operacion es "alta", "cambio" o "baja"; coleccion es el nombre de la lista afectada.
+# Con historial diferido también es "carga": una tarea guardada que se acaba de leer del
+# disco; no es una modificación, pero pasa a estar en las colecciones.
+Observador = Callable[[str, str, object], None]
+
 
 class SistemaMantenimiento:
     """
@@ -15,39 +25,526 @@ class SistemaMantenimiento:
         """
                 Inicializador de la clase SistemaMantenimiento.
         """
-        self.equipos: List[Equipo] = []
-        self.tecnicos: List[Tecnico] = []
-        self.tareas: List[TareaMantenimiento] = []
-        self.ubicaciones: List[Ubicacion] = []
+        # Índices ID -> entidad; conservan el orden de inserción
+        self._equipos: Dict[str, Equipo] = {}
+        self._tecnicos: Dict[str, Tecnico] = {}
+        self._tareas: Dict[str, TareaMantenimiento] = {}
+        self._ubicaciones: Dict[str, Ubicacion] = {}
+        self._observadores: List[Observador] = []
+        # Protege al sistema cuando se modifica o se lee desde hilos de trabajo.
+        # Es reentrante para que un hilo que ya lo tiene pueda seguir modificando.
+        self.bloqueo = threading.RLock()
+
+        # Índices secundarios de tareas: clave -> {ID de tarea: tarea}
+        self._tareas_por_equipo: Dict[str, Dict[str, TareaMantenimiento]] = {}
+        self._tareas_por_tecnico: Dict[str, Dict[str, TareaMantenimiento]] = {}
+        self._tareas_por_estado: Dict[EstadoTarea, Dict[str, TareaMantenimiento]] = {}
+        self._tareas_por_tipo: Dict[TipoMantenimiento, Dict[str, TareaMantenimiento]] = {}
+
+        # Historial de tareas aún en disco (ver diferir_historial)
+        self._historial = None
+
+    def __getstate__(self) -> dict:
+        """
+        Devuelve el estado para pickle, con los índices pero sin el bloqueo, los
+        observadores ni el historial diferido, que pertenecen a la sesión en curso.
+        """
+        estado = self.__dict__.copy()
+        del estado["bloqueo"]
+        del estado["_observadores"]
+        estado["_historial"] = None
+        return estado
+
+    def __setstate__(self, estado: dict):
+        """
+        Restaura el estado de pickle con un bloqueo nuevo y sin observadores.
+
+        :param estado: Estado devuelto por __getstate__.
+        """
+        self.__dict__.update(estado)
+        self._historial = None
+        self._observadores = []
+        self.bloqueo = threading.RLock()
+
+    @property
+    def equipos(self) -> ValuesView[Equipo]:
+        """
+        Devuelve una vista iterable de los equipos en orden de registro.
+        """
+        return self._equipos.values()
+
+    @property
+    def tecnicos(self) -> ValuesView[Tecnico]:
+        """
+        Devuelve una vista iterable de los técnicos en orden de registro.
+        """
+        return self._tecnicos.values()
+
+    @property
+    def tareas(self) -> ValuesView[TareaMantenimiento]:
+        """
+        Devuelve una vista iterable de las tareas en orden de registro.
+        """
+        return self._tareas.values()
+
+    @property
+    def ubicaciones(self) -> ValuesView[Ubicacion]:
+        """
+        Devuelve una vista iterable de las ubicaciones en orden de registro.
+        """
+        return self._ubicaciones.values()
+
+    def suscribir(self, observador: Observador):
+        """
+        Registra un observador que será notificado de cada alta, cambio o baja.
+
+        :param observador: Función que recibe (operacion, coleccion, entidad).
+        """
+        self._observadores.append(observador)
+
+    def desuscribir(self, observador: Observador):
+        """
+        Elimina un observador previamente registrado.
+
+        :param observador: Observador a eliminar.
+        """
+        if observador in self._observadores:
+            self._observadores.remove(observador)
+
+    def _notificar(self, operacion: str, coleccion: str, entidad):
+        """
+        Notifica a los observadores una modificación del sistema.
+
+        :param operacion: "alta", "cambio" o "baja".
+        :param coleccion: Nombre de la colección afectada.
+        :param entidad: Entidad afectada.
+        """
+        for observador in self._observadores:
+            observador(operacion, coleccion, entidad)
 
     def agregar_equipo(self, equipo: Equipo):
         """
         Agrega un equipo al sistema.
 
         :param equipo: Instancia de la clase Equipo.
+        :raises ValueError: Si ya existe un equipo con el mismo ID.
         """
-        self.equipos.append(equipo)
+        with self.bloqueo:
+            self._indexar(self._equipos, equipo, "equipo")
+            equipo._observador = self
+            self._notificar("alta", "equipos", equipo)
 
     def agregar_tecnico(self, tecnico: Tecnico):
         """
         Agrega un técnico al sistema.
 
         :param tecnico: Instancia de la clase Tecnico.
+        :raises ValueError: Si ya existe un técnico con el mismo ID.
         """
-        self.tecnicos.append(tecnico)
+        with self.bloqueo:
+            self._indexar(self._tecnicos, tecnico, "técnico")
+            tecnico._observador = self
+            self._notificar("alta", "tecnicos", tecnico)
 
     def agregar_tarea(self, tarea: TareaMantenimiento):
         """
         Agrega una tarea de mantenimiento al sistema.
 
         :param tarea: Instancia de la clase TareaMantenimiento.
+        :raises ValueError: Si ya existe una tarea con el mismo ID.
+        """
+        with self.bloqueo:
+            self._indexar(self._tareas, tarea, "tarea")
+            self._indexar_tarea(tarea)
+            tarea._observador = self
+            self._notificar("alta", "tareas", tarea)
+
+    def agregar_tareas(self, tareas: List[TareaMantenimiento]):
         """
-        self.tareas.append(tarea)
+        Agrega varias tareas de mantenimiento al sistema en una sola operación.
+
+        Los IDs se validan antes de registrar ninguna: si alguno falla no se agrega
+        ninguna tarea. Las tareas se registran con el bloqueo tomado durante todo el lote,
+        por lo que un guardado en segundo plano las escribe juntas.
+
+        :param tareas: Lista de instancias de TareaMantenimiento.
+        :raises ValueError: Si algún ID ya existe o se repite en el lote.
+        """
+        with self.bloqueo:
+            ids = set()
+            for tarea in tareas:
+                if tarea.id in self._tareas or tarea.id in ids:
+                    raise ValueError(f"Ya existe un(a) tarea con ID {tarea.id}")
+                ids.add(tarea.id)
+            for tarea in tareas:
+                self._tareas[tarea.id] = tarea
+                self._indexar_tarea(tarea)
+                tarea._observador = self
+                self._notificar("alta", "tareas", tarea)
 
     def agregar_ubicacion(self, ubicacion: Ubicacion):
         """
         Agrega una ubicación al sistema.
 
         :param ubicacion: Instancia de la clase Ubicacion.
+        :raises ValueError: Si ya existe una ubicación con el mismo ID.
+        """
+        with self.bloqueo:
+            self._indexar(self._ubicaciones, ubicacion, "ubicación")
+            ubicacion._observador = self
+            self._notificar("alta", "ubicaciones", ubicacion)
+
+    def eliminar_equipo(self, equipo_id: str) -> Optional[Equipo]:
+        """
+        Elimina un equipo del sistema.
+
+        :param equipo_id: Identificador del equipo.
+        :return: El equipo eliminado, o None si no existe.
+        """
+        with self.bloqueo:
+            equipo = self._equipos.get(equipo_id)
+            if equipo is not None:
+                equipo._observador = None
+            return self._eliminar("equipos", self._equipos, equipo_id)
+
+    def eliminar_tecnico(self, tecnico_id: str) -> Optional[Tecnico]:
+        """
+        Elimina un técnico del sistema.
+
+        :param tecnico_id: Identificador del técnico.
+        :return: El técnico eliminado, o None si no existe.
+        """
+        with self.bloqueo:
+            tecnico = self._tecnicos.get(tecnico_id)
+            if tecnico is not None:
+                tecnico._observador = None
+            return self._eliminar("tecnicos", self._tecnicos, tecnico_id)
+
+    def eliminar_tarea(self, tarea_id: str) -> Optional[TareaMantenimiento]:
+        """
+        Elimina una tarea de mantenimiento del sistema.
+
+        :param tarea_id: Identificador de la tarea.
+        :return: La tarea eliminada, o None si no existe.
+        """
+        with self.bloqueo:
+            tarea = self._tareas.get(tarea_id)
+            if tarea is not None:
+                self._desindexar_tarea(tarea)
+                tarea._observador = None
+            return self._eliminar("tareas", self._tareas, tarea_id)
+
+    def eliminar_ubicacion(self, ubicacion_id: str) -> Optional[Ubicacion]:
+        """
+        Elimina una ubicación del sistema.
+
+        :param ubicacion_id: Identificador de la ubicación.
+        :return: La ubicación eliminada, o None si no existe.
+        """
+        with self.bloqueo:
+            ubicacion = self._ubicaciones.get(ubicacion_id)
+            if ubicacion is not None:
+                ubicacion._observador = None
+            return self._eliminar("ubicaciones", self._ubicaciones, ubicacion_id)
+
+    def obtener_equipo(self, equipo_id: str) -> Optional[Equipo]:
+        """
+        Busca un equipo por su identificador.
+
+        :param equipo_id: Identificador del equipo.
+        :return: El equipo, o None si no existe.
+        """
+        return self._equipos.get(equipo_id)
+
+    def obtener_tecnico(self, tecnico_id: str) -> Optional[Tecnico]:
+        """
+        Busca un técnico por su identificador.
+
+        :param tecnico_id: Identificador del técnico.
+        :return: El técnico, o None si no existe.
+        """
+        return self._tecnicos.get(tecnico_id)
+
+    def obtener_tarea(self, tarea_id: str) -> Optional[TareaMantenimiento]:
+        """
+        Busca una tarea de mantenimiento por su identificador.
+
+        :param tarea_id: Identificador de la tarea.
+        :return: La tarea, o None si no existe.
+        """
+        return self._tareas.get(tarea_id)
+
+    def obtener_ubicacion(self, ubicacion_id: str) -> Optional[Ubicacion]:
+        """
+        Busca una ubicación por su identificador.
+
+        :param ubicacion_id: Identificador de la ubicación.
+        :return: La ubicación, o None si no existe.
+        """
+        return self._ubicaciones.get(ubicacion_id)
+
+    def _indexar(self, indice: dict, entidad, descripcion: str):
+        """
+        Registra una entidad en su índice por ID.
+
+        :param indice: Diccionario ID -> entidad de la colección.
+        :param entidad: Entidad a registrar.
+        :param descripcion: Nombre de la entidad para el mensaje de error.
+        :raises ValueError: Si el ID ya está registrado.
+        """
+        if entidad.id in indice:
+            raise ValueError(f"Ya existe un(a) {descripcion} con ID {entidad.id}")
+        indice[entidad.id] = entidad
+
+    def _eliminar(self, coleccion: str, indice: dict, entidad_id: str):
+        """
+        Elimina de una colección la entidad con el identificador indicado.
+
+        :param coleccion: Nombre de la colección.
+        :param indice: Diccionario ID -> entidad de la colección.
+        :param entidad_id: Identificador de la entidad.
+        :return: La entidad eliminada, o None si no existe.
+        """
+        entidad = indice.pop(entidad_id, None)
+        if entidad is not None:
+            self._notificar("baja", coleccion, entidad)
+        return entidad
+
+    def notificar_cambio(self, entidad):
+        """
+        Notifica que una entidad ya registrada fue modificada directamente.
+
+        :param entidad: Equipo, técnico, tarea o ubicación modificada.
+        """
+        if isinstance(entidad, Equipo):
+            coleccion = "equipos"
+        elif isinstance(entidad, Tecnico):
+            coleccion = "tecnicos"
+        elif isinstance(entidad, TareaMantenimiento):
+            coleccion = "tareas"
+        else:
+            coleccion = "ubicaciones"
+        self._notificar("cambio", coleccion, entidad)
+
+    def entidad_modificada(self, entidad, atributo: str, anterior):
+        """
+        Recibe el aviso de una entidad registrada cuyo atributo cambió, actualiza los
+        índices secundarios si el atributo está indexado y notifica el cambio a los
+        observadores.
+
+        :param entidad: Entidad modificada.
+        :param atributo: Nombre del atributo modificado.
+        :param anterior: Valor anterior del atributo.
+        """
+        with self.bloqueo:
+            if isinstance(entidad, TareaMantenimiento):
+                if atributo == "equipo":
+                    self._reindexar(self._tareas_por_equipo, anterior.id, entidad.equipo.id, entidad)
+                elif atributo == "tecnico_asignado":
+                    self._reindexar(self._tareas_por_tecnico, anterior.id, entidad.tecnico_asignado.id, entidad)
+                elif atributo == "estado":
+                    self._reindexar(self._tareas_por_estado, anterior, entidad.estado, entidad)
+                elif atributo == "tipo":
+                    self._reindexar(self._tareas_por_tipo, anterior, entidad.tipo, entidad)
+            self.notificar_cambio(entidad)
+
+    def diferir_historial(self, historial):
+        """
+        Registra el historial de tareas que aún no se leyó del disco.
+
+        Las tareas diferidas no aparecen en la propiedad tareas hasta que se cargan. Las
+        consultas tareas_por_* las cargan cuando pueden incluirlas en su resultado.
+
+        :param historial: Objeto con los métodos pendientes() (IDs de equipos con tareas
+            sin cargar), tecnicos() (IDs de los técnicos con tareas sin cargar),
+            ultimas_preventivas(), resumen() (conteos de las tareas sin cargar, con los
+            argumentos de control.historial.ResumenHistorial), leer(equipo_id, equipos,
+            tecnicos) y leer_tecnico(tecnico_id, equipos, tecnicos), que devuelven las
+            tareas del equipo o del técnico y las quitan de las pendientes.
+        """
+        self._historial = historial
+
+    @property
+    def historial_diferido(self):
+        """
+        Devuelve el historial registrado con diferir_historial, o None.
+        """
+        return self._historial
+
+    def historial_pendiente(self) -> AbstractSet[str]:
+        """
+        Devuelve los IDs de los equipos cuyo historial de tareas aún no se cargó.
+        """
+        return self._historial.pendientes() if self._historial is not None else frozenset()
+
+    def ultimas_preventivas_pendientes(self) -> Dict[str, datetime]:
+        """
+        Devuelve, por ID de equipo, la fecha de la última tarea preventiva del historial
+        que aún no se cargó.
+        """
+        return self._historial.ultimas_preventivas() if self._historial is not None else {}
+
+    def resumen_historial_pendiente(self) -> Optional[dict]:
+        """
+        Devuelve los conteos de las tareas del historial que aún no se cargó, sin cargarlas.
+
+        :return: Diccionario con los argumentos de ResumenHistorial, o None si no hay
+            historial diferido.
+        """
+        return self._historial.resumen() if self._historial is not None else None
+
+    def cargar_historial(self, equipo_id: Optional[str] = None):
+        """
+        Carga en el sistema las tareas diferidas de un equipo, o de todos.
+
+        Las tareas se notifican con la operación "carga".
+
+        :param equipo_id: Identificador del equipo. Por defecto, todos los equipos.
+        """
+        if self._historial is None:
+            return
+        with self.bloqueo:
+            pendientes = self._historial.pendientes()
+            equipos = [equipo_id] if equipo_id is not None else list(pendientes)
+            for equipo_id in equipos:
+                if equipo_id not in pendientes:
+                    continue
+                self._incorporar_historial(self._historial.leer(equipo_id, self._equipos, self._tecnicos))
+
+    def cargar_historial_tecnico(self, tecnico_id: str):
+        """
+        Carga en el sistema las tareas diferidas de un técnico, sin leer las del resto.
+
+        Las tareas se notifican con la operación "carga".
+
+        :param tecnico_id: Identificador del técnico.
+        """
+        if self._historial is None:
+            return
+        with self.bloqueo:
+            if tecnico_id in self._historial.tecnicos():
+                self._incorporar_historial(
+                    self._historial.leer_tecnico(tecnico_id, self._equipos, self._tecnicos))
+
+    def _incorporar_historial(self, tareas: List[TareaMantenimiento]):
+        """
+        Indexa las tareas recién leídas del historial diferido y las notifica.
+
+        :param tareas: Tareas leídas.
+        """
+        for tarea in tareas:
+            self._indexar(self._tareas, tarea, "tarea")
+            self._indexar_tarea(tarea)
+            tarea._observador = self
+            self._notificar("carga", "tareas", tarea)
+
+    def tareas_por_equipo(self, equipo_id: str) -> List[TareaMantenimiento]:
+        """
+        Devuelve las tareas asociadas a un equipo, cargando antes su historial si hace falta.
+
+        :param equipo_id: Identificador del equipo.
+        :return: Lista de tareas del equipo.
+        """
+        self.cargar_historial(equipo_id)
+        return list(self._tareas_por_equipo.get(equipo_id, {}).values())
+
+    def tareas_por_tecnico(self, tecnico_id: str) -> List[TareaMantenimiento]:
+        """
+        Devuelve las tareas asignadas a un técnico, cargando antes su historial si hace falta.
+
+        :param tecnico_id: Identificador del técnico.
+        :return: Lista de tareas del técnico.
+        """
+        self.cargar_historial_tecnico(tecnico_id)
+        return list(self._tareas_por_tecnico.get(tecnico_id, {}).values())
+
+    def tareas_por_estado(self, estado: EstadoTarea) -> List[TareaMantenimiento]:
+        """
+        Devuelve las tareas que se encuentran en un estado, cargando antes el historial
+        diferido si se piden tareas completadas o canceladas.
+
+        :param estado: Estado buscado.
+        :return: Lista de tareas en ese estado.
+        """
+        if estado in (EstadoTarea.COMPLETADA, EstadoTarea.CANCELADA):
+            self.cargar_historial()
+        return list(self._tareas_por_estado.get(estado, {}).values())
+
+    def tareas_por_tipo(self, tipo: TipoMantenimiento, cargar: bool = True) -> List[TareaMantenimiento]:
+        """
+        Devuelve las tareas de un tipo de mantenimiento.
+
+        :param tipo: Tipo de mantenimiento buscado.
+        :param cargar: Indica si antes se carga el historial diferido. Con False solo se
+            devuelven las tareas ya cargadas.
+        :return: Lista de tareas de ese tipo.
+        """
+        if cargar:
+            self.cargar_historial()
+        return list(self._tareas_por_tipo.get(tipo, {}).values())
+
+    def equipo_tiene_tareas(self, equipo_id: str) -> bool:
+        """
+        Indica si un equipo tiene tareas asociadas, sin cargar su historial.
+
+        :param equipo_id: Identificador del equipo.
+        """
+        return bool(self._tareas_por_equipo.get(equipo_id)) or equipo_id in self.historial_pendiente()
+
+    def tecnico_tiene_tareas(self, tecnico_id: str) -> bool:
+        """
+        Indica si un técnico tiene tareas asignadas, sin cargar el historial diferido.
+
+        :param tecnico_id: Identificador del técnico.
+        """
+        if self._historial is not None and tecnico_id in self._historial.tecnicos():
+            return True
+        return bool(self._tareas_por_tecnico.get(tecnico_id))
+
+    def _indexar_tarea(self, tarea: TareaMantenimiento):
+        """
+        Registra una tarea en los índices secundarios.
+
+        :param tarea: Tarea a registrar.
+        """
+        self._tareas_por_equipo.setdefault(tarea.equipo.id, {})[tarea.id] = tarea
+        self._tareas_por_tecnico.setdefault(tarea.tecnico_asignado.id, {})[tarea.id] = tarea
+        self._tareas_por_estado.setdefault(tarea.estado, {})[tarea.id] = tarea
+        self._tareas_por_tipo.setdefault(tarea.tipo, {})[tarea.id] = tarea
+
+    def _desindexar_tarea(self, tarea: TareaMantenimiento):
+        """
+        Quita una tarea de los índices secundarios.
+
+        :param tarea: Tarea a quitar.
+        """
+        self._quitar_de_indice(self._tareas_por_equipo, tarea.equipo.id, tarea)
+        self._quitar_de_indice(self._tareas_por_tecnico, tarea.tecnico_asignado.id, tarea)
+        self._quitar_de_indice(self._tareas_por_estado, tarea.estado, tarea)
+        self._quitar_de_indice(self._tareas_por_tipo, tarea.tipo, tarea)
+
+    def _reindexar(self, indice: dict, clave_anterior, clave_nueva, tarea: TareaMantenimiento):
+        """
+        Mueve una tarea de una clave a otra dentro de un índice secundario.
+
+        :param indice: Índice secundario.
+        :param clave_anterior: Clave bajo la que estaba la tarea.
+        :param clave_nueva: Clave bajo la que debe quedar la tarea.
+        :param tarea: Tarea a mover.
+        """
+        self._quitar_de_indice(indice, clave_anterior, tarea)
+        indice.setdefault(clave_nueva, {})[tarea.id] = tarea
+
+    def _quitar_de_indice(self, indice: dict, clave, tarea: TareaMantenimiento):
+        """
+        Quita una tarea de una clave de un índice secundario, descartando la clave si queda vacía.
+
+        :param indice: Índice secundario.
+        :param clave: Clave bajo la que está la tarea.
+        :param tarea: Tarea a quitar.
         """
-        self.ubicaciones.append(ubicacion)
+        grupo = indice.get(clave)
+        if grupo is not None:
+            grupo.pop(tarea.id, None)
+            if not grupo:
+                del indice[clave]
@@ -0,0 +1,95 @@
+import bz2
+import gzip
+import hashlib
+import lzma
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+# Códecs disponibles: nombre -> (extensión del archivo, función que envuelve un archivo
+# binario abierto en otro que comprime al escribir y descomprime al leer)
+CODECS = {
+    "gzip": (".gz", lambda f, modo: gzip.GzipFile(fileobj=f, mode=modo, compresslevel=6)),
+    "bz2": (".bz2", lambda f, modo: bz2.BZ2File(f, modo)),
+    "lzma": (".xz", lambda f, modo: lzma.LZMAFile(f, modo)),
+}
+
+
+def validar_codec(compresion: Optional[str]):
+    """
+    Verifica que el códec indicado exista.
+
+    :param compresion: Nombre del códec, o None para no comprimir.
+    :raises ValueError: Si el códec no es uno de CODECS.
+    """
+    if compresion is not None and compresion not in CODECS:
+        raise ValueError(f"Códec de compresión desconocido: {compresion}. "
+                         f"Opciones: {', '.join(CODECS)}")
+
+
+def ruta_comprimida(ruta: Path, compresion: Optional[str]) -> Path:
+    """
+    Devuelve la ruta del archivo comprimido con el códec indicado.
+
+    :param ruta: Ruta del archivo sin comprimir.
+    :param compresion: Nombre del códec, o None para no comprimir.
+    :return: La misma ruta con la extensión del códec agregada, si no la tenía.
+    """
+    if compresion is None:
+        return ruta
+    extension = CODECS[compresion][0]
+    return ruta if ruta.name.endswith(extension) else ruta.with_name(ruta.name + extension)
+
+
+def envolver(f: BinaryIO, modo: str, compresion: Optional[str]) -> BinaryIO:
+    """
+    Envuelve un archivo binario abierto para comprimir o descomprimir al vuelo.
+
+    :param f: Archivo binario abierto.
+    :param modo: "rb" o "wb".
+    :param compresion: Nombre del códec, o None para usar el archivo tal cual.
+    :return: Archivo binario que comprime o descomprime. Al cerrarlo no se cierra f.
+    """
+    if compresion is None:
+        return f
+    return CODECS[compresion][1](f, modo)
+
+
+class EscrituraConResumen:
+    """
+    Archivo de solo escritura que calcula el hash BLAKE2b de los bytes que pasan por él.
+
+    Se coloca entre el compresor y el archivo en disco para obtener el hash del contenido
+    comprimido sin volver a leerlo.
+    """
+
+    def __init__(self, f: BinaryIO):
+        """
+        Inicializador de la clase EscrituraConResumen.
+
+        :param f: Archivo binario donde se escriben los bytes.
+        """
+        self._f = f
+        self.resumen = hashlib.blake2b()
+
+    def write(self, datos) -> int:
+        """
+        Escribe los bytes en el archivo y los agrega al hash.
+
+        :param datos: Bytes a escribir.
+        :return: Cantidad de bytes escritos.
+        """
+        self.resumen.update(datos)
+        return self._f.write(datos)
+
+    def flush(self):
+        """
+        Vacía el búfer del archivo subyacente.
+        """
+        self._f.flush()
+
+    def __enter__(self) -> "EscrituraConResumen":
+        return self
+
+    def __exit__(self, *excepcion):
+        # El archivo subyacente pertenece a quien lo abrió
+        pass
@@ -0,0 +1,162 @@
+import threading
+import time
+from typing import Callable, Optional
+
+from modelo.SistemaMantenimiento import SistemaMantenimiento
+
+# Modos de durabilidad
+INMEDIATO = "inmediato"  # Se guarda en cuanto termina cada modificación
+LOTES = "lotes"          # Las modificaciones se agrupan y se guardan cada cierto intervalo
+AL_SALIR = "salida"      # Solo se guarda al cerrar
+MODOS = (INMEDIATO, LOTES, AL_SALIR)
+
+
+class GuardadoDiferido:
+    """
+    Clase que guarda el sistema de mantenimiento en segundo plano cuando cambia.
+
+    Se suscribe a las notificaciones del sistema y solo lo marca como modificado; un hilo
+    propio agrupa las ráfagas de modificaciones en una única escritura de la persistencia,
+    que se hace con el bloqueo del sistema tomado.
+    """
+
+    def __init__(self, persistencia, modo: str = LOTES, intervalo_ms: int = 500,
+                 al_error: Optional[Callable[[Exception], None]] = None):
+        """
+        Inicializador de la clase GuardadoDiferido.
+
+        :param persistencia: Objeto con el método guardar(sistema).
+        :param modo: Modo de durabilidad: INMEDIATO, LOTES o AL_SALIR.
+        :param intervalo_ms: En modo LOTES, tiempo máximo en milisegundos entre la primera
+            modificación sin guardar y su escritura.
+        :param al_error: Función que recibe los errores del guardado en segundo plano.
+            Se llama desde el hilo de guardado.
+        :raises ValueError: Si el modo no es válido.
+        """
+        if modo not in MODOS:
+            raise ValueError(f"Modo de guardado inválido: {modo}")
+        self.persistencia = persistencia
+        self.modo = modo
+        self.intervalo = intervalo_ms / 1000 if modo == LOTES else 0.0
+        self.al_error = al_error
+        self.guardados = 0
+        self.ultimo_error: Optional[Exception] = None
+
+        self._condicion = threading.Condition()
+        self._sistema: Optional[SistemaMantenimiento] = None
+        self._sucio = False
+        self._sucio_desde = 0.0
+        self._activo = True
+        self._hilo: Optional[threading.Thread] = None
+
+    @property
+    def sucio(self) -> bool:
+        """
+        Indica si hay modificaciones sin guardar.
+        """
+        return self._sucio
+
+    def vincular(self, sistema: SistemaMantenimiento):
+        """
+        Empieza a vigilar las modificaciones de un sistema, dejando de vigilar el anterior.
+
+        :param sistema: Sistema a guardar.
+        """
+        with self._condicion:
+            if self._sistema is sistema:
+                return
+            if self._sistema is not None:
+                self._sistema.desuscribir(self._marcar)
+            self._sistema = sistema
+            self._sucio = False
+        sistema.suscribir(self._marcar)
+
+        if self.modo != AL_SALIR and self._hilo is None:
+            self._hilo = threading.Thread(target=self._ejecutar, name="guardado-diferido", daemon=True)
+            self._hilo.start()
+
+    def guardar_ahora(self) -> bool:
+        """
+        Guarda de inmediato las modificaciones pendientes, en el hilo que llama.
+
+        :return: True si había modificaciones y se guardaron.
+        """
+        with self._condicion:
+            if not self._sucio or self._sistema is None:
+                return False
+            sistema = self._sistema
+            # Lo que se modifique a partir de aquí vuelve a marcar el sistema
+            self._sucio = False
+
+        try:
+            with sistema.bloqueo:
+                self.persistencia.guardar(sistema)
+        except Exception:
+            with self._condicion:
+                if not self._sucio:
+                    self._sucio = True
+                    self._sucio_desde = time.monotonic()
+            raise
+        self.guardados += 1
+        return True
+
+    def cerrar(self, guardar: bool = True):
+        """
+        Detiene el hilo de guardado y, opcionalmente, guarda lo pendiente.
+
+        :param guardar: Indica si se guardan las modificaciones pendientes.
+        """
+        with self._condicion:
+            self._activo = False
+            self._condicion.notify()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+        if guardar:
+            self.guardar_ahora()
+        if self._sistema is not None:
+            self._sistema.desuscribir(self._marcar)
+
+    def _marcar(self, operacion: str, coleccion: str, entidad):
+        """
+        Marca el sistema como modificado y despierta al hilo de guardado.
+
+        Las tareas leídas del historial diferido (operación "carga") no modifican el sistema.
+
+        :param operacion: "alta", "cambio", "baja" o "carga".
+        :param coleccion: Colección afectada.
+        :param entidad: Entidad afectada.
+        """
+        if operacion == "carga":
+            return
+        with self._condicion:
+            if not self._sucio:
+                self._sucio = True
+                self._sucio_desde = time.monotonic()
+                self._condicion.notify()
+
+    def _ejecutar(self):
+        """
+        Bucle del hilo de guardado: espera a que haya modificaciones, deja pasar el
+        intervalo del modo y guarda todo lo acumulado en una sola escritura.
+        """
+        while True:
+            with self._condicion:
+                while self._activo and not self._sucio:
+                    self._condicion.wait()
+                if not self._activo:
+                    return
+                espera = self._sucio_desde + self.intervalo - time.monotonic()
+                if espera > 0:
+                    self._condicion.wait(espera)
+                    continue
+
+            try:
+                self.guardar_ahora()
+            except Exception as e:
+                self.ultimo_error = e
+                if self.al_error is not None:
+                    self.al_error(e)
+                # Evitar reintentos continuos mientras el error persista
+                with self._condicion:
+                    self._condicion.wait(max(self.intervalo, 1.0))
@@ -0,0 +1,158 @@
+import base64
+import os
+import threading
+import time
+from datetime import datetime
+from typing import List
+
+# Alfabeto Base32 de Crockford: ordenado, de modo que el orden de los textos coincide
+# con el de los números que representan
+ALFABETO = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_DE_BASE32 = bytes.maketrans(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ234567", ALFABETO.encode())
+
+# Bits de la parte aleatoria; los 48 bits superiores son los milisegundos desde 1970
+BITS_ALEATORIOS = 80
+LARGO = 26
+
+
+def _codificar(valor: int) -> str:
+    """
+    Codifica un entero de 128 bits en 26 caracteres del alfabeto de Crockford.
+
+    :param valor: Entero a codificar.
+    :return: Texto de 26 caracteres.
+    """
+    # 20 bytes son 32 caracteres Base32 sin relleno; los 6 primeros siempre son cero
+    texto = base64.b32encode(valor.to_bytes(20, "big"))[32 - LARGO:]
+    return texto.translate(_DE_BASE32).decode()
+
+
+class GeneradorIds:
+    """
+    Generador de identificadores únicos ordenables por fecha de creación, al estilo ULID.
+
+    Cada ID tiene 26 caracteres: 48 bits con los milisegundos de creación seguidos de
+    80 bits aleatorios. Dentro de un mismo milisegundo la parte aleatoria se incrementa,
+    de modo que los IDs de un proceso son estrictamente crecientes; entre procesos, la
+    parte aleatoria hace despreciable la probabilidad de repetir uno.
+    """
+
+    def __init__(self):
+        """
+        Inicializador de la clase GeneradorIds.
+        """
+        self._bloqueo = threading.Lock()
+        self._ultimo_ms = 0
+        self._ultimo_aleatorio = 0
+
+    def _reservar(self, cantidad: int) -> int:
+        """
+        Reserva una serie de valores consecutivos.
+
+        :param cantidad: Cantidad de valores a reservar.
+        :return: Primer valor de la serie.
+        """
+        with self._bloqueo:
+            ms = max(time.time_ns() // 1_000_000, self._ultimo_ms)
+            if ms == self._ultimo_ms:
+                aleatorio = self._ultimo_aleatorio + 1
+            else:
+                # La mitad superior libre deja lugar para incrementar sin desbordar
+                aleatorio = int.from_bytes(os.urandom(BITS_ALEATORIOS // 8), "big") >> 1
+            if aleatorio + cantidad > 1 << BITS_ALEATORIOS:
+                ms += 1
+                aleatorio = int.from_bytes(os.urandom(BITS_ALEATORIOS // 8), "big") >> 1
+            self._ultimo_ms = ms
+            self._ultimo_aleatorio = aleatorio + cantidad - 1
+        return (ms << BITS_ALEATORIOS) | aleatorio
+
+    def nuevo(self, prefijo: str = "") -> str:
+        """
+        Genera un ID nuevo.
+
+        :param prefijo: Prefijo del ID, por ejemplo "TAR". Se separa con un guion.
+        :return: ID generado.
+        """
+        texto = _codificar(self._reservar(1))
+        return f"{prefijo}-{texto}" if prefijo else texto
+
+    def lote(self, cantidad: int, prefijo: str = "") -> List[str]:
+        """
+        Genera varios IDs consecutivos con una sola reserva.
+
+        :param cantidad: Cantidad de IDs.
+        :param prefijo: Prefijo de los IDs, como en nuevo().
+        :return: Lista de IDs en orden creciente.
+        """
+        if cantidad <= 0:
+            return []
+        inicio = self._reservar(cantidad)
+        cabeza = f"{prefijo}-" if prefijo else ""
+        return [cabeza + _codificar(valor) for valor in range(inicio, inicio + cantidad)]
+
+    def _reiniciar(self):
+        """
+        Prepara el generador en el proceso hijo después de un fork: un bloqueo nuevo, por
+        si el padre lo tenía tomado, y una parte aleatoria nueva, para no continuar la
+        misma serie que el padre.
+        """
+        self._bloqueo = threading.Lock()
+        self._ultimo_ms = 0
+        self._ultimo_aleatorio = 0
+
+
+def fecha_de_id(id: str) -> datetime:
+    """
+    Devuelve la fecha de creación codificada en un ID generado por GeneradorIds.
+
+    :param id: ID, con o sin prefijo.
+    :return: Fecha de creación con precisión de milisegundos.
+    :raises ValueError: Si el ID no tiene el formato esperado.
+    """
+    texto = id[-LARGO:]
+    if len(texto) != LARGO or any(c not in ALFABETO for c in texto):
+        raise ValueError(f"ID con formato inválido: {id}")
+    ms = 0
+    for caracter in texto[:10]:
+        ms = ms * 32 + ALFABETO.index(caracter)
+    return datetime.fromtimestamp(ms / 1000)
+
+
+def id_minimo(fecha: datetime, prefijo: str = "") -> str:
+    """
+    Devuelve el menor ID posible creado en una fecha, para recorrer rangos de IDs por
+    fecha de creación: los IDs creados desde esa fecha son mayores o iguales.
+
+    :param fecha: Fecha de creación.
+    :param prefijo: Prefijo de los IDs, como en GeneradorIds.nuevo().
+    :return: ID límite.
+    """
+    texto = _codificar(int(fecha.timestamp() * 1000) << BITS_ALEATORIOS)
+    return f"{prefijo}-{texto}" if prefijo else texto
+
+
+# Generador compartido por toda la aplicación
+generador_ids = GeneradorIds()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=generador_ids._reiniciar)
+
+
+def nuevo_id(prefijo: str = "") -> str:
+    """
+    Genera un ID nuevo con el generador compartido.
+
+    :param prefijo: Prefijo del ID.
+    :return: ID generado.
+    """
+    return generador_ids.nuevo(prefijo)
+
+
+def nuevos_ids(cantidad: int, prefijo: str = "") -> List[str]:
+    """
+    Genera varios IDs consecutivos con el generador compartido.
+
+    :param cantidad: Cantidad de IDs.
+    :param prefijo: Prefijo de los IDs.
+    :return: Lista de IDs en orden creciente.
+    """
+    return generador_ids.lote(cantidad, prefijo)
@@ -1,6 +1,15 @@
+import gc
+import hashlib
+import io
 import json
+import lzma
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from collections import Counter
+from typing import AbstractSet, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 from modelo.Entidades.Equipo import Equipo
 from modelo.Entidades.EstadoTarea import EstadoTarea
@@ -9,21 +18,493 @@ from modelo.Entidades.Tecnico import Tecnico
 from modelo.Entidades.TipoMantenimiento import TipoMantenimiento
 from modelo.Entidades.Ubicacion import Ubicacion
 from modelo.SistemaMantenimiento import SistemaMantenimiento
+from modelo.compresion import EscrituraConResumen, envolver, ruta_comprimida, validar_codec
+
+# Se incrementa cuando cambia el formato de la caché o de las entidades guardadas en ella
+VERSION_CACHE = 3
+
+# Cantidad de tareas que decodifica cada proceso en la carga en paralelo
+TAMANO_BLOQUE_TAREAS = 20000
+
+# Orden en que una colección puede referenciar a las anteriores: las altas y cambios
+# se escriben en este orden y las bajas en el inverso
+ORDEN_COLECCIONES = ("ubicaciones", "equipos", "tecnicos", "tareas")
+
+# Estados de las tareas que, con carga diferida, quedan en disco hasta que se consultan
+ESTADOS_DIFERIDOS = (EstadoTarea.COMPLETADA, EstadoTarea.CANCELADA)
+NOMBRES_DIFERIDOS = frozenset(estado.name for estado in ESTADOS_DIFERIDOS)
+
+# Clave con la que se agrupa el historial diferido: (ID de equipo, ID de técnico)
+ClaveHistorial = Tuple[str, str]
+
+
+def _decodificar_tareas(bloque: List[dict]) -> Tuple[List[tuple], List[str]]:
+    """
+    Decodifica un bloque de tareas serializadas en un proceso del grupo de carga.
+
+    Convierte enums y fechas, pero deja el equipo y el técnico como IDs: el proceso
+    principal los enlaza con los objetos ya cargados.
+
+    :param bloque: Diccionarios de tareas en el formato de PersistenciaJSON.
+    :return: Tupla con las tareas decodificadas, en el orden de los argumentos de
+        TareaMantenimiento, y los mensajes de error de las tareas descartadas.
+    """
+    tareas, errores = [], []
+    for datos in bloque:
+        try:
+            fecha_realizacion = datos['fecha_realizacion']
+            tareas.append((
+                datos['id'],
+                TipoMantenimiento[datos['tipo']],
+                datos['equipo_id'],
+                datetime.fromisoformat(datos['fecha_programada']),
+                datos['tecnico_id'],
+                EstadoTarea[datos['estado']],
+                datos['observaciones'],
+                datetime.fromisoformat(fecha_realizacion) if fecha_realizacion else None,
+                datos['duracion_minutos'],
+            ))
+        except Exception as e:
+            errores.append(f"Error cargando tarea {datos.get('id')}: {str(e)}")
+    return tareas, errores
+
+
+def serializar_fecha(obj):
+    """
+    Serializa un objeto datetime a formato ISO 8601.
+
+    :param obj: Objeto a serializar.
+    :return: Representación en formato ISO 8601.
+    :raises TypeError: Si el objeto no es serializable.
+    """
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Tipo {type(obj)} no serializable")
+
+
+def escribir_json_atomico(ruta: Path, datos: dict) -> bytes:
+    """
+    Escribe un archivo JSON de forma atómica: primero en un archivo temporal que se
+    sincroniza con el disco y luego se renombra sobre el destino, de modo que una
+    interrupción nunca deja el archivo a medio escribir.
+
+    :param ruta: Ruta del archivo destino.
+    :param datos: Diccionario a escribir.
+    :return: Contenido escrito.
+    """
+    contenido = json.dumps(datos, indent=4, default=serializar_fecha).encode()
+    temporal = ruta.with_suffix(ruta.suffix + ".tmp")
+    with open(temporal, 'wb') as f:
+        f.write(contenido)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, ruta)
+    return contenido
+
+
+def ubicacion_a_dict(ubicacion: Ubicacion) -> dict:
+    """
+    Convierte un objeto Ubicacion a un diccionario serializable.
+
+    :param ubicacion: Objeto Ubicacion a convertir.
+    :return: Diccionario con los datos de la ubicación.
+    """
+    return {
+        'id': ubicacion.id,
+        'nombre': ubicacion.nombre,
+        'descripcion': ubicacion.descripcion
+    }
+
+
+def equipo_a_dict(equipo: Equipo) -> dict:
+    """
+    Convierte un objeto Equipo a un diccionario serializable.
+
+    :param equipo: Objeto Equipo a convertir.
+    :return: Diccionario con los datos del equipo.
+    """
+    return {
+        'id': equipo.id,
+        'nombre': equipo.nombre,
+        'fecha_instalacion': equipo.fecha_instalacion,
+        'horas_uso': equipo.horas_uso,
+        'horas_mantenimiento': equipo.horas_mantenimiento,
+        'ubicacion_id': equipo.ubicacion.id
+    }
+
+
+def tecnico_a_dict(tecnico: Tecnico) -> dict:
+    """
+    Convierte un objeto Tecnico a un diccionario serializable.
+
+    :param tecnico: Objeto Tecnico a convertir.
+    :return: Diccionario con los datos del técnico.
+    """
+    return {
+        'id': tecnico.id,
+        'nombre': tecnico.nombre,
+        'especialidad': tecnico.especialidad,
+        'activo': tecnico.activo
+    }
+
+
+def tarea_a_dict(tarea: TareaMantenimiento) -> dict:
+    """
+    Convierte un objeto TareaMantenimiento a un diccionario serializable.
+
+    :param tarea: Objeto TareaMantenimiento a convertir.
+    :return: Diccionario con los datos de la tarea.
+    """
+    return {
+        'id': tarea.id,
+        'tipo': tarea.tipo.name,
+        'fecha_programada': tarea.fecha_programada,
+        'estado': tarea.estado.name,
+        'observaciones': tarea.observaciones,
+        'fecha_realizacion': tarea.fecha_realizacion,
+        'duracion_minutos': tarea.duracion_minutos,
+        'equipo_id': tarea.equipo.id,
+        'tecnico_id': tarea.tecnico_asignado.id
+    }
+
+
+def dict_a_ubicacion(datos: dict) -> Ubicacion:
+    """
+    Convierte un diccionario serializado en un objeto Ubicacion.
+
+    :param datos: Diccionario con los datos de la ubicación.
+    :return: Objeto Ubicacion.
+    """
+    return Ubicacion(**datos)
+
+
+def dict_a_equipo(datos: dict, ubicaciones: Dict[str, Ubicacion]) -> Optional[Equipo]:
+    """
+    Convierte un diccionario serializado en un objeto Equipo.
+
+    :param datos: Diccionario con los datos del equipo.
+    :param ubicaciones: Ubicaciones ya cargadas, indexadas por ID.
+    :return: Objeto Equipo, o None si los datos no son válidos.
+    """
+    try:
+        eq_data = datos.copy()
+        eq_data['ubicacion'] = ubicaciones[eq_data['ubicacion_id']]
+        del eq_data['ubicacion_id']
+
+        # Convertir string a datetime
+        eq_data['fecha_instalacion'] = datetime.fromisoformat(eq_data['fecha_instalacion'])
+
+        return Equipo(**eq_data)
+    except KeyError as e:
+        print(f"Error cargando equipo {datos.get('id')}: {str(e)}")
+    except ValueError as e:
+        print(f"Error en formato de fecha para equipo {datos.get('id')}: {str(e)}")
+    return None
+
+
+def dict_a_tecnico(datos: dict) -> Optional[Tecnico]:
+    """
+    Convierte un diccionario serializado en un objeto Tecnico.
+
+    :param datos: Diccionario con los datos del técnico.
+    :return: Objeto Tecnico, o None si los datos no son válidos.
+    """
+    try:
+        return Tecnico(**datos)
+    except KeyError as e:
+        print(f"Error cargando técnico {datos.get('id')}: {str(e)}")
+    return None
+
+
+def dict_a_tarea(datos: dict, equipos: Dict[str, Equipo],
+                 tecnicos: Dict[str, Tecnico]) -> Optional[TareaMantenimiento]:
+    """
+    Convierte un diccionario serializado en un objeto TareaMantenimiento.
+
+    :param datos: Diccionario con los datos de la tarea.
+    :param equipos: Equipos ya cargados, indexados por ID.
+    :param tecnicos: Técnicos ya cargados, indexados por ID.
+    :return: Objeto TareaMantenimiento, o None si los datos no son válidos.
+    """
+    try:
+        ta_data = datos.copy()
+
+        # Convertir IDs a objetos
+        ta_data['equipo'] = equipos[ta_data['equipo_id']]
+        ta_data['tecnico_asignado'] = tecnicos[ta_data['tecnico_id']]
+        del ta_data['equipo_id']
+        del ta_data['tecnico_id']
+
+        # Convertir enums
+        ta_data['tipo'] = TipoMantenimiento[ta_data['tipo']]
+        ta_data['estado'] = EstadoTarea[ta_data['estado']]
+
+        # Convertir fechas
+        if ta_data['fecha_realizacion']:
+            ta_data['fecha_realizacion'] = datetime.fromisoformat(ta_data['fecha_realizacion'])
+        ta_data['fecha_programada'] = datetime.fromisoformat(ta_data['fecha_programada'])
+
+        return TareaMantenimiento(**ta_data)
+    except Exception as e:
+        print(f"Error cargando tarea {datos.get('id')}: {str(e)}")
+    return None
+
+
+class SeguimientoCambios:
+    """
+    Mezcla que acumula las altas, cambios y bajas notificadas por un sistema de
+    mantenimiento para que una persistencia incremental las escriba al guardar.
+    """
+
+    _sistema: Optional[SistemaMantenimiento] = None
+
+    def vincular(self, sistema: SistemaMantenimiento):
+        """
+        Suscribe la persistencia a las modificaciones del sistema indicado.
+
+        :param sistema: Sistema cuyas altas, cambios y bajas se registrarán.
+        """
+        if self._sistema is sistema:
+            return
+        if self._sistema is not None:
+            self._sistema.desuscribir(self._registrar_operacion)
+        self._sistema = sistema
+        self._pendientes: Dict[Tuple[str, str], Tuple[str, object]] = {}
+        sistema.suscribir(self._registrar_operacion)
+
+    def _registrar_operacion(self, operacion: str, coleccion: str, entidad):
+        """
+        Anota una operación pendiente de escribir.
+
+        Las operaciones sobre una misma entidad se combinan: solo se conserva la última,
+        y la entidad se serializa al momento de guardar.
+
+        Las tareas leídas del historial diferido (operación "carga") ya están guardadas.
+
+        :param operacion: "alta", "cambio", "baja" o "carga".
+        :param coleccion: Colección afectada.
+        :param entidad: Entidad afectada.
+        """
+        if operacion == "carga":
+            return
+        clave = (coleccion, entidad.id)
+        anterior = self._pendientes.get(clave)
+        if operacion == "baja":
+            self._pendientes.pop(clave, None)
+            self._pendientes[clave] = ("baja", None)
+        else:
+            if anterior is not None and anterior[0] == "baja":
+                # Reinsertar al final para respetar el orden baja -> alta
+                del self._pendientes[clave]
+            self._pendientes[clave] = ("upsert", entidad)
+
+    def _tomar_pendientes(self) -> Dict[Tuple[str, str], Tuple[str, object]]:
+        """
+        Devuelve las operaciones pendientes y vacía la lista interna.
+
+        Las operaciones se ordenan por dependencia según ORDEN_COLECCIONES: primero las
+        altas y cambios, de ubicaciones a tareas, y luego las bajas, de tareas a
+        ubicaciones. Así, al reaplicarlas, cada entidad encuentra ya creadas las que
+        referencia, aunque estas se hayan dado de alta después de modificarla.
+
+        :return: Operaciones pendientes indexadas por (colección, ID).
+        """
+        pendientes = getattr(self, "_pendientes", {})
+        self._pendientes = {}
+        upserts = {coleccion: [] for coleccion in ORDEN_COLECCIONES}
+        bajas = {coleccion: [] for coleccion in ORDEN_COLECCIONES}
+        for clave, (operacion, entidad) in pendientes.items():
+            grupo = bajas if operacion == "baja" else upserts
+            grupo[clave[0]].append((clave, (operacion, entidad)))
+
+        ordenadas = {}
+        for coleccion in ORDEN_COLECCIONES:
+            ordenadas.update(upserts[coleccion])
+        for coleccion in reversed(ORDEN_COLECCIONES):
+            ordenadas.update(bajas[coleccion])
+        return ordenadas
+
+
+class HistorialDiferidoBase:
+    """
+    Base de los historiales de tareas que quedan en disco hasta que el sistema las pide
+    (ver SistemaMantenimiento.diferir_historial).
+
+    Las tareas sin leer se agrupan por par (equipo, técnico), cada uno con los conteos de
+    sus tareas para los reportes, de modo que se pueden leer las de un equipo o las de un
+    técnico sin leer el resto. Las subclases implementan _leer, que lee las tareas de
+    varios pares.
+    """
+
+    def __init__(self, resumenes: Dict[ClaveHistorial, Counter], ultimas_preventivas: Dict[str, datetime]):
+        """
+        Inicializador de la clase HistorialDiferidoBase.
+
+        :param resumenes: Conteos de las tareas sin leer, por (ID de equipo, ID de técnico),
+            en Counter con las claves tareas, completadas, fallas, suma_duracion y
+            cantidad_duracion, y una clave con cantidad por nombre de tipo de mantenimiento.
+        :param ultimas_preventivas: Fecha de la última tarea preventiva, por ID de equipo.
+        """
+        self._resumenes = resumenes
+        self._ultimas_preventivas = ultimas_preventivas
+        self._por_equipo: Dict[str, Set[ClaveHistorial]] = {}
+        self._por_tecnico: Dict[str, Set[ClaveHistorial]] = {}
+        for clave in resumenes:
+            equipo_id, tecnico_id = clave
+            self._por_equipo.setdefault(equipo_id, set()).add(clave)
+            self._por_tecnico.setdefault(tecnico_id, set()).add(clave)
+
+    def pendientes(self) -> AbstractSet[str]:
+        """
+        Devuelve los IDs de los equipos con tareas sin leer.
+        """
+        return self._por_equipo.keys()
+
+    def cantidad(self) -> int:
+        """
+        Devuelve la cantidad de tareas sin leer.
+        """
+        return sum(resumen["tareas"] for resumen in self._resumenes.values())
+
+    def tecnicos(self) -> AbstractSet[str]:
+        """
+        Devuelve los IDs de los técnicos con tareas sin leer.
+        """
+        return self._por_tecnico.keys()
+
+    def ultimas_preventivas(self) -> Dict[str, datetime]:
+        """
+        Devuelve la fecha de la última tarea preventiva sin leer de cada equipo pendiente.
+        """
+        return {equipo_id: fecha for equipo_id, fecha in self._ultimas_preventivas.items()
+                if equipo_id in self._por_equipo}
+
+    def resumen(self) -> dict:
+        """
+        Suma los conteos de las tareas sin leer, sin leerlas.
+
+        :return: Diccionario con los argumentos de ResumenHistorial: por_equipo,
+            completadas_por_tecnico, por_tipo, fallas_por_equipo, suma_duracion y
+            cantidad_duracion.
+        """
+        por_equipo, completadas, fallas, total = Counter(), Counter(), Counter(), Counter()
+        for (equipo_id, tecnico_id), resumen in self._resumenes.items():
+            por_equipo[equipo_id] += resumen["tareas"]
+            completadas[tecnico_id] += resumen["completadas"]
+            fallas[equipo_id] += resumen["fallas"]
+            total.update(resumen)
+        return {
+            "por_equipo": dict(+por_equipo),
+            "completadas_por_tecnico": dict(+completadas),
+            "por_tipo": {tipo.name: total[tipo.name] for tipo in TipoMantenimiento},
+            "fallas_por_equipo": dict(+fallas),
+            "suma_duracion": total["suma_duracion"],
+            "cantidad_duracion": total["cantidad_duracion"],
+        }
+
+    def resumenes(self) -> Dict[ClaveHistorial, Counter]:
+        """
+        Devuelve los conteos de las tareas sin leer, por (ID de equipo, ID de técnico).
+        """
+        return self._resumenes
+
+    def leer(self, equipo_id: str, equipos: Dict[str, Equipo],
+             tecnicos: Dict[str, Tecnico]) -> List[TareaMantenimiento]:
+        """
+        Lee las tareas de un equipo y las quita de las pendientes.
+
+        :param equipo_id: Identificador del equipo.
+        :param equipos: Equipos del sistema, indexados por ID.
+        :param tecnicos: Técnicos del sistema, indexados por ID.
+        :return: Lista de tareas leídas.
+        """
+        return self._leer_y_descartar(self._por_equipo.get(equipo_id, ()), equipos, tecnicos)
+
+    def leer_tecnico(self, tecnico_id: str, equipos: Dict[str, Equipo],
+                     tecnicos: Dict[str, Tecnico]) -> List[TareaMantenimiento]:
+        """
+        Lee las tareas de un técnico y las quita de las pendientes.
+
+        :param tecnico_id: Identificador del técnico.
+        :param equipos: Equipos del sistema, indexados por ID.
+        :param tecnicos: Técnicos del sistema, indexados por ID.
+        :return: Lista de tareas leídas.
+        """
+        return self._leer_y_descartar(self._por_tecnico.get(tecnico_id, ()), equipos, tecnicos)
+
+    def _leer_y_descartar(self, claves: Iterable[ClaveHistorial], equipos: Dict[str, Equipo],
+                          tecnicos: Dict[str, Tecnico]) -> List[TareaMantenimiento]:
+        """
+        Lee las tareas de varios pares y, solo si la lectura termina, los quita de los
+        pendientes: si falla, las tareas siguen pendientes.
+        """
+        claves = list(claves)
+        if not claves:
+            return []
+        tareas = self._leer(claves, equipos, tecnicos)
+        for clave in claves:
+            self._descartar(clave)
+        return tareas
+
+    def _leer(self, claves: List[ClaveHistorial], equipos: Dict[str, Equipo],
+              tecnicos: Dict[str, Tecnico]) -> List[TareaMantenimiento]:
+        """
+        Lee las tareas de los pares (equipo, técnico) indicados.
+
+        :param claves: Pares (ID de equipo, ID de técnico) a leer.
+        :param equipos: Equipos del sistema, indexados por ID.
+        :param tecnicos: Técnicos del sistema, indexados por ID.
+        :return: Lista de tareas leídas.
+        """
+        raise NotImplementedError
+
+    def _descartar(self, clave: ClaveHistorial):
+        """
+        Quita un par de los pendientes.
+
+        :param clave: Par (ID de equipo, ID de técnico).
+        """
+        del self._resumenes[clave]
+        for grupos, id_grupo in ((self._por_equipo, clave[0]), (self._por_tecnico, clave[1])):
+            grupo = grupos[id_grupo]
+            grupo.discard(clave)
+            if not grupo:
+                del grupos[id_grupo]
 
 
 class PersistenciaJSON:
     """
     Clase para manejar la persistencia de datos del sistema de mantenimiento en formato JSON.
+
+    Junto al JSON se guarda una caché binaria con las entidades ya construidas. Solo se usa
+    si la fecha de modificación, el tamaño y el hash del JSON coinciden con los registrados
+    al escribirla; si no, se lee el JSON y la caché se reconstruye.
     """
 
-    def __init__(self, archivo: str = "datos/mantenimiento.json"):
+    def __init__(self, archivo: str = "datos/mantenimiento.json", usar_cache: bool = True,
+                 procesos: int = 1, compresion: Optional[str] = None):
         """
         Inicializa la clase PersistenciaJSON.
 
         :param archivo: Ruta del archivo JSON donde se almacenarán los datos.
+        :param usar_cache: Indica si se mantiene la caché binaria (misma ruta con extensión .cache).
+        :param procesos: Cantidad de procesos que decodifican las tareas al cargar. Con 1
+            (por defecto) la carga se hace en el proceso actual.
+        :param compresion: Códec con el que se comprime el archivo: "gzip", "bz2" o "lzma"
+            (ver modelo.compresion). Su extensión se agrega a la ruta del archivo. None
+            (por defecto) para no comprimir.
+        :raises ValueError: Si el códec no existe.
         """
-        self.archivo = Path(archivo)
+        validar_codec(compresion)
+        self.compresion = compresion
+        self.archivo_sin_comprimir = Path(archivo)
+        self.archivo = ruta_comprimida(Path(archivo), compresion)
+        self.procesos = procesos
         self.archivo.parent.mkdir(exist_ok=True)
+        # Con compresión, una caché por códec: el mismo JSON puede estar en varios formatos
+        cache = self.archivo.with_suffix(".cache") if compresion is None else \
+            self.archivo.with_name(self.archivo.name + ".cache")
+        self.archivo_cache = cache if usar_cache else None
 
     def guardar(self, sistema: SistemaMantenimiento):
         """
@@ -31,150 +512,272 @@ class PersistenciaJSON:
 
         :param sistema: Instancia del sistema de mantenimiento a guardar.
         """
-        datos = {
-            "equipos": [self._equipo_a_dict(e) for e in sistema.equipos],
-            "tecnicos": [self._tecnico_a_dict(t) for t in sistema.tecnicos],
-            "tareas": [self._tarea_a_dict(t) for t in sistema.tareas],
-            "ubicaciones": [self._ubicacion_a_dict(u) for u in sistema.ubicaciones]
-        }
+        self._escribir_instantanea(sistema)
+
+    def _escribir_instantanea(self, sistema: SistemaMantenimiento):
+        """
+        Reescribe el JSON completo del sistema y actualiza su caché.
+
+        :param sistema: Instancia del sistema de mantenimiento a guardar.
+        """
+        if self.compresion is not None:
+            hash_datos = self._escribir_comprimido(self.archivo, self._sistema_a_dict(sistema))
+        else:
+            contenido = escribir_json_atomico(self.archivo, self._sistema_a_dict(sistema))
+            hash_datos = hashlib.blake2b(contenido).hexdigest()
+        self._guardar_cache(sistema, hash_datos)
+
+    def _escribir_comprimido(self, ruta: Path, datos: dict) -> str:
+        """
+        Escribe un archivo JSON comprimido de forma atómica, como _escribir_atomico.
+
+        El JSON se codifica por partes y cada parte pasa por el compresor a medida que se
+        genera, sin armar el texto completo en memoria. Se escribe sin sangría: el
+        archivo comprimido no está pensado para editarse a mano.
 
-        with open(self.archivo, 'w') as f:
-            json.dump(datos, f, indent=4, default=self._serializar_fecha)
+        :param ruta: Ruta del archivo destino.
+        :param datos: Diccionario a escribir.
+        :return: Hash BLAKE2b del contenido comprimido escrito.
+        """
+        temporal = ruta.with_suffix(ruta.suffix + ".tmp")
+        with open(temporal, 'wb') as f:
+            escritura = EscrituraConResumen(f)
+            with envolver(escritura, 'wb', self.compresion) as comprimido, \
+                    io.TextIOWrapper(comprimido, encoding="utf-8") as texto:
+                json.dump(datos, texto, separators=(",", ":"), default=serializar_fecha)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, ruta)
+        return escritura.resumen.hexdigest()
+
+    def _hash_archivo(self) -> str:
+        """
+        Calcula el hash BLAKE2b del archivo de datos leyéndolo por bloques.
+
+        :return: Hash en hexadecimal.
+        """
+        resumen = hashlib.blake2b()
+        with open(self.archivo, 'rb') as f:
+            for bloque in iter(lambda: f.read(1 << 20), b""):
+                resumen.update(bloque)
+        return resumen.hexdigest()
+
+    def _huella(self, hash_datos: str) -> tuple:
+        """
+        Calcula la huella del archivo de datos con la que se valida la caché.
+
+        :param hash_datos: Hash BLAKE2b del contenido actual del archivo.
+        :return: Tupla (versión de la caché, fecha de modificación en ns, tamaño, hash).
+        """
+        estado = self.archivo.stat()
+        return (VERSION_CACHE, estado.st_mtime_ns, estado.st_size, hash_datos)
+
+    def _guardar_cache(self, sistema: SistemaMantenimiento, hash_datos: str):
+        """
+        Escribe la caché binaria del sistema para el contenido actual del JSON.
+
+        La caché contiene dos objetos pickle: la huella del JSON y el sistema completo,
+        con sus índices, para no tener que reconstruirlos al cargar.
+
+        :param sistema: Sistema cargado a partir de ese contenido.
+        :param hash_datos: Hash BLAKE2b del contenido actual del archivo.
+        """
+        if self.archivo_cache is None:
+            return
+        temporal = self.archivo_cache.with_suffix(self.archivo_cache.suffix + ".tmp")
+        try:
+            with open(temporal, 'wb') as f:
+                pickle.dump(self._huella(hash_datos), f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(sistema, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporal, self.archivo_cache)
+        except (OSError, pickle.PicklingError) as e:
+            # La caché es opcional: si no se puede escribir, la próxima carga lee el JSON
+            print(f"No se pudo escribir la caché {self.archivo_cache}: {str(e)}")
+
+    def _cargar_cache(self, calcular_hash: Callable[[], str]) -> Optional[SistemaMantenimiento]:
+        """
+        Construye el sistema desde la caché binaria si corresponde al contenido del archivo.
+
+        :param calcular_hash: Función que devuelve el hash BLAKE2b del contenido actual del
+            archivo. Solo se llama si la fecha y el tamaño coinciden.
+        :return: Sistema cargado, o None si no hay caché válida.
+        """
+        if self.archivo_cache is None or not self.archivo_cache.exists():
+            return None
+        try:
+            with open(self.archivo_cache, 'rb') as f:
+                version, mtime, tamano, hash_datos = pickle.load(f)
+                estado = self.archivo.stat()
+                # Primero lo barato: versión, fecha y tamaño; el hash solo si coinciden
+                if (version, mtime, tamano) != (VERSION_CACHE, estado.st_mtime_ns, estado.st_size):
+                    return None
+                if hash_datos != calcular_hash():
+                    return None
+                # Se crean muchos objetos que sobreviven: el recolector solo retrasaría la carga
+                recolector_activo = gc.isenabled()
+                gc.disable()
+                try:
+                    sistema = pickle.load(f)
+                finally:
+                    if recolector_activo:
+                        gc.enable()
+        except Exception:
+            # Una caché ilegible (truncada, de otra versión del código...) se reconstruye
+            return None
+        return sistema if isinstance(sistema, SistemaMantenimiento) else None
+
+    def _sistema_a_dict(self, sistema: SistemaMantenimiento) -> dict:
+        """
+        Convierte el sistema completo a un diccionario serializable.
+
+        :param sistema: Instancia del sistema de mantenimiento.
+        :return: Diccionario con las secciones equipos, tecnicos, tareas y ubicaciones.
+        """
+        # Un historial diferido se carga para no perder sus tareas al reescribir el archivo
+        sistema.cargar_historial()
+        return {
+            "equipos": [equipo_a_dict(e) for e in sistema.equipos],
+            "tecnicos": [tecnico_a_dict(t) for t in sistema.tecnicos],
+            "tareas": [tarea_a_dict(t) for t in sistema.tareas],
+            "ubicaciones": [ubicacion_a_dict(u) for u in sistema.ubicaciones]
+        }
 
     def cargar(self) -> SistemaMantenimiento:
         """
-        Carga los datos del sistema de mantenimiento desde un archivo JSON.
+        Carga los datos del sistema de mantenimiento desde la caché binaria si sigue siendo
+        válida o, si no, desde el archivo JSON.
+
+        Si el archivo comprimido aún no existe pero sí el JSON sin comprimir, se lee este
+        último; el próximo guardado escribe el archivo comprimido.
 
         :return: Instancia del sistema de mantenimiento con los datos cargados.
         """
         if not self.archivo.exists():
+            if self.compresion is not None and self.archivo_sin_comprimir.exists():
+                return PersistenciaJSON(str(self.archivo_sin_comprimir), usar_cache=False,
+                                        procesos=self.procesos).cargar()
             return SistemaMantenimiento()
+        if self.compresion is not None:
+            return self._cargar_comprimido()
+
+        contenido = self.archivo.read_bytes()
+        sistema = self._cargar_cache(lambda: hashlib.blake2b(contenido).hexdigest())
+        if sistema is not None:
+            return sistema
 
         try:
-            with open(self.archivo, 'r') as f:
-                datos = json.load(f)
+            datos = json.loads(contenido)
         except json.JSONDecodeError:
             return SistemaMantenimiento()
 
+        sistema = self._construir_sistema(datos)
+        self._guardar_cache(sistema, hashlib.blake2b(contenido).hexdigest())
+        return sistema
+
+    def _cargar_comprimido(self) -> SistemaMantenimiento:
+        """
+        Carga el sistema desde la caché binaria si sigue siendo válida o, si no,
+        descomprimiendo el archivo al vuelo mientras se lee.
+
+        :return: Instancia del sistema de mantenimiento con los datos cargados.
+        """
+        sistema = self._cargar_cache(self._hash_archivo)
+        if sistema is not None:
+            return sistema
+
+        try:
+            with open(self.archivo, 'rb') as f, envolver(f, 'rb', self.compresion) as datos_comprimidos:
+                datos = json.load(datos_comprimidos)
+        except (ValueError, OSError, EOFError, lzma.LZMAError) as e:
+            print(f"Error leyendo {self.archivo}: {str(e)}")
+            return SistemaMantenimiento()
+
+        sistema = self._construir_sistema(datos)
+        self._guardar_cache(sistema, self._hash_archivo())
+        return sistema
+
+    def _construir_sistema(self, datos: dict) -> SistemaMantenimiento:
+        """
+        Construye un sistema de mantenimiento a partir de un diccionario con las
+        secciones equipos, tecnicos, tareas y ubicaciones.
+
+        :param datos: Diccionario con los datos serializados.
+        :return: Instancia del sistema de mantenimiento con los datos cargados.
+        """
         sistema = SistemaMantenimiento()
 
         # 1. Cargar ubicaciones
-        ubicaciones = {u['id']: Ubicacion(**u) for u in datos.get('ubicaciones', [])}
-        for ub in ubicaciones.values():
-            sistema.agregar_ubicacion(ub)
+        ubicaciones = {}
+        for u in datos.get('ubicaciones', []):
+            ubicacion = dict_a_ubicacion(u)
+            if self._agregar_entidad(sistema.agregar_ubicacion, ubicacion, "ubicación"):
+                ubicaciones[ubicacion.id] = ubicacion
 
         # 2. Cargar equipos
         equipos = {}
         for eq in datos.get('equipos', []):
-            try:
-                eq_data = eq.copy()
-                eq_data['ubicacion'] = ubicaciones[eq_data['ubicacion_id']]
-                del eq_data['ubicacion_id']
-
-                # Convertir string a datetime
-                eq_data['fecha_instalacion'] = datetime.fromisoformat(eq_data['fecha_instalacion'])
-
-                equipo = Equipo(**eq_data)
+            equipo = dict_a_equipo(eq, ubicaciones)
+            if equipo and self._agregar_entidad(sistema.agregar_equipo, equipo, "equipo"):
                 equipos[equipo.id] = equipo
-                sistema.agregar_equipo(equipo)
-            except KeyError as e:
-                print(f"Error cargando equipo {eq.get('id')}: {str(e)}")
-            except ValueError as e:
-                print(f"Error en formato de fecha para equipo {eq.get('id')}: {str(e)}")
 
         # 3. Cargar técnicos
         tecnicos = {}
         for tec in datos.get('tecnicos', []):
-            try:
-                tecnico = Tecnico(**tec)
+            tecnico = dict_a_tecnico(tec)
+            if tecnico and self._agregar_entidad(sistema.agregar_tecnico, tecnico, "técnico"):
                 tecnicos[tecnico.id] = tecnico
-                sistema.agregar_tecnico(tecnico)
-            except KeyError as e:
-                print(f"Error cargando técnico {tec.get('id')}: {str(e)}")
 
         # 4. Cargar tareas
-        for ta in datos.get('tareas', []):
-            try:
-                ta_data = ta.copy()
-
-                # Convertir IDs a objetos
-                ta_data['equipo'] = equipos[ta_data['equipo_id']]
-                ta_data['tecnico_asignado'] = tecnicos[ta_data['tecnico_id']]
-                del ta_data['equipo_id']
-                del ta_data['tecnico_id']
-
-                # Convertir enums
-                ta_data['tipo'] = TipoMantenimiento[ta_data['tipo']]
-                ta_data['estado'] = EstadoTarea[ta_data['estado']]
-
-                # Convertir fechas
-                if ta_data['fecha_realizacion']:
-                    ta_data['fecha_realizacion'] = datetime.fromisoformat(ta_data['fecha_realizacion'])
-                ta_data['fecha_programada'] = datetime.fromisoformat(ta_data['fecha_programada'])
-
-                sistema.agregar_tarea(TareaMantenimiento(**ta_data))
-            except Exception as e:
-                print(f"Error cargando tarea {ta.get('id')}: {str(e)}")
+        tareas = datos.get('tareas', [])
+        if self.procesos > 1 and len(tareas) > TAMANO_BLOQUE_TAREAS:
+            self._cargar_tareas_en_paralelo(sistema, tareas, equipos, tecnicos)
+        else:
+            for ta in tareas:
+                tarea = dict_a_tarea(ta, equipos, tecnicos)
+                if tarea:
+                    self._agregar_entidad(sistema.agregar_tarea, tarea, "tarea")
 
         return sistema
 
-    def _serializar_fecha(self, obj):
-        """
-        Serializa un objeto datetime a formato ISO 8601.
-
-        :param obj: Objeto a serializar.
-        :return: Representación en formato ISO 8601.
-        :raises TypeError: Si el objeto no es serializable.
+    def _cargar_tareas_en_paralelo(self, sistema: SistemaMantenimiento, tareas: List[dict],
+                                   equipos: Dict[str, Equipo], tecnicos: Dict[str, Tecnico]):
         """
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        raise TypeError(f"Tipo {type(obj)} no serializable")
+        Decodifica las tareas por bloques en un grupo de procesos y las agrega al sistema
+        en el orden del archivo, enlazando sus equipos y técnicos por ID.
 
-    def _equipo_a_dict(self, equipo: Equipo) -> dict:
+        :param sistema: Sistema en construcción.
+        :param tareas: Diccionarios de tareas serializadas.
+        :param equipos: Equipos ya cargados, indexados por ID.
+        :param tecnicos: Técnicos ya cargados, indexados por ID.
         """
-        Convierte un objeto Equipo a un diccionario serializable.
-
-        :param equipo: Objeto Equipo a convertir.
-        :return: Diccionario con los datos del equipo.
-        """
-        d = equipo.__dict__.copy()
-        d['id'] = d.pop('_id')  # Cambiar _id a id
-        d['ubicacion_id'] = d['ubicacion'].id
-        del d['ubicacion']
-        return d
-
-    def _tecnico_a_dict(self, tecnico: Tecnico) -> dict:
-        """
-        Convierte un objeto Tecnico a un diccionario serializable.
-
-        :param tecnico: Objeto Tecnico a convertir.
-        :return: Diccionario con los datos del técnico.
-        """
-        d = tecnico.__dict__.copy()
-        d['id'] = d.pop('_id')  # Cambiar _id a id
-        return d
-
-    def _tarea_a_dict(self, tarea: TareaMantenimiento) -> dict:
-        """
-        Convierte un objeto TareaMantenimiento a un diccionario serializable.
-
-        :param tarea: Objeto TareaMantenimiento a convertir.
-        :return: Diccionario con los datos de la tarea.
+        bloques = [tareas[i:i + TAMANO_BLOQUE_TAREAS] for i in range(0, len(tareas), TAMANO_BLOQUE_TAREAS)]
+        with ProcessPoolExecutor(max_workers=self.procesos) as ejecutor:
+            for decodificadas, errores in ejecutor.map(_decodificar_tareas, bloques):
+                for error in errores:
+                    print(error)
+                for valores in decodificadas:
+                    tarea_id, tipo, equipo_id, fecha_programada, tecnico_id = valores[:5]
+                    equipo = equipos.get(equipo_id)
+                    tecnico = tecnicos.get(tecnico_id)
+                    if equipo is None or tecnico is None:
+                        faltante = equipo_id if equipo is None else tecnico_id
+                        print(f"Error cargando tarea {tarea_id}: {faltante!r}")
+                        continue
+                    tarea = TareaMantenimiento(tarea_id, tipo, equipo, fecha_programada, tecnico, *valores[5:])
+                    self._agregar_entidad(sistema.agregar_tarea, tarea, "tarea")
+
+    def _agregar_entidad(self, agregar, entidad, descripcion: str) -> bool:
         """
-        d = tarea.__dict__.copy()
-        d['tipo'] = d['tipo'].name
-        d['estado'] = d['estado'].name
-        d['equipo_id'] = d['equipo'].id
-        d['tecnico_id'] = d['tecnico_asignado'].id
-        del d['equipo']
-        del d['tecnico_asignado']
-        return d
+        Agrega una entidad al sistema informando los IDs duplicados sin interrumpir la carga.
 
-    def _ubicacion_a_dict(self, ubicacion: Ubicacion) -> dict:
+        :param agregar: Método agregar_* del sistema.
+        :param entidad: Entidad a agregar.
+        :param descripcion: Nombre de la entidad para el mensaje de error.
+        :return: True si la entidad fue agregada.
         """
-        Convierte un objeto Ubicacion a un diccionario serializable.
-
-        :param ubicacion: Objeto Ubicacion a convertir.
-        :return: Diccionario con los datos de la ubicación.
-        """
-        return ubicacion.__dict__.copy()
+        try:
+            agregar(entidad)
+            return True
+        except ValueError as e:
+            print(f"Error cargando {descripcion} {entidad.id}: {str(e)}")
+            return False
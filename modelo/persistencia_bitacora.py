@@ -0,0 +1,220 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from modelo.SistemaMantenimiento import SistemaMantenimiento
+from modelo.persistencia import (PersistenciaJSON, SeguimientoCambios, dict_a_equipo, dict_a_tarea,
+                                 dict_a_tecnico, dict_a_ubicacion, equipo_a_dict, serializar_fecha,
+                                 tarea_a_dict, tecnico_a_dict, ubicacion_a_dict)
+
+# Nombre en singular de cada colección, usado para localizar agregar_* y eliminar_*
+_SINGULAR = {
+    "equipos": "equipo",
+    "tecnicos": "tecnico",
+    "tareas": "tarea",
+    "ubicaciones": "ubicacion",
+}
+
+# Atributos que se copian al reaplicar un upsert sobre una entidad existente
+_CAMPOS = {
+    "equipos": ("nombre", "ubicacion", "fecha_instalacion", "horas_uso", "horas_mantenimiento"),
+    "tecnicos": ("nombre", "especialidad", "activo"),
+    "tareas": ("tipo", "equipo", "fecha_programada", "tecnico_asignado", "estado",
+               "observaciones", "fecha_realizacion", "duracion_minutos"),
+    "ubicaciones": ("nombre", "descripcion"),
+}
+
+
+class PersistenciaBitacora(SeguimientoCambios, PersistenciaJSON):
+    """
+    Persistencia JSON con bitácora de cambios de solo anexado.
+
+    Cada alta, cambio o baja del sistema se escribe como una línea JSON en un archivo
+    de bitácora junto a la instantánea principal, de modo que guardar cuesta en proporción
+    a lo modificado y no al tamaño de la base. Cuando la bitácora supera un umbral de
+    registros se compacta reescribiendo la instantánea completa.
+    """
+
+    def __init__(self, archivo: str = "datos/mantenimiento.json",
+                 archivo_bitacora: Optional[str] = None, umbral_compactacion: int = 1000,
+                 procesos: int = 1, compresion: Optional[str] = None):
+        """
+        Inicializa la persistencia con bitácora.
+
+        :param archivo: Ruta de la instantánea JSON.
+        :param archivo_bitacora: Ruta del archivo de bitácora. Por defecto se usa la
+            misma ruta de la instantánea con extensión .bitacora.
+        :param umbral_compactacion: Cantidad de registros en la bitácora a partir de la
+            cual se reescribe la instantánea completa.
+        :param procesos: Cantidad de procesos que decodifican las tareas de la instantánea al cargar.
+        :param compresion: Códec con el que se comprime la instantánea, como en
+            PersistenciaJSON. La bitácora no se comprime.
+        """
+        super().__init__(archivo, procesos=procesos, compresion=compresion)
+        if archivo_bitacora:
+            self.archivo_bitacora = Path(archivo_bitacora)
+        else:
+            # La misma con o sin compresión, para no perder cambios al activarla
+            self.archivo_bitacora = self.archivo_sin_comprimir.with_suffix(".bitacora")
+        self.umbral_compactacion = umbral_compactacion
+        self._registros_en_bitacora = 0
+
+    def guardar(self, sistema: SistemaMantenimiento):
+        """
+        Anexa a la bitácora las operaciones pendientes del sistema.
+
+        Si el sistema no había sido vinculado, o la bitácora supera el umbral de
+        compactación, se reescribe la instantánea completa.
+
+        :param sistema: Instancia del sistema de mantenimiento a guardar.
+        """
+        if self._sistema is not sistema:
+            self.vincular(sistema)
+            self.compactar(sistema)
+            return
+
+        pendientes = self._tomar_pendientes()
+        if pendientes:
+            lineas = [json.dumps(self._registro_a_dict(coleccion, entidad_id, operacion, entidad),
+                                 default=serializar_fecha)
+                      for (coleccion, entidad_id), (operacion, entidad) in pendientes.items()]
+            with open(self.archivo_bitacora, 'a') as f:
+                f.write("\n".join(lineas) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._registros_en_bitacora += len(lineas)
+
+        if self._registros_en_bitacora >= self.umbral_compactacion:
+            self.compactar(sistema)
+
+    def compactar(self, sistema: SistemaMantenimiento):
+        """
+        Reescribe la instantánea completa de forma atómica y vacía la bitácora.
+
+        :param sistema: Instancia del sistema de mantenimiento a guardar.
+        """
+        self._escribir_instantanea(sistema)
+
+        # La instantánea ya contiene todo lo registrado en la bitácora
+        with open(self.archivo_bitacora, 'w'):
+            pass
+        self._registros_en_bitacora = 0
+        self._tomar_pendientes()
+
+    def cargar(self) -> SistemaMantenimiento:
+        """
+        Carga la instantánea JSON y reaplica sobre ella los registros de la bitácora.
+
+        Una última línea incompleta (escritura interrumpida) se descarta y se trunca.
+
+        :return: Instancia del sistema de mantenimiento con los datos cargados.
+        """
+        sistema = super().cargar()
+        self._registros_en_bitacora = self._reaplicar_bitacora(sistema)
+        self._sistema = None
+        self.vincular(sistema)
+        return sistema
+
+    def _registro_a_dict(self, coleccion: str, entidad_id: str, operacion: str, entidad) -> dict:
+        """
+        Convierte una operación pendiente en un registro serializable de la bitácora.
+
+        :param coleccion: Colección afectada.
+        :param entidad_id: Identificador de la entidad.
+        :param operacion: "upsert" o "baja".
+        :param entidad: Entidad afectada (None en las bajas).
+        :return: Diccionario con el registro.
+        """
+        if operacion == "baja":
+            return {"op": "baja", "coleccion": coleccion, "id": entidad_id}
+        convertidores = {
+            "equipos": equipo_a_dict,
+            "tecnicos": tecnico_a_dict,
+            "tareas": tarea_a_dict,
+            "ubicaciones": ubicacion_a_dict,
+        }
+        return {"op": "upsert", "coleccion": coleccion, "datos": convertidores[coleccion](entidad)}
+
+    def _reaplicar_bitacora(self, sistema: SistemaMantenimiento) -> int:
+        """
+        Reaplica los registros de la bitácora sobre el sistema recién cargado.
+
+        :param sistema: Sistema cargado desde la instantánea.
+        :return: Cantidad de registros válidos reaplicados.
+        """
+        if not self.archivo_bitacora.exists():
+            return 0
+
+        with open(self.archivo_bitacora, 'rb') as f:
+            contenido = f.read()
+
+        # Una escritura interrumpida deja la última línea sin salto final: se trunca
+        # para que los próximos registros no queden pegados a ella.
+        if contenido and not contenido.endswith(b"\n"):
+            contenido = contenido[:contenido.rfind(b"\n") + 1]
+            with open(self.archivo_bitacora, 'r+b') as f:
+                f.truncate(len(contenido))
+        lineas = contenido.decode().split("\n")
+
+        indices = {
+            "ubicaciones": {u.id: u for u in sistema.ubicaciones},
+            "equipos": {e.id: e for e in sistema.equipos},
+            "tecnicos": {t.id: t for t in sistema.tecnicos},
+            "tareas": {t.id: t for t in sistema.tareas},
+        }
+
+        aplicados = 0
+        for i, linea in enumerate(lineas):
+            if not linea.strip():
+                continue
+            try:
+                registro = json.loads(linea)
+            except json.JSONDecodeError:
+                print(f"Registro de bitácora inválido en la línea {i + 1}")
+                continue
+            if self._aplicar_registro(sistema, indices, registro):
+                aplicados += 1
+        return aplicados
+
+    def _aplicar_registro(self, sistema: SistemaMantenimiento, indices: Dict[str, dict], registro: dict) -> bool:
+        """
+        Aplica un único registro de la bitácora al sistema.
+
+        :param sistema: Sistema sobre el que se aplica el registro.
+        :param indices: Entidades del sistema indexadas por colección e ID.
+        :param registro: Registro leído de la bitácora.
+        :return: True si el registro pudo aplicarse.
+        """
+        coleccion = registro.get("coleccion")
+        if coleccion not in indices:
+            return False
+        indice = indices[coleccion]
+
+        if registro.get("op") == "baja":
+            entidad_id = registro.get("id")
+            if indice.pop(entidad_id, None) is not None:
+                getattr(sistema, f"eliminar_{_SINGULAR[coleccion]}")(entidad_id)
+            return True
+
+        datos = registro.get("datos", {})
+        if coleccion == "ubicaciones":
+            nueva = dict_a_ubicacion(datos)
+        elif coleccion == "equipos":
+            nueva = dict_a_equipo(datos, indices["ubicaciones"])
+        elif coleccion == "tecnicos":
+            nueva = dict_a_tecnico(datos)
+        else:
+            nueva = dict_a_tarea(datos, indices["equipos"], indices["tecnicos"])
+        if nueva is None:
+            return False
+
+        existente = indice.get(nueva.id)
+        if existente is not None:
+            # Actualizar en el lugar para no romper las referencias de otras entidades
+            for atributo in _CAMPOS[coleccion]:
+                setattr(existente, atributo, getattr(nueva, atributo))
+        else:
+            indice[nueva.id] = nueva
+            getattr(sistema, f"agregar_{_SINGULAR[coleccion]}")(nueva)
+        return True
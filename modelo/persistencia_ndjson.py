@@ -0,0 +1,535 @@
+import hashlib
+import json
+import os
+import pickle
+from array import array
+from collections import Counter, defaultdict
+from datetime import datetime
+from itertools import chain
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from modelo.Entidades.Equipo import Equipo
+from modelo.Entidades.EstadoTarea import EstadoTarea
+from modelo.Entidades.TareaMantenimiento import TareaMantenimiento, describe_falla
+from modelo.Entidades.Tecnico import Tecnico
+from modelo.Entidades.TipoMantenimiento import TipoMantenimiento
+from modelo.SistemaMantenimiento import SistemaMantenimiento
+from modelo.compresion import EscrituraConResumen, envolver
+from modelo.persistencia import (NOMBRES_DIFERIDOS, ClaveHistorial, HistorialDiferidoBase, PersistenciaJSON,
+                                 dict_a_equipo, dict_a_tarea, dict_a_tecnico, dict_a_ubicacion,
+                                 equipo_a_dict, serializar_fecha, tarea_a_dict, tecnico_a_dict,
+                                 ubicacion_a_dict)
+
+# Orden de las secciones: cada una solo hace referencia a entidades de las anteriores
+SECCIONES = ("ubicaciones", "equipos", "tecnicos", "tareas")
+
+# Versión del formato del índice de posiciones; un índice de otra versión se reconstruye
+VERSION_INDICE = 3
+
+# Bytes de líneas que se juntan antes de cada escritura, para no pasar al compresor
+# una línea por vez
+TAMANO_ESCRITURA = 1 << 16
+
+
+class HistorialDiferido(HistorialDiferidoBase):
+    """
+    Historial de tareas de un archivo NDJSON que aún no se leyó.
+
+    Guarda, por equipo y técnico, las posiciones en el archivo de las líneas de sus
+    tareas, y las lee solo cuando el sistema pide las de un equipo o las de un técnico.
+    Mientras tanto, cada tarea ocupa ocho bytes, y los reportes usan los conteos de cada
+    par (equipo, técnico) anotados en el índice.
+    """
+
+    def __init__(self, persistencia: "PersistenciaNDJSON", posiciones: Dict[ClaveHistorial, array],
+                 resumenes: Dict[ClaveHistorial, Counter], ultimas_preventivas: Dict[str, datetime]):
+        """
+        Inicializador de la clase HistorialDiferido.
+
+        :param persistencia: Persistencia dueña del archivo.
+        :param posiciones: Posiciones de las líneas de tareas, por (ID de equipo, ID de técnico).
+        :param resumenes: Conteos de esas tareas, por (ID de equipo, ID de técnico); ver
+            PersistenciaNDJSON._resumir_tarea.
+        :param ultimas_preventivas: Fecha de la última tarea preventiva, por ID de equipo.
+        """
+        super().__init__(resumenes, ultimas_preventivas)
+        self.persistencia = persistencia
+        self._posiciones = posiciones
+
+    def _leer(self, claves: List[ClaveHistorial], equipos: Dict[str, Equipo],
+              tecnicos: Dict[str, Tecnico]) -> List[TareaMantenimiento]:
+        """
+        Lee, en el orden del archivo, las tareas de los pares (equipo, técnico) indicados.
+        """
+        tareas = []
+        with open(self.persistencia.archivo, 'rb') as f:
+            for posicion in sorted(chain.from_iterable(self._posiciones[clave] for clave in claves)):
+                f.seek(posicion)
+                tarea = dict_a_tarea(json.loads(f.readline()), equipos, tecnicos)
+                if tarea:
+                    tareas.append(tarea)
+        return tareas
+
+    def _descartar(self, clave: ClaveHistorial):
+        """
+        Quita un par de los pendientes, junto con sus posiciones.
+        """
+        super()._descartar(clave)
+        del self._posiciones[clave]
+
+    def lineas(self) -> Iterator[Tuple[ClaveHistorial, bytes]]:
+        """
+        Genera las líneas sin leer tal como están en el archivo, con su par (equipo, técnico).
+        """
+        with open(self.persistencia.archivo, 'rb') as f:
+            for clave, posiciones in self._posiciones.items():
+                for posicion in posiciones:
+                    f.seek(posicion)
+                    yield clave, f.readline()
+
+    def reubicar(self, posiciones: Dict[ClaveHistorial, array]):
+        """
+        Reemplaza las posiciones después de reescribir el archivo.
+
+        :param posiciones: Posiciones nuevas de las mismas tareas, por (ID de equipo, ID de técnico).
+        """
+        self._posiciones = posiciones
+
+
+class PersistenciaNDJSON(PersistenciaJSON):
+    """
+    Persistencia en JSON delimitado por líneas (NDJSON), con una entidad por línea.
+
+    Las entidades se agrupan por sección; cada sección empieza con una línea
+    {"seccion": nombre}. Tanto la carga como el guardado recorren el archivo línea por
+    línea, de modo que la memoria usada no depende del tamaño del archivo sino solo del
+    sistema cargado.
+    """
+
+    def __init__(self, archivo: str = "datos/mantenimiento.ndjson",
+                 archivo_json: Optional[str] = "datos/mantenimiento.json", usar_cache: bool = True,
+                 carga_diferida: bool = False, compresion: Optional[str] = None):
+        """
+        Inicializa la persistencia NDJSON.
+
+        :param archivo: Ruta del archivo NDJSON.
+        :param archivo_json: Archivo en el formato JSON anterior desde el que se migran los
+            datos si el archivo NDJSON aún no existe. None para no migrar.
+        :param usar_cache: Indica si se mantiene la caché binaria del sistema. No se usa
+            con carga diferida, porque la caché contiene el sistema completo.
+        :param carga_diferida: Indica si las tareas completadas y canceladas se dejan en
+            disco al cargar y se leen, por equipo o por técnico, cuando el sistema las necesita.
+        :param compresion: Códec con el que se comprime el archivo, como en PersistenciaJSON.
+            Las líneas se comprimen y descomprimen al vuelo.
+        :raises ValueError: Si el códec no existe, o si se pide junto con la carga diferida,
+            que necesita leer líneas sueltas del archivo.
+        """
+        if carga_diferida and compresion is not None:
+            raise ValueError("La carga diferida necesita un archivo NDJSON sin comprimir")
+        usar_cache = usar_cache and not carga_diferida
+        super().__init__(archivo, usar_cache, compresion=compresion)
+        if usar_cache:
+            # Distinta de la caché del JSON anterior, que puede seguir en la misma carpeta
+            self.archivo_cache = self.archivo.with_name(self.archivo.name + ".cache")
+        self.archivo_json = Path(archivo_json) if archivo_json else None
+        self.carga_diferida = carga_diferida
+        self.archivo_indice = self.archivo.with_name(self.archivo.name + ".indice")
+        self._codificador = json.JSONEncoder(default=serializar_fecha)
+        # Índice de posiciones del último archivo escrito, pendiente de confirmar
+        self._indice_escrito: Optional[Tuple[dict, Dict[ClaveHistorial, array]]] = None
+
+    def _escribir_instantanea(self, sistema: SistemaMantenimiento):
+        """
+        Reescribe el archivo NDJSON completo de forma atómica y actualiza la caché.
+
+        :param sistema: Instancia del sistema de mantenimiento a guardar.
+        """
+        temporal = self.archivo.with_suffix(self.archivo.suffix + ".tmp")
+        with open(temporal, 'wb') as f:
+            escritura = EscrituraConResumen(f)
+            with envolver(escritura, 'wb', self.compresion) as salida:
+                bloque, tamano = [], 0
+                for linea in self._lineas(sistema):
+                    bloque.append(linea)
+                    tamano += len(linea)
+                    if tamano >= TAMANO_ESCRITURA:
+                        salida.write(b"".join(bloque))
+                        bloque, tamano = [], 0
+                salida.write(b"".join(bloque))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, self.archivo)
+        self._guardar_cache(sistema, escritura.resumen.hexdigest())
+
+        if self._indice_escrito is not None:
+            indice, pendientes = self._indice_escrito
+            self._indice_escrito = None
+            diferido = self._historial_de(sistema)
+            if diferido is not None:
+                diferido.reubicar(pendientes)
+            self._guardar_indice(indice)
+
+    def _lineas(self, sistema: SistemaMantenimiento) -> Iterator[bytes]:
+        """
+        Genera las líneas del archivo NDJSON de un sistema, sección por sección.
+
+        Con carga diferida, al final de las tareas se copian sin decodificar las líneas del
+        historial que aún no se leyó, y se arma el índice de posiciones del archivo nuevo.
+
+        :param sistema: Instancia del sistema de mantenimiento.
+        :return: Iterador de líneas codificadas, terminadas en salto de línea.
+        """
+        diferido = self._historial_de(sistema)
+        if diferido is None:
+            # El historial diferido de otro archivo no se puede copiar: se carga
+            sistema.cargar_historial()
+        secciones = {
+            "ubicaciones": (sistema.ubicaciones, ubicacion_a_dict),
+            "equipos": (sistema.equipos, equipo_a_dict),
+            "tecnicos": (sistema.tecnicos, tecnico_a_dict),
+            "tareas": (sistema.tareas, tarea_a_dict),
+        }
+        indice = self._indice_vacio() if self.carga_diferida else None
+        posicion = 0
+        for seccion in SECCIONES:
+            entidades, a_dict = secciones[seccion]
+            linea = self._codificar({"seccion": seccion})
+            if seccion == "tareas" and indice is not None:
+                indice["inicio_tareas"] = posicion
+            yield linea
+            posicion += len(linea)
+            for entidad in entidades:
+                datos = a_dict(entidad)
+                linea = self._codificar(datos)
+                if seccion == "tareas" and indice is not None:
+                    self._anotar_tarea(indice, posicion, datos)
+                yield linea
+                posicion += len(linea)
+
+        if indice is None:
+            return
+        pendientes: Dict[ClaveHistorial, array] = {}
+        if diferido is not None:
+            for clave, linea in diferido.lineas():
+                pendientes.setdefault(clave, array('q')).append(posicion)
+                indice["historial"][clave].append(posicion)
+                yield linea
+                posicion += len(linea)
+            for clave, resumen in diferido.resumenes().items():
+                indice["resumenes"][clave].update(resumen)
+            for equipo_id, fecha in diferido.ultimas_preventivas().items():
+                self._anotar_preventiva(indice, equipo_id, fecha)
+        self._indice_escrito = (indice, pendientes)
+
+    def _codificar(self, datos: dict) -> bytes:
+        """
+        Codifica un registro como una línea NDJSON.
+
+        :param datos: Diccionario a codificar.
+        :return: Línea codificada, terminada en salto de línea.
+        """
+        return (self._codificador.encode(datos) + "\n").encode()
+
+    def cargar(self) -> SistemaMantenimiento:
+        """
+        Carga el sistema desde la caché binaria si sigue siendo válida o, si no, leyendo
+        el archivo NDJSON línea por línea.
+
+        Si el archivo NDJSON no existe y hay un archivo JSON configurado, primero se migra.
+        Con compresión, si el archivo comprimido aún no existe pero sí el NDJSON sin
+        comprimir, se lee este último.
+
+        Con carga diferida solo se construyen las ubicaciones, equipos, técnicos y tareas
+        activas; el resto de las tareas queda registrado en el sistema como historial
+        diferido (ver cargar_diferido).
+
+        :return: Instancia del sistema de mantenimiento con los datos cargados.
+        """
+        if not self.archivo.exists():
+            if self.compresion is not None and self.archivo_sin_comprimir.exists():
+                return PersistenciaNDJSON(str(self.archivo_sin_comprimir), None, usar_cache=False).cargar()
+            if self.archivo_json and self.archivo_json.exists():
+                return self.migrar_desde_json(self.archivo_json)
+            return SistemaMantenimiento()
+        if self.carga_diferida:
+            return self.cargar_diferido()
+
+        sistema = self._cargar_cache(self._hash_archivo)
+        if sistema is not None:
+            return sistema
+
+        resumen = hashlib.blake2b()
+        with open(self.archivo, 'rb') as f, envolver(f, 'rb', self.compresion) as lineas:
+            sistema = self._construir_desde_registros(self._leer_registros(lineas, resumen))
+        # La caché se valida con el hash del archivo en disco, no del contenido descomprimido
+        hash_datos = resumen.hexdigest() if self.compresion is None else self._hash_archivo()
+        self._guardar_cache(sistema, hash_datos)
+        return sistema
+
+    def cargar_diferido(self) -> SistemaMantenimiento:
+        """
+        Carga el sistema dejando en disco las tareas completadas y canceladas.
+
+        Se usa el índice de posiciones guardado junto al archivo si su fecha y tamaño
+        coinciden con los del archivo: entonces solo se leen las secciones de ubicaciones,
+        equipos y técnicos y las líneas de las tareas activas. Si no, el archivo se
+        recorre una vez completo, sin construir las tareas del historial, y el índice se
+        vuelve a escribir.
+
+        :return: Sistema con las tareas activas cargadas y el resto como historial diferido.
+        """
+        indice = self._leer_indice()
+        with open(self.archivo, 'rb') as f:
+            if indice is not None:
+                cabecera = f.read(indice["inicio_tareas"]).splitlines(keepends=True)
+                registros = chain(self._leer_registros(cabecera, hashlib.blake2b()),
+                                  (("tareas", datos) for datos in self._leer_en(f, indice["activas"])))
+                sistema = self._construir_desde_registros(registros)
+            else:
+                indice = self._indice_vacio()
+                sistema = self._construir_desde_registros(self._explorar(f, indice))
+                self._guardar_indice(indice)
+
+        sistema.diferir_historial(HistorialDiferido(self, dict(indice["historial"]), dict(indice["resumenes"]),
+                                                    indice["ultimas_preventivas"]))
+        return sistema
+
+    def migrar_desde_json(self, archivo_json) -> SistemaMantenimiento:
+        """
+        Convierte un archivo en el formato JSON anterior al formato NDJSON.
+
+        :param archivo_json: Ruta del archivo JSON a migrar.
+        :return: Sistema cargado desde el archivo JSON.
+        """
+        sistema = PersistenciaJSON(str(archivo_json), usar_cache=False).cargar()
+        self._escribir_instantanea(sistema)
+        return sistema
+
+    def _leer_registros(self, lineas: Iterable[bytes], resumen) -> Iterator[Tuple[str, dict]]:
+        """
+        Genera los registros de un archivo NDJSON junto con la sección a la que pertenecen.
+
+        Las líneas vacías se ignoran; las que no son JSON válido y las secciones desconocidas
+        se informan y se descartan.
+
+        :param lineas: Líneas del archivo, en bytes.
+        :param resumen: Objeto hashlib que se actualiza con cada línea leída.
+        :return: Iterador de tuplas (sección, datos).
+        """
+        seccion = None
+        for numero, linea in enumerate(lineas, start=1):
+            resumen.update(linea)
+            if not linea.strip():
+                continue
+            try:
+                datos = json.loads(linea)
+            except json.JSONDecodeError as e:
+                print(f"Error en la línea {numero} de {self.archivo}: {str(e)}")
+                continue
+            if "seccion" in datos:
+                seccion = datos["seccion"]
+                if seccion not in SECCIONES:
+                    print(f"Sección desconocida en la línea {numero} de {self.archivo}: {seccion}")
+                    seccion = None
+            elif seccion is not None:
+                yield seccion, datos
+
+    def _explorar(self, f: BinaryIO, indice: dict) -> Iterator[Tuple[str, dict]]:
+        """
+        Genera los registros de un archivo NDJSON salvo las tareas del historial, cuyas
+        posiciones se anotan en el índice.
+
+        :param f: Archivo abierto en modo binario, al comienzo.
+        :param indice: Índice vacío a completar.
+        :return: Iterador de tuplas (sección, datos).
+        """
+        inicio = posicion = 0
+
+        def lineas() -> Iterator[bytes]:
+            nonlocal inicio, posicion
+            for linea in f:
+                inicio, posicion = posicion, posicion + len(linea)
+                yield linea
+
+        # Cada registro se genera inmediatamente después de leer su línea
+        indice["inicio_tareas"] = None
+        for seccion, datos in self._leer_registros(lineas(), hashlib.blake2b()):
+            if seccion != "tareas":
+                yield seccion, datos
+                continue
+            if indice["inicio_tareas"] is None:
+                indice["inicio_tareas"] = inicio
+            if self._anotar_tarea(indice, inicio, datos):
+                yield seccion, datos
+        if indice["inicio_tareas"] is None:
+            indice["inicio_tareas"] = posicion
+
+    def _leer_en(self, f: BinaryIO, posiciones: Iterable[int]) -> Iterator[dict]:
+        """
+        Genera los registros de las líneas que empiezan en las posiciones indicadas.
+
+        :param f: Archivo abierto en modo binario.
+        :param posiciones: Posiciones de las líneas.
+        :return: Iterador de diccionarios.
+        """
+        for posicion in posiciones:
+            f.seek(posicion)
+            yield json.loads(f.readline())
+
+    def _historial_de(self, sistema: SistemaMantenimiento) -> Optional[HistorialDiferido]:
+        """
+        Devuelve el historial diferido del sistema si proviene del archivo de esta persistencia.
+
+        :param sistema: Instancia del sistema de mantenimiento.
+        """
+        diferido = sistema.historial_diferido
+        if isinstance(diferido, HistorialDiferido) and diferido.persistencia is self:
+            return diferido
+        return None
+
+    def _indice_vacio(self) -> dict:
+        """
+        Crea un índice de posiciones vacío.
+
+        :return: Diccionario con las posiciones de las tareas activas, las del historial y
+            sus conteos por (equipo, técnico), la última preventiva del historial por equipo
+            y la posición de la sección de tareas.
+        """
+        return {
+            "activas": array('q'),
+            "historial": defaultdict(lambda: array('q')),
+            "resumenes": defaultdict(Counter),
+            "ultimas_preventivas": {},
+            "inicio_tareas": 0,
+        }
+
+    def _anotar_tarea(self, indice: dict, posicion: int, datos: dict) -> bool:
+        """
+        Registra en el índice la línea de una tarea.
+
+        :param indice: Índice de posiciones.
+        :param posicion: Posición de la línea en el archivo.
+        :param datos: Diccionario de la tarea, leído o a punto de escribirse.
+        :return: True si la tarea está activa y debe cargarse.
+        """
+        if datos.get("estado") not in NOMBRES_DIFERIDOS or "equipo_id" not in datos:
+            # Las tareas activas y las mal formadas se cargan (y se informan) como siempre
+            indice["activas"].append(posicion)
+            return True
+        equipo_id = datos["equipo_id"]
+        clave = (equipo_id, datos.get("tecnico_id"))
+        indice["historial"][clave].append(posicion)
+        indice["resumenes"][clave].update(self._resumir_tarea(datos))
+        if datos.get("tipo") == TipoMantenimiento.PREVENTIVO.name:
+            fecha = datos.get("fecha_programada")
+            try:
+                fecha = datetime.fromisoformat(fecha) if isinstance(fecha, str) else fecha
+            except ValueError:
+                return False
+            if isinstance(fecha, datetime):
+                self._anotar_preventiva(indice, equipo_id, fecha)
+        return False
+
+    def _resumir_tarea(self, datos: dict) -> Counter:
+        """
+        Calcula, sin construir la tarea, lo que aporta a los conteos de los reportes.
+
+        :param datos: Diccionario de la tarea.
+        :return: Counter con las claves tareas, completadas, fallas, suma_duracion y
+            cantidad_duracion, y una clave con el nombre de su tipo de mantenimiento.
+        """
+        completada = datos.get("estado") == EstadoTarea.COMPLETADA.name
+        duracion = datos.get("duracion_minutos") if completada else None
+        correctiva = datos.get("tipo") == TipoMantenimiento.CORRECTIVO.name
+        return Counter({
+            "tareas": 1,
+            "completadas": int(completada),
+            "fallas": int(correctiva and describe_falla(datos.get("observaciones"))),
+            "suma_duracion": duracion or 0,
+            "cantidad_duracion": int(bool(duracion)),
+            datos.get("tipo"): 1,
+        })
+
+    def _anotar_preventiva(self, indice: dict, equipo_id: str, fecha: datetime):
+        """
+        Actualiza la última preventiva del historial de un equipo en el índice.
+
+        :param indice: Índice de posiciones.
+        :param equipo_id: Identificador del equipo.
+        :param fecha: Fecha programada de una tarea preventiva del historial.
+        """
+        ultima = indice["ultimas_preventivas"].get(equipo_id)
+        if ultima is None or fecha > ultima:
+            indice["ultimas_preventivas"][equipo_id] = fecha
+
+    def _leer_indice(self) -> Optional[dict]:
+        """
+        Lee el índice de posiciones si corresponde al archivo actual.
+
+        :return: Índice, o None si no existe, es ilegible o la fecha o el tamaño del
+            archivo cambiaron desde que se escribió.
+        """
+        if not self.archivo_indice.exists():
+            return None
+        try:
+            with open(self.archivo_indice, 'rb') as f:
+                version, mtime, tamano, indice = pickle.load(f)
+        except Exception:
+            return None
+        estado = self.archivo.stat()
+        if (version, mtime, tamano) != (VERSION_INDICE, estado.st_mtime_ns, estado.st_size):
+            return None
+        return indice
+
+    def _guardar_indice(self, indice: dict):
+        """
+        Escribe el índice de posiciones del archivo actual.
+
+        :param indice: Índice de posiciones.
+        """
+        estado = self.archivo.stat()
+        indice["historial"] = dict(indice["historial"])
+        indice["resumenes"] = dict(indice["resumenes"])
+        temporal = self.archivo_indice.with_suffix(self.archivo_indice.suffix + ".tmp")
+        try:
+            with open(temporal, 'wb') as f:
+                pickle.dump((VERSION_INDICE, estado.st_mtime_ns, estado.st_size, indice), f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporal, self.archivo_indice)
+        except OSError as e:
+            # Como la caché, el índice es opcional: sin él la próxima carga recorre el archivo
+            print(f"No se pudo escribir el índice {self.archivo_indice}: {str(e)}")
+
+    def _construir_desde_registros(self, registros: Iterable[Tuple[str, dict]]) -> SistemaMantenimiento:
+        """
+        Construye el sistema consumiendo los registros de uno en uno.
+
+        Solo se conservan indexadas las ubicaciones, equipos y técnicos, necesarios para
+        resolver las referencias de las secciones posteriores.
+
+        :param registros: Iterador de tuplas (sección, datos).
+        :return: Instancia del sistema de mantenimiento con los datos cargados.
+        """
+        sistema = SistemaMantenimiento()
+        ubicaciones, equipos, tecnicos = {}, {}, {}
+
+        for seccion, datos in registros:
+            if seccion == "tareas":
+                tarea = dict_a_tarea(datos, equipos, tecnicos)
+                if tarea:
+                    self._agregar_entidad(sistema.agregar_tarea, tarea, "tarea")
+            elif seccion == "equipos":
+                equipo = dict_a_equipo(datos, ubicaciones)
+                if equipo and self._agregar_entidad(sistema.agregar_equipo, equipo, "equipo"):
+                    equipos[equipo.id] = equipo
+            elif seccion == "tecnicos":
+                tecnico = dict_a_tecnico(datos)
+                if tecnico and self._agregar_entidad(sistema.agregar_tecnico, tecnico, "técnico"):
+                    tecnicos[tecnico.id] = tecnico
+            else:
+                ubicacion = dict_a_ubicacion(datos)
+                if self._agregar_entidad(sistema.agregar_ubicacion, ubicacion, "ubicación"):
+                    ubicaciones[ubicacion.id] = ubicacion
+
+        return sistema
@@ -0,0 +1,353 @@
+import sqlite3
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import AbstractSet, Dict, List, Optional
+
+from modelo.Entidades.Equipo import Equipo
+from modelo.Entidades.EstadoTarea import EstadoTarea
+from modelo.Entidades.TareaMantenimiento import TareaMantenimiento, describe_falla
+from modelo.Entidades.Tecnico import Tecnico
+from modelo.Entidades.TipoMantenimiento import TipoMantenimiento
+from modelo.SistemaMantenimiento import SistemaMantenimiento
+from modelo.persistencia import (NOMBRES_DIFERIDOS, ClaveHistorial, HistorialDiferidoBase, PersistenciaJSON,
+                                 SeguimientoCambios, dict_a_equipo, dict_a_tarea, dict_a_tecnico,
+                                 dict_a_ubicacion, equipo_a_dict, serializar_fecha, tarea_a_dict,
+                                 tecnico_a_dict, ubicacion_a_dict)
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS ubicaciones (
+    id TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    descripcion TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS equipos (
+    id TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    ubicacion_id TEXT NOT NULL,
+    fecha_instalacion TEXT NOT NULL,
+    horas_uso INTEGER NOT NULL DEFAULT 0,
+    horas_mantenimiento INTEGER NOT NULL DEFAULT 100
+);
+CREATE TABLE IF NOT EXISTS tecnicos (
+    id TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    especialidad TEXT NOT NULL,
+    activo INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS tareas (
+    id TEXT PRIMARY KEY,
+    tipo TEXT NOT NULL,
+    equipo_id TEXT NOT NULL,
+    tecnico_id TEXT NOT NULL,
+    fecha_programada TEXT NOT NULL,
+    estado TEXT NOT NULL,
+    observaciones TEXT NOT NULL DEFAULT '',
+    fecha_realizacion TEXT,
+    duracion_minutos INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_equipos_ubicacion ON equipos (ubicacion_id);
+CREATE INDEX IF NOT EXISTS idx_tareas_equipo ON tareas (equipo_id, tipo, fecha_programada);
+CREATE INDEX IF NOT EXISTS idx_tareas_tecnico ON tareas (tecnico_id);
+CREATE INDEX IF NOT EXISTS idx_tareas_estado ON tareas (estado);
+"""
+
+# Columnas de cada tabla, en el orden usado para insertar
+_COLUMNAS = {
+    "ubicaciones": ("id", "nombre", "descripcion"),
+    "equipos": ("id", "nombre", "ubicacion_id", "fecha_instalacion", "horas_uso", "horas_mantenimiento"),
+    "tecnicos": ("id", "nombre", "especialidad", "activo"),
+    "tareas": ("id", "tipo", "equipo_id", "tecnico_id", "fecha_programada", "estado",
+               "observaciones", "fecha_realizacion", "duracion_minutos"),
+}
+
+# Orden de escritura que respeta las referencias entre tablas
+_ORDEN_TABLAS = ("ubicaciones", "equipos", "tecnicos", "tareas")
+
+# Condición y parámetros que seleccionan las tareas del historial diferido
+_DIFERIDAS = f"estado IN ({', '.join('?' for _ in NOMBRES_DIFERIDOS)})"
+_PARAMETROS_DIFERIDAS = tuple(sorted(NOMBRES_DIFERIDOS))
+
+
+class HistorialSQLite(HistorialDiferidoBase):
+    """
+    Historial de tareas de una base de datos SQLite que aún no se leyó.
+
+    Solo guarda en memoria los conteos de cada par (equipo, técnico), calculados con una
+    agregación en SQL al cargar; las tareas de un equipo o de un técnico se consultan en
+    la base de datos cuando el sistema las pide.
+    """
+
+    def __init__(self, persistencia: "PersistenciaSQLite", resumenes: Dict[ClaveHistorial, Counter],
+                 ultimas_preventivas: Dict[str, datetime], activas: AbstractSet[str], ultima_fila: int):
+        """
+        Inicializador de la clase HistorialSQLite.
+
+        :param persistencia: Persistencia dueña de la base de datos.
+        :param resumenes: Conteos de las tareas del historial, por (ID de equipo, ID de técnico).
+        :param ultimas_preventivas: Fecha de la última tarea preventiva, por ID de equipo.
+        :param activas: IDs de las tareas cargadas al abrir la base de datos. Si después
+            se completan y se guardan, ya están en el sistema y no se vuelven a leer.
+        :param ultima_fila: Mayor rowid de la tabla de tareas al cargar; las filas
+            insertadas después tampoco pertenecen al historial.
+        """
+        super().__init__(resumenes, ultimas_preventivas)
+        self.persistencia = persistencia
+        self._activas = activas
+        self._ultima_fila = ultima_fila
+
+    def _leer(self, claves: List[ClaveHistorial], equipos: Dict[str, Equipo],
+              tecnicos: Dict[str, Tecnico]) -> List[TareaMantenimiento]:
+        """
+        Consulta las tareas del historial de los pares (equipo, técnico) indicados.
+        """
+        consulta = (f"SELECT * FROM tareas WHERE equipo_id = ? AND tecnico_id = ? AND {_DIFERIDAS} "
+                    f"AND rowid <= ? ORDER BY rowid")
+        tareas = []
+        for equipo_id, tecnico_id in claves:
+            parametros = (equipo_id, tecnico_id, *_PARAMETROS_DIFERIDAS, self._ultima_fila)
+            for fila in self.persistencia.conexion.execute(consulta, parametros):
+                if fila["id"] in self._activas:
+                    continue
+                tarea = dict_a_tarea(dict(fila), equipos, tecnicos)
+                if tarea:
+                    tareas.append(tarea)
+        return tareas
+
+
+class PersistenciaSQLite(SeguimientoCambios, PersistenciaJSON):
+    """
+    Persistencia del sistema de mantenimiento en una base de datos SQLite.
+
+    Expone el mismo contrato guardar/cargar que PersistenciaJSON. Una vez cargado el
+    sistema, guardar solo inserta, actualiza o elimina las filas modificadas.
+    """
+
+    def __init__(self, archivo: str = "datos/mantenimiento.db",
+                 archivo_json: Optional[str] = "datos/mantenimiento.json", carga_diferida: bool = True):
+        """
+        Inicializa la persistencia SQLite.
+
+        :param archivo: Ruta de la base de datos SQLite.
+        :param archivo_json: Archivo JSON desde el que se migran los datos si la base
+            de datos aún no existe. None para no migrar.
+        :param carga_diferida: Indica si las tareas completadas y canceladas se dejan en la
+            base de datos al cargar y se consultan, por equipo o por técnico, cuando el
+            sistema las necesita.
+        """
+        super().__init__(archivo, usar_cache=False)
+        self.archivo_json = Path(archivo_json) if archivo_json else None
+        self.carga_diferida = carga_diferida
+        self._conexion: Optional[sqlite3.Connection] = None
+
+    @property
+    def conexion(self) -> sqlite3.Connection:
+        """
+        Devuelve la conexión a la base de datos, creándola y preparando el esquema si es necesario.
+        """
+        if self._conexion is None:
+            self._conexion = sqlite3.connect(self.archivo, check_same_thread=False)
+            self._conexion.row_factory = sqlite3.Row
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute("PRAGMA synchronous=NORMAL")
+            self._conexion.executescript(_ESQUEMA)
+            self._conexion.create_function("describe_falla", 1, describe_falla, deterministic=True)
+        return self._conexion
+
+    def cerrar(self):
+        """
+        Cierra la conexión con la base de datos.
+        """
+        if self._conexion is not None:
+            self._conexion.close()
+            self._conexion = None
+
+    def guardar(self, sistema: SistemaMantenimiento):
+        """
+        Guarda los datos del sistema de mantenimiento en la base de datos.
+
+        Si el sistema fue cargado por esta persistencia solo se escriben las filas
+        modificadas; en caso contrario se reescriben todas las tablas.
+
+        :param sistema: Instancia del sistema de mantenimiento a guardar.
+        """
+        if self._sistema is not sistema:
+            self.vincular(sistema)
+            self._guardar_completo(sistema)
+            return
+
+        pendientes = self._tomar_pendientes()
+        if not pendientes:
+            return
+
+        with self.conexion:
+            for (coleccion, entidad_id), (operacion, entidad) in pendientes.items():
+                if operacion == "baja":
+                    self.conexion.execute(f"DELETE FROM {coleccion} WHERE id = ?", (entidad_id,))
+                else:
+                    self._upsert(coleccion, [self._entidad_a_fila(coleccion, entidad)])
+
+    def cargar(self) -> SistemaMantenimiento:
+        """
+        Carga los datos del sistema de mantenimiento desde la base de datos.
+
+        Si la base de datos no existe y hay un archivo JSON configurado, primero se migra.
+        Con carga diferida solo se leen las tareas activas; el resto queda registrado en el
+        sistema como historial diferido (ver HistorialSQLite).
+
+        :return: Instancia del sistema de mantenimiento con los datos cargados.
+        """
+        if not self.archivo.exists() and self.archivo_json and self.archivo_json.exists():
+            self.migrar_desde_json(self.archivo_json)
+
+        sistema = SistemaMantenimiento()
+
+        ubicaciones = {}
+        for fila in self.conexion.execute("SELECT * FROM ubicaciones"):
+            ubicacion = dict_a_ubicacion(dict(fila))
+            ubicaciones[ubicacion.id] = ubicacion
+            sistema.agregar_ubicacion(ubicacion)
+
+        equipos = {}
+        for fila in self.conexion.execute("SELECT * FROM equipos"):
+            equipo = dict_a_equipo(dict(fila), ubicaciones)
+            if equipo:
+                equipos[equipo.id] = equipo
+                sistema.agregar_equipo(equipo)
+
+        tecnicos = {}
+        for fila in self.conexion.execute("SELECT * FROM tecnicos"):
+            datos = dict(fila)
+            datos['activo'] = bool(datos['activo'])
+            tecnico = dict_a_tecnico(datos)
+            if tecnico:
+                tecnicos[tecnico.id] = tecnico
+                sistema.agregar_tecnico(tecnico)
+
+        consulta, parametros = "SELECT * FROM tareas", ()
+        if self.carga_diferida:
+            ultima_fila = self.conexion.execute("SELECT COALESCE(MAX(rowid), 0) FROM tareas").fetchone()[0]
+            consulta, parametros = f"SELECT * FROM tareas WHERE NOT {_DIFERIDAS}", _PARAMETROS_DIFERIDAS
+        # Las filas se leen del cursor una a una, sin materializar toda la tabla
+        for fila in self.conexion.execute(consulta, parametros):
+            tarea = dict_a_tarea(dict(fila), equipos, tecnicos)
+            if tarea:
+                sistema.agregar_tarea(tarea)
+        if self.carga_diferida:
+            activas = frozenset(tarea.id for tarea in sistema.tareas)
+            sistema.diferir_historial(HistorialSQLite(self, self._resumir_historial(), self._ultimas_preventivas(),
+                                                      activas, ultima_fila))
+
+        self._sistema = None
+        self.vincular(sistema)
+        return sistema
+
+    def migrar_desde_json(self, archivo_json) -> SistemaMantenimiento:
+        """
+        Importa en la base de datos el contenido de un archivo JSON de PersistenciaJSON.
+
+        :param archivo_json: Ruta del archivo JSON a migrar.
+        :return: Sistema cargado desde el archivo JSON.
+        """
+        sistema = PersistenciaJSON(str(archivo_json), usar_cache=False).cargar()
+        self._guardar_completo(sistema)
+        return sistema
+
+    def _resumir_historial(self) -> Dict[ClaveHistorial, Counter]:
+        """
+        Cuenta las tareas del historial de cada par (equipo, técnico) con una agregación
+        en SQL, sin leerlas.
+
+        :return: Conteos por (ID de equipo, ID de técnico), como los de HistorialDiferidoBase.
+        """
+        filas = self.conexion.execute(
+            "SELECT equipo_id, tecnico_id, tipo, COUNT(*), "
+            "SUM(estado = ?), "
+            "SUM(tipo = ? AND describe_falla(observaciones)), "
+            "SUM(CASE WHEN estado = ? THEN COALESCE(duracion_minutos, 0) ELSE 0 END), "
+            "SUM(estado = ? AND COALESCE(duracion_minutos, 0) != 0) "
+            f"FROM tareas WHERE {_DIFERIDAS} GROUP BY equipo_id, tecnico_id, tipo",
+            (EstadoTarea.COMPLETADA.name, TipoMantenimiento.CORRECTIVO.name, EstadoTarea.COMPLETADA.name,
+             EstadoTarea.COMPLETADA.name, *_PARAMETROS_DIFERIDAS))
+        resumenes: Dict[ClaveHistorial, Counter] = {}
+        for equipo_id, tecnico_id, tipo, tareas, completadas, fallas, suma, cantidad in filas:
+            resumenes.setdefault((equipo_id, tecnico_id), Counter()).update({
+                "tareas": tareas, "completadas": completadas, "fallas": fallas,
+                "suma_duracion": suma, "cantidad_duracion": cantidad, tipo: tareas})
+        return resumenes
+
+    def _ultimas_preventivas(self) -> Dict[str, datetime]:
+        """
+        Obtiene la fecha de la última tarea preventiva del historial de cada equipo.
+
+        :return: Diccionario con el ID de equipo como clave y la fecha como valor.
+        """
+        filas = self.conexion.execute(
+            f"SELECT equipo_id, MAX(fecha_programada) FROM tareas WHERE {_DIFERIDAS} AND tipo = ? "
+            "GROUP BY equipo_id", (*_PARAMETROS_DIFERIDAS, TipoMantenimiento.PREVENTIVO.name))
+        return {equipo_id: datetime.fromisoformat(fecha) for equipo_id, fecha in filas}
+
+    def _guardar_completo(self, sistema: SistemaMantenimiento):
+        """
+        Reemplaza el contenido de todas las tablas con los datos del sistema.
+
+        :param sistema: Instancia del sistema de mantenimiento a guardar.
+        """
+        # Un historial diferido se carga para no perder sus tareas al reemplazar las tablas
+        sistema.cargar_historial()
+        colecciones = {
+            "ubicaciones": sistema.ubicaciones,
+            "equipos": sistema.equipos,
+            "tecnicos": sistema.tecnicos,
+            "tareas": sistema.tareas,
+        }
+        with self.conexion:
+            for coleccion in reversed(_ORDEN_TABLAS):
+                self.conexion.execute(f"DELETE FROM {coleccion}")
+            for coleccion in _ORDEN_TABLAS:
+                self._upsert(coleccion, (self._entidad_a_fila(coleccion, e) for e in colecciones[coleccion]))
+
+    def _upsert(self, coleccion: str, filas):
+        """
+        Inserta filas en una tabla o actualiza las existentes con el mismo ID.
+
+        :param coleccion: Nombre de la tabla.
+        :param filas: Iterable de tuplas en el orden de _COLUMNAS.
+        """
+        columnas = _COLUMNAS[coleccion]
+        marcadores = ", ".join("?" for _ in columnas)
+        asignaciones = ", ".join(f"{c} = excluded.{c}" for c in columnas[1:])
+        self.conexion.executemany(
+            f"INSERT INTO {coleccion} ({', '.join(columnas)}) VALUES ({marcadores}) "
+            f"ON CONFLICT(id) DO UPDATE SET {asignaciones}",
+            filas
+        )
+
+    def _entidad_a_fila(self, coleccion: str, entidad) -> tuple:
+        """
+        Convierte una entidad en una tupla de valores para su tabla.
+
+        :param coleccion: Nombre de la tabla.
+        :param entidad: Entidad a convertir.
+        :return: Tupla de valores en el orden de _COLUMNAS.
+        """
+        if coleccion == "equipos":
+            datos = equipo_a_dict(entidad)
+        elif coleccion == "tecnicos":
+            datos = tecnico_a_dict(entidad)
+        elif coleccion == "tareas":
+            datos = tarea_a_dict(entidad)
+        else:
+            datos = ubicacion_a_dict(entidad)
+        return tuple(self._valor_sql(datos.get(columna)) for columna in _COLUMNAS[coleccion])
+
+    def _valor_sql(self, valor):
+        """
+        Adapta un valor de Python a un tipo admitido por SQLite.
+
+        :param valor: Valor a adaptar.
+        :return: Valor listo para usarse como parámetro.
+        """
+        if valor is None or isinstance(valor, (str, int, float)):
+            return valor
+        return serializar_fecha(valor)
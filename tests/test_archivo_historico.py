@@ -0,0 +1,94 @@
+from datetime import datetime
+
+import pytest
+
+from control.archivo_historico import ArchivoHistorico
+from modelo.Entidades.Equipo import Equipo
+from modelo.Entidades.EstadoTarea import EstadoTarea
+from modelo.Entidades.TareaMantenimiento import TareaMantenimiento
+from modelo.Entidades.Tecnico import Tecnico
+from modelo.Entidades.TipoMantenimiento import TipoMantenimiento
+from modelo.Entidades.Ubicacion import Ubicacion
+from modelo.SistemaMantenimiento import SistemaMantenimiento
+
+CORTE = datetime(2023, 1, 1)
+
+
+def crear_tareas(sistema):
+    """
+    Crea en el sistema dos tareas terminadas antiguas y una pendiente.
+    """
+    equipo = sistema.obtener_equipo("E1")
+    sistema.agregar_tarea(TareaMantenimiento("A1", TipoMantenimiento.PREVENTIVO, equipo, datetime(2022, 1, 10),
+                                             sistema.obtener_tecnico("T1"), EstadoTarea.COMPLETADA))
+    sistema.agregar_tarea(TareaMantenimiento("A2", TipoMantenimiento.CORRECTIVO, equipo, datetime(2022, 1, 20),
+                                             sistema.obtener_tecnico("T2"), EstadoTarea.CANCELADA))
+    sistema.agregar_tarea(TareaMantenimiento("A3", TipoMantenimiento.PREVENTIVO, equipo, datetime(2022, 2, 1),
+                                             sistema.obtener_tecnico("T1")))
+
+
+@pytest.fixture
+def sistema():
+    sistema = SistemaMantenimiento()
+    ubicacion = Ubicacion("U1", "Planta")
+    sistema.agregar_ubicacion(ubicacion)
+    sistema.agregar_equipo(Equipo("E1", "Torno", ubicacion, datetime(2020, 1, 1)))
+    sistema.agregar_equipo(Equipo("E2", "Fresa", ubicacion, datetime(2020, 1, 1)))
+    sistema.agregar_tecnico(Tecnico("T1", "Ana", "Mecánica"))
+    sistema.agregar_tecnico(Tecnico("T2", "Bea", "Mecánica"))
+    sistema.agregar_tecnico(Tecnico("T3", "Carla", "Mecánica"))
+    crear_tareas(sistema)
+    return sistema
+
+
+def test_archivar_mueve_las_tareas_terminadas_y_guarda(sistema, tmp_path):
+    guardados = []
+    archivo = ArchivoHistorico(str(tmp_path))
+
+    assert archivo.archivar(sistema, CORTE, guardar=lambda: guardados.append(True)) == 2
+
+    assert [t.id for t in sistema.tareas] == ["A3"]
+    assert guardados == [True]
+    assert archivo.cantidad() == 2
+    assert [t.id for t in ArchivoHistorico(str(tmp_path)).tareas_archivadas(sistema, "2022-01")] == ["A1", "A2"]
+
+
+def test_equipos_y_tecnicos_con_tareas_archivadas_quedan_referenciados(sistema, tmp_path):
+    archivo = ArchivoHistorico(str(tmp_path))
+    archivo.archivar(sistema, CORTE)
+
+    reabierto = ArchivoHistorico(str(tmp_path))
+    assert reabierto.equipo_tiene_tareas("E1")
+    assert not reabierto.equipo_tiene_tareas("E2")
+    # La tarea cancelada también cuenta, aunque no sume al técnico en los reportes
+    assert reabierto.tecnico_tiene_tareas("T2")
+    assert not reabierto.tecnico_tiene_tareas("T3")
+
+
+def test_un_archivado_interrumpido_no_duplica_tareas(sistema, tmp_path):
+    archivo = ArchivoHistorico(str(tmp_path))
+    archivo.archivar(sistema, CORTE)
+
+    # Los datos guardados no llegaron a reflejar las eliminaciones: las tareas vuelven
+    recuperado = SistemaMantenimiento()
+    for ubicacion in sistema.ubicaciones:
+        recuperado.agregar_ubicacion(ubicacion)
+    for equipo in sistema.equipos:
+        recuperado.agregar_equipo(equipo)
+    for tecnico in sistema.tecnicos:
+        recuperado.agregar_tecnico(tecnico)
+    crear_tareas(recuperado)
+    segmentos = sorted(p.name for p in tmp_path.glob("*.ndjson"))
+
+    reabierto = ArchivoHistorico(str(tmp_path))
+    assert reabierto.archivar(recuperado, CORTE) == 2
+
+    assert [t.id for t in recuperado.tareas] == ["A3"]
+    assert sorted(p.name for p in tmp_path.glob("*.ndjson")) == segmentos
+    assert reabierto.cantidad() == 2
+    assert [t.id for t in reabierto.tareas_archivadas(recuperado, "2022-01")] == ["A1", "A2"]
+
+
+def test_la_fecha_de_corte_no_puede_ser_reciente(sistema, tmp_path):
+    with pytest.raises(ValueError):
+        ArchivoHistorico(str(tmp_path)).archivar(sistema, datetime.now())
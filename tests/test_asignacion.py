@@ -0,0 +1,75 @@
+from datetime import datetime
+
+import pytest
+
+from control.gestor_mantenimiento import GestorMantenimiento
+from modelo.Entidades.Equipo import Equipo
+from modelo.Entidades.TareaMantenimiento import TareaMantenimiento
+from modelo.Entidades.Tecnico import Tecnico
+from modelo.Entidades.TipoMantenimiento import TipoMantenimiento
+from modelo.Entidades.Ubicacion import Ubicacion
+from modelo.SistemaMantenimiento import SistemaMantenimiento
+
+DIA = datetime(2024, 3, 4)
+
+
+@pytest.fixture
+def sistema():
+    """
+    Tres técnicos de la misma especialidad: Ana con mucha carga, Bea libre a las 10 y
+    Carla, la menos cargada, ocupada a las 10.
+    """
+    sistema = SistemaMantenimiento()
+    ubicacion = Ubicacion("U1", "Planta")
+    sistema.agregar_ubicacion(ubicacion)
+    sistema.agregar_equipo(Equipo("E1", "Torno", ubicacion, datetime(2020, 1, 1)))
+    for tecnico_id, nombre in (("T1", "Ana"), ("T2", "Bea"), ("T3", "Carla")):
+        sistema.agregar_tecnico(Tecnico(tecnico_id, nombre, "Mecánica"))
+    agregar(sistema, "A1", "T1", DIA.replace(hour=16), 300)
+    agregar(sistema, "A2", "T2", DIA.replace(hour=13), 120)
+    agregar(sistema, "A3", "T3", DIA.replace(hour=10), 30)
+    return sistema
+
+
+def agregar(sistema, tarea_id, tecnico_id, fecha, minutos=None):
+    tarea = TareaMantenimiento(tarea_id, TipoMantenimiento.PREVENTIVO, sistema.obtener_equipo("E1"), fecha,
+                               sistema.obtener_tecnico(tecnico_id), duracion_minutos=minutos)
+    sistema.agregar_tarea(tarea)
+    return tarea
+
+
+def test_se_saltea_al_tecnico_menos_cargado_si_esta_ocupado(sistema):
+    gestor = GestorMantenimiento(sistema)
+    agregar(sistema, "X", "T1", DIA.replace(hour=10))
+
+    asignadas, sin_tecnico = gestor.asignar_tecnicos(["X"])
+
+    assert [(t.id, tecnico.id) for t, tecnico in asignadas] == [("X", "T2")]
+    assert sin_tecnico == []
+    assert not gestor.calendario.esta_libre("T2", DIA.replace(hour=10), 60)
+
+
+def test_las_tareas_del_lote_ocupan_la_agenda_de_su_nuevo_tecnico(sistema):
+    gestor = GestorMantenimiento(sistema)
+    sistema.obtener_tarea("A3").fecha_programada = DIA.replace(hour=18)
+    agregar(sistema, "X", "T1", DIA.replace(hour=10))
+    agregar(sistema, "Y", "T1", DIA.replace(hour=10, minute=30))
+
+    asignadas, _ = gestor.asignar_tecnicos(["X", "Y"])
+
+    # X va a Carla, la menos cargada; Y se superpone con X en su agenda y va a Bea, aunque
+    # Carla siga teniendo menos carga
+    assert sorted((t.id, tecnico.id) for t, tecnico in asignadas) == [("X", "T3"), ("Y", "T2")]
+
+
+def test_sin_tecnicos_libres_la_tarea_conserva_su_tecnico(sistema):
+    gestor = GestorMantenimiento(sistema)
+    sistema.obtener_tecnico("T1").activo = False
+    agregar(sistema, "B2", "T2", DIA.replace(hour=10), 30)
+    x = agregar(sistema, "X", "T1", DIA.replace(hour=10))
+
+    asignadas, sin_tecnico = gestor.asignar_tecnicos(["X"])
+
+    assert asignadas == []
+    assert sin_tecnico == [x]
+    assert x.tecnico_asignado.id == "T1"
@@ -0,0 +1,109 @@
+from datetime import datetime, time
+
+import pytest
+
+from control.calendario import CalendarioTecnicos
+from control.gestor_mantenimiento import GestorMantenimiento
+from modelo.Entidades.Equipo import Equipo
+from modelo.Entidades.EstadoTarea import EstadoTarea
+from modelo.Entidades.TareaMantenimiento import TareaMantenimiento
+from modelo.Entidades.Tecnico import Tecnico
+from modelo.Entidades.TipoMantenimiento import TipoMantenimiento
+from modelo.Entidades.Ubicacion import Ubicacion
+from modelo.SistemaMantenimiento import SistemaMantenimiento
+
+DIA = datetime(2024, 3, 4)
+
+
+@pytest.fixture
+def sistema():
+    sistema = SistemaMantenimiento()
+    ubicacion = Ubicacion("U1", "Planta")
+    sistema.agregar_ubicacion(ubicacion)
+    sistema.agregar_equipo(Equipo("E1", "Torno", ubicacion, datetime(2020, 1, 1)))
+    sistema.agregar_equipo(Equipo("E2", "Fresa", ubicacion, datetime(2020, 1, 1)))
+    sistema.agregar_tecnico(Tecnico("T1", "Ana", "Mecánica"))
+    return sistema
+
+
+def agregar(sistema, tarea_id, fecha, minutos=None):
+    tarea = TareaMantenimiento(tarea_id, TipoMantenimiento.PREVENTIVO, sistema.obtener_equipo("E1"), fecha,
+                               sistema.obtener_tecnico("T1"), duracion_minutos=minutos)
+    sistema.agregar_tarea(tarea)
+    return tarea
+
+
+def test_detecta_superposiciones_con_tareas_abiertas(sistema):
+    calendario = CalendarioTecnicos(sistema)
+    agregar(sistema, "A1", DIA.replace(hour=10), 60)
+
+    assert not calendario.esta_libre("T1", DIA.replace(hour=10, minute=30), 60)
+    assert not calendario.esta_libre("T1", DIA.replace(hour=9, minute=30), 60)
+    # Los extremos se tocan pero no se superponen
+    assert calendario.esta_libre("T1", DIA.replace(hour=9), 60)
+    assert calendario.esta_libre("T1", DIA.replace(hour=11), 60)
+    assert calendario.esta_libre("T2", DIA.replace(hour=10), 60)
+
+
+def test_las_tareas_terminadas_liberan_su_horario(sistema):
+    calendario = CalendarioTecnicos(sistema)
+    tarea = agregar(sistema, "A1", DIA.replace(hour=10), 60)
+
+    tarea.estado = EstadoTarea.COMPLETADA
+    assert calendario.esta_libre("T1", DIA.replace(hour=10), 60)
+    tarea.estado = EstadoTarea.PENDIENTE
+    sistema.eliminar_tarea("A1")
+    assert calendario.esta_libre("T1", DIA.replace(hour=10), 60)
+
+
+def test_el_siguiente_horario_libre_salta_los_bloques_ocupados(sistema):
+    calendario = CalendarioTecnicos(sistema)
+    agregar(sistema, "A1", DIA.replace(hour=10), 60)
+    agregar(sistema, "A2", DIA.replace(hour=10, minute=30), 90)
+    agregar(sistema, "A3", DIA.replace(hour=13), 60)
+
+    assert calendario.siguiente_libre("T1", DIA.replace(hour=10), 30) == DIA.replace(hour=12)
+    assert calendario.siguiente_libre("T1", DIA.replace(hour=10), 90) == DIA.replace(hour=14)
+    assert calendario.siguiente_libre("T1", DIA.replace(hour=9), 60) == DIA.replace(hour=9)
+
+
+def test_la_busqueda_en_jornada_no_cae_de_noche(sistema):
+    calendario = CalendarioTecnicos(sistema)
+    agregar(sistema, "A1", DIA.replace(hour=8), 420)
+
+    assert calendario.siguiente_libre("T1", DIA, 60) == DIA
+    assert calendario.siguiente_libre("T1", DIA, 60, en_jornada=True) == DIA.replace(hour=15)
+    siguiente_dia = DIA.replace(day=5, hour=8)
+    assert calendario.siguiente_libre("T1", DIA, 90, en_jornada=True) == siguiente_dia
+    # Una tarea más larga que la jornada empieza al inicio de una
+    assert calendario.siguiente_libre("T1", DIA, 600, en_jornada=True) == siguiente_dia
+
+
+def test_la_jornada_debe_terminar_despues_de_empezar(sistema):
+    with pytest.raises(ValueError):
+        CalendarioTecnicos(sistema, inicio_jornada=time(18), fin_jornada=time(8))
+
+
+def test_planificar_con_ajuste_reparte_las_tareas_en_la_jornada(sistema):
+    gestor = GestorMantenimiento(sistema)
+
+    primera = gestor.planificar_mantenimiento_preventivo("E1", "T1", DIA, ajustar_horario=True)
+    segunda = gestor.planificar_mantenimiento_preventivo("E2", "T1", DIA, ajustar_horario=True)
+
+    assert primera.fecha_programada == DIA.replace(hour=8)
+    assert segunda.fecha_programada == DIA.replace(hour=9)
+    with pytest.raises(ValueError):
+        gestor.planificar_mantenimiento_preventivo("E2", "T1", DIA.replace(hour=8, minute=30))
+
+
+def test_un_lote_que_no_cabe_sigue_al_dia_siguiente(sistema):
+    gestor = GestorMantenimiento(sistema)
+    for numero in range(3, 12):
+        sistema.agregar_equipo(Equipo(f"E{numero}", f"Prensa {numero}", sistema.obtener_ubicacion("U1"),
+                                      datetime(2020, 1, 1)))
+
+    tareas = gestor.planificar_mantenimiento_preventivo_masivo("T1", DIA)
+
+    fechas = [tarea.fecha_programada for tarea in tareas]
+    assert fechas[:8] == [DIA.replace(hour=hora) for hora in range(8, 16)]
+    assert fechas[8:] == [DIA.replace(day=5, hour=hora) for hora in range(8, 11)]
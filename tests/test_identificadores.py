@@ -0,0 +1,80 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from modelo import identificadores
+from modelo.identificadores import LARGO, GeneradorIds, fecha_de_id, generador_ids, id_minimo, nuevo_id
+
+
+@pytest.fixture
+def reloj_fijo(monkeypatch):
+    """
+    Detiene el reloj en un mismo milisegundo.
+    """
+    ns = 1_700_000_000_123 * 1_000_000
+    monkeypatch.setattr(identificadores.time, "time_ns", lambda: ns)
+    return datetime.fromtimestamp(ns / 1e9)
+
+
+def test_los_ids_son_unicos_y_crecientes():
+    generador = GeneradorIds()
+    ids = [generador.nuevo("TAR") for _ in range(5000)] + generador.lote(5000, "TAR")
+
+    assert len(set(ids)) == len(ids)
+    assert ids == sorted(ids)
+    assert all(id.startswith("TAR-") and len(id) == LARGO + 4 for id in ids)
+
+
+def test_dentro_de_un_milisegundo_la_parte_aleatoria_se_incrementa(reloj_fijo):
+    generador = GeneradorIds()
+    primero, segundo = generador.nuevo(), generador.nuevo()
+    lote = generador.lote(3)
+
+    assert primero < segundo < lote[0] < lote[1] < lote[2]
+    # Misma marca de tiempo: solo cambia la parte aleatoria
+    assert len({id[:10] for id in (primero, segundo, *lote)}) == 1
+    assert fecha_de_id(primero) == reloj_fijo.replace(microsecond=123000)
+
+
+def test_un_reloj_que_retrocede_no_rompe_el_orden(monkeypatch):
+    generador = GeneradorIds()
+    monkeypatch.setattr(identificadores.time, "time_ns", lambda: 2_000_000_000_000 * 1_000_000)
+    antes = generador.nuevo()
+    monkeypatch.setattr(identificadores.time, "time_ns", lambda: 1_000_000_000_000 * 1_000_000)
+
+    assert generador.nuevo() > antes
+
+
+def test_id_minimo_acota_los_ids_por_fecha():
+    fecha = datetime.now().replace(microsecond=0)
+    creado = nuevo_id("EQ")
+
+    assert id_minimo(fecha, "EQ") <= creado < id_minimo(fecha + timedelta(seconds=2), "EQ")
+    with pytest.raises(ValueError):
+        fecha_de_id("EQ-no-es-un-id")
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requiere os.fork")
+def test_el_proceso_hijo_no_continua_la_serie_del_padre(monkeypatch):
+    ultimo = generador_ids.nuevo()
+    # Padre e hijo generan en el mismo milisegundo que el último ID del padre
+    ms = generador_ids._ultimo_ms
+    monkeypatch.setattr(identificadores.time, "time_ns", lambda: ms * 1_000_000)
+    lectura, escritura = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.write(escritura, generador_ids.nuevo().encode())
+        finally:
+            os._exit(0)
+    os.close(escritura)
+    with os.fdopen(lectura) as f:
+        del_hijo = f.read()
+    os.waitpid(pid, 0)
+    del_padre = generador_ids.nuevo()
+
+    # El padre sigue su serie; el hijo empezó una nueva en el mismo milisegundo
+    assert del_padre > ultimo
+    assert del_hijo[:10] == del_padre[:10]
+    assert del_hijo != del_padre
@@ -0,0 +1,137 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from modelo.Entidades.Equipo import Equipo
+from modelo.Entidades.EstadoTarea import EstadoTarea
+from modelo.Entidades.TareaMantenimiento import TareaMantenimiento
+from modelo.Entidades.Tecnico import Tecnico
+from modelo.Entidades.TipoMantenimiento import TipoMantenimiento
+from modelo.Entidades.Ubicacion import Ubicacion
+from modelo.SistemaMantenimiento import SistemaMantenimiento
+from modelo.persistencia_bitacora import PersistenciaBitacora
+
+
+@pytest.fixture
+def archivo(tmp_path):
+    """
+    Guarda un sistema con una entidad de cada colección y devuelve la ruta de la instantánea.
+    """
+    sistema = SistemaMantenimiento()
+    ubicacion = Ubicacion("U1", "Planta", "Nave principal")
+    equipo = Equipo("E1", "Torno", ubicacion, datetime(2020, 1, 1))
+    tecnico = Tecnico("T1", "Ana", "Mecánica")
+    sistema.agregar_ubicacion(ubicacion)
+    sistema.agregar_equipo(equipo)
+    sistema.agregar_tecnico(tecnico)
+    sistema.agregar_tarea(TareaMantenimiento("A1", TipoMantenimiento.PREVENTIVO, equipo,
+                                             datetime(2026, 1, 1), tecnico))
+    ruta = tmp_path / "mantenimiento.json"
+    PersistenciaBitacora(str(ruta)).guardar(sistema)
+    return ruta
+
+
+def test_cambios_de_entidades_existentes_sobreviven_a_la_recarga(archivo):
+    persistencia = PersistenciaBitacora(str(archivo))
+    sistema = persistencia.cargar()
+    tecnico = sistema.obtener_tecnico("T1")
+    tecnico.nombre = "Ana María"
+    tecnico.especialidad = "Electricidad"
+    tecnico.activo = False
+    ubicacion = sistema.obtener_ubicacion("U1")
+    ubicacion.nombre = "Planta 2"
+    ubicacion.descripcion = "Nave norte"
+    equipo = sistema.obtener_equipo("E1")
+    equipo.nombre = "Torno CNC"
+    equipo.horas_uso = 40
+    tarea = sistema.obtener_tarea("A1")
+    tarea.observaciones = "Cambio de filtro"
+    tarea.duracion_minutos = 90
+    tarea.fecha_realizacion = datetime(2026, 1, 2, 10, 30)
+    persistencia.guardar(sistema)
+
+    recargado = PersistenciaBitacora(str(archivo)).cargar()
+    tecnico = recargado.obtener_tecnico("T1")
+    assert (tecnico.nombre, tecnico.especialidad, tecnico.activo) == ("Ana María", "Electricidad", False)
+    ubicacion = recargado.obtener_ubicacion("U1")
+    assert (ubicacion.nombre, ubicacion.descripcion) == ("Planta 2", "Nave norte")
+    equipo = recargado.obtener_equipo("E1")
+    assert (equipo.nombre, equipo.horas_uso) == ("Torno CNC", 40)
+    tarea = recargado.obtener_tarea("A1")
+    assert tarea.observaciones == "Cambio de filtro"
+    assert tarea.duracion_minutos == 90
+    assert tarea.fecha_realizacion == datetime(2026, 1, 2, 10, 30)
+
+
+def test_los_cambios_se_anexan_a_la_bitacora_sin_reescribir_la_instantanea(archivo):
+    persistencia = PersistenciaBitacora(str(archivo))
+    sistema = persistencia.cargar()
+    instantanea = archivo.read_bytes()
+
+    sistema.obtener_tecnico("T1").especialidad = "Hidráulica"
+    persistencia.guardar(sistema)
+
+    assert archivo.read_bytes() == instantanea
+    lineas = persistencia.archivo_bitacora.read_text().splitlines()
+    assert len(lineas) == 1
+    registro = json.loads(lineas[0])
+    assert registro["coleccion"] == "tecnicos"
+    assert registro["datos"]["especialidad"] == "Hidráulica"
+
+
+def test_una_tarea_puede_referenciar_un_tecnico_dado_de_alta_despues(archivo):
+    persistencia = PersistenciaBitacora(str(archivo))
+    sistema = persistencia.cargar()
+    tarea = sistema.obtener_tarea("A1")
+    tarea.estado = EstadoTarea.EN_PROCESO
+    sistema.agregar_tecnico(Tecnico("T2", "Bea", "Electricidad"))
+    tarea.tecnico_asignado = sistema.obtener_tecnico("T2")
+    persistencia.guardar(sistema)
+
+    tarea = PersistenciaBitacora(str(archivo)).cargar().obtener_tarea("A1")
+    assert tarea.estado == EstadoTarea.EN_PROCESO
+    assert tarea.tecnico_asignado.id == "T2"
+
+
+def test_las_bajas_se_reaplican_despues_de_las_altas(archivo):
+    persistencia = PersistenciaBitacora(str(archivo))
+    sistema = persistencia.cargar()
+    nueva = Ubicacion("U2", "Depósito")
+    sistema.agregar_ubicacion(nueva)
+    sistema.obtener_equipo("E1").ubicacion = nueva
+    sistema.eliminar_ubicacion("U1")
+    persistencia.guardar(sistema)
+
+    recargado = PersistenciaBitacora(str(archivo)).cargar()
+    assert [u.id for u in recargado.ubicaciones] == ["U2"]
+    assert recargado.obtener_equipo("E1").ubicacion.id == "U2"
+
+
+def test_compactar_vacia_la_bitacora_y_conserva_los_datos(archivo):
+    persistencia = PersistenciaBitacora(str(archivo), umbral_compactacion=2)
+    sistema = persistencia.cargar()
+    sistema.obtener_equipo("E1").nombre = "Fresadora"
+    persistencia.guardar(sistema)
+    assert persistencia.archivo_bitacora.read_text() != ""
+
+    sistema.obtener_tecnico("T1").nombre = "Ana María"
+    persistencia.guardar(sistema)
+    assert persistencia.archivo_bitacora.read_text() == ""
+
+    recargado = PersistenciaBitacora(str(archivo)).cargar()
+    assert recargado.obtener_equipo("E1").nombre == "Fresadora"
+    assert recargado.obtener_tecnico("T1").nombre == "Ana María"
+
+
+def test_una_ultima_linea_incompleta_se_descarta(archivo):
+    persistencia = PersistenciaBitacora(str(archivo))
+    sistema = persistencia.cargar()
+    sistema.obtener_equipo("E1").nombre = "Fresadora"
+    persistencia.guardar(sistema)
+    with open(persistencia.archivo_bitacora, "a") as f:
+        f.write('{"op": "upsert", "coleccion": "equi')
+
+    recargado = PersistenciaBitacora(str(archivo)).cargar()
+    assert recargado.obtener_equipo("E1").nombre == "Fresadora"
+    assert persistencia.archivo_bitacora.read_text().endswith("}\n")
@@ -0,0 +1,92 @@
+from datetime import datetime
+
+import pytest
+
+from modelo.Entidades.Equipo import Equipo
+from modelo.Entidades.EstadoTarea import EstadoTarea
+from modelo.Entidades.TareaMantenimiento import TareaMantenimiento
+from modelo.Entidades.Tecnico import Tecnico
+from modelo.Entidades.TipoMantenimiento import TipoMantenimiento
+from modelo.Entidades.Ubicacion import Ubicacion
+from modelo.SistemaMantenimiento import SistemaMantenimiento
+from modelo.persistencia_ndjson import PersistenciaNDJSON
+
+
+@pytest.fixture
+def archivo(tmp_path):
+    """
+    Guarda un sistema con dos equipos y dos técnicos, tres tareas terminadas y una pendiente.
+    """
+    sistema = SistemaMantenimiento()
+    ubicacion = Ubicacion("U1", "Planta")
+    sistema.agregar_ubicacion(ubicacion)
+    torno = Equipo("E1", "Torno", ubicacion, datetime(2020, 1, 1))
+    fresa = Equipo("E2", "Fresa", ubicacion, datetime(2020, 1, 1))
+    sistema.agregar_equipo(torno)
+    sistema.agregar_equipo(fresa)
+    ana, bea = Tecnico("T1", "Ana", "Mecánica"), Tecnico("T2", "Bea", "Mecánica")
+    sistema.agregar_tecnico(ana)
+    sistema.agregar_tecnico(bea)
+    sistema.agregar_tarea(TareaMantenimiento("A1", TipoMantenimiento.PREVENTIVO, torno, datetime(2022, 1, 10),
+                                             ana, EstadoTarea.COMPLETADA))
+    sistema.agregar_tarea(TareaMantenimiento("A2", TipoMantenimiento.CORRECTIVO, torno, datetime(2022, 1, 20),
+                                             bea, EstadoTarea.CANCELADA))
+    sistema.agregar_tarea(TareaMantenimiento("A3", TipoMantenimiento.CORRECTIVO, fresa, datetime(2022, 2, 1),
+                                             ana, EstadoTarea.COMPLETADA))
+    sistema.agregar_tarea(TareaMantenimiento("A4", TipoMantenimiento.PREVENTIVO, fresa, datetime(2022, 3, 1), bea))
+
+    ruta = str(tmp_path / "mantenimiento.ndjson")
+    PersistenciaNDJSON(ruta, None, carga_diferida=True).guardar(sistema)
+    return ruta
+
+
+def ids(tareas):
+    return sorted(tarea.id for tarea in tareas)
+
+
+def test_la_carga_diferida_solo_construye_las_tareas_activas(archivo):
+    sistema = PersistenciaNDJSON(archivo, None, carga_diferida=True).cargar()
+
+    assert ids(sistema.tareas) == ["A4"]
+    assert sistema.historial_diferido.cantidad() == 3
+    assert set(sistema.historial_pendiente()) == {"E1", "E2"}
+    assert sistema.equipo_tiene_tareas("E1")
+    assert sistema.tecnico_tiene_tareas("T1")
+
+
+def test_las_tareas_de_un_equipo_se_leen_por_su_posicion(archivo):
+    sistema = PersistenciaNDJSON(archivo, None, carga_diferida=True).cargar()
+
+    assert ids(sistema.tareas_por_equipo("E1")) == ["A1", "A2"]
+    assert ids(sistema.tareas) == ["A1", "A2", "A4"]
+    assert set(sistema.historial_pendiente()) == {"E2"}
+    # Ana todavía tiene pendiente la tarea de la fresa; Bea ya no tiene nada sin leer
+    assert set(sistema.historial_diferido.tecnicos()) == {"T1"}
+
+
+def test_las_tareas_de_un_tecnico_se_leen_sin_cargar_el_resto(archivo):
+    sistema = PersistenciaNDJSON(archivo, None, carga_diferida=True).cargar()
+
+    assert ids(sistema.tareas_por_tecnico("T1")) == ["A1", "A3"]
+    assert ids(sistema.tareas) == ["A1", "A3", "A4"]
+    assert set(sistema.historial_pendiente()) == {"E1"}
+    assert sistema.historial_diferido.cantidad() == 1
+    # Lo que quedaba del equipo se completa sin repetir lo ya leído
+    assert ids(sistema.tareas_por_equipo("E1")) == ["A1", "A2"]
+    assert sistema.historial_diferido.cantidad() == 0
+
+
+def test_el_indice_sobrevive_a_un_guardado_con_historial_sin_leer(archivo):
+    persistencia = PersistenciaNDJSON(archivo, None, carga_diferida=True)
+    sistema = persistencia.cargar()
+    sistema.tareas_por_tecnico("T2")
+    sistema.obtener_tarea("A2").observaciones = "Sin repuesto"
+    persistencia.guardar(sistema)
+
+    # Las posiciones se reubicaron en el archivo nuevo, tanto en memoria como en el índice
+    assert ids(sistema.tareas_por_tecnico("T1")) == ["A1", "A3"]
+    reabierto = PersistenciaNDJSON(archivo, None, carga_diferida=True).cargar()
+    assert reabierto.historial_diferido.cantidad() == 3
+    assert ids(reabierto.tareas_por_tecnico("T2")) == ["A2", "A4"]
+    assert reabierto.obtener_tarea("A2").observaciones == "Sin repuesto"
+    assert ids(reabierto.tareas_por_estado(EstadoTarea.COMPLETADA)) == ["A1", "A3"]
@@ -0,0 +1,102 @@
+from datetime import datetime
+
+import pytest
+
+from control.reportes import GeneradorReportes
+from modelo.Entidades.Equipo import Equipo
+from modelo.Entidades.EstadoTarea import EstadoTarea
+from modelo.Entidades.TareaMantenimiento import TareaMantenimiento
+from modelo.Entidades.Tecnico import Tecnico
+from modelo.Entidades.TipoMantenimiento import TipoMantenimiento
+from modelo.Entidades.Ubicacion import Ubicacion
+from modelo.SistemaMantenimiento import SistemaMantenimiento
+from modelo.persistencia import PersistenciaJSON
+from modelo.persistencia_sqlite import PersistenciaSQLite
+
+
+@pytest.fixture
+def sistema():
+    sistema = SistemaMantenimiento()
+    ubicacion = Ubicacion("U1", "Planta")
+    sistema.agregar_ubicacion(ubicacion)
+    torno = Equipo("E1", "Torno", ubicacion, datetime(2020, 1, 1))
+    fresa = Equipo("E2", "Fresa", ubicacion, datetime(2020, 1, 1))
+    sistema.agregar_equipo(torno)
+    sistema.agregar_equipo(fresa)
+    ana, bea = Tecnico("T1", "Ana", "Mecánica"), Tecnico("T2", "Bea", "Mecánica")
+    sistema.agregar_tecnico(ana)
+    sistema.agregar_tecnico(bea)
+    sistema.agregar_tarea(TareaMantenimiento("A1", TipoMantenimiento.CORRECTIVO, torno, datetime(2022, 1, 10),
+                                             ana, EstadoTarea.COMPLETADA, "Falla en el motor",
+                                             datetime(2022, 1, 10), 30))
+    sistema.agregar_tarea(TareaMantenimiento("A2", TipoMantenimiento.PREVENTIVO, torno, datetime(2022, 1, 20),
+                                             bea, EstadoTarea.CANCELADA))
+    sistema.agregar_tarea(TareaMantenimiento("A3", TipoMantenimiento.PREVENTIVO, fresa, datetime(2022, 2, 1),
+                                             ana, EstadoTarea.COMPLETADA, "", datetime(2022, 2, 1), 90))
+    sistema.agregar_tarea(TareaMantenimiento("A4", TipoMantenimiento.CORRECTIVO, torno, datetime(2022, 3, 1), ana))
+    return sistema
+
+
+@pytest.fixture
+def base(sistema, tmp_path):
+    ruta = str(tmp_path / "mantenimiento.db")
+    persistencia = PersistenciaSQLite(ruta, None)
+    persistencia.guardar(sistema)
+    persistencia.cerrar()
+    return ruta
+
+
+def ids(tareas):
+    return sorted(tarea.id for tarea in tareas)
+
+
+def test_la_carga_solo_lee_las_tareas_activas(base):
+    cargado = PersistenciaSQLite(base, None).cargar()
+
+    assert ids(cargado.tareas) == ["A4"]
+    assert cargado.historial_diferido.cantidad() == 3
+    assert set(cargado.historial_pendiente()) == {"E1", "E2"}
+    assert cargado.ultimas_preventivas_pendientes() == {"E1": datetime(2022, 1, 20), "E2": datetime(2022, 2, 1)}
+
+
+def test_las_consultas_por_equipo_y_tecnico_leen_solo_sus_tareas(base):
+    cargado = PersistenciaSQLite(base, None).cargar()
+
+    assert ids(cargado.tareas_por_tecnico("T2")) == ["A2"]
+    assert ids(cargado.tareas) == ["A2", "A4"]
+    assert ids(cargado.tareas_por_equipo("E1")) == ["A1", "A2", "A4"]
+    assert set(cargado.historial_pendiente()) == {"E2"}
+
+
+def test_los_reportes_usan_los_conteos_sql_del_historial(sistema, base):
+    esperado = GeneradorReportes(sistema)
+    cargado = PersistenciaSQLite(base, None).cargar()
+    generador = GeneradorReportes(cargado)
+
+    assert generador.mantenimientos_por_tipo() == esperado.mantenimientos_por_tipo()
+    assert generador.fallas_recurrentes() == {"Torno": 1}
+    assert generador.tiempo_promedio_mantenimiento() == 60.0
+    assert cargado.historial_diferido.cantidad() == 3
+
+
+def test_una_tarea_completada_despues_de_cargar_no_se_lee_dos_veces(base):
+    persistencia = PersistenciaSQLite(base, None)
+    cargado = persistencia.cargar()
+    cargado.obtener_tarea("A4").estado = EstadoTarea.COMPLETADA
+    cargado.agregar_tarea(TareaMantenimiento("A5", TipoMantenimiento.PREVENTIVO, cargado.obtener_equipo("E1"),
+                                             datetime(2022, 4, 1), cargado.obtener_tecnico("T1"),
+                                             EstadoTarea.CANCELADA))
+    persistencia.guardar(cargado)
+
+    assert ids(cargado.tareas_por_tecnico("T1")) == ["A1", "A3", "A4", "A5"]
+    assert ids(cargado.tareas) == ["A1", "A3", "A4", "A5"]
+
+
+def test_la_migracion_desde_json_no_deja_cache(sistema, tmp_path):
+    archivo_json = tmp_path / "mantenimiento.json"
+    PersistenciaJSON(str(archivo_json), usar_cache=False).guardar(sistema)
+
+    cargado = PersistenciaSQLite(str(tmp_path / "mantenimiento.db"), str(archivo_json)).cargar()
+
+    assert ids(cargado.tareas_por_estado(EstadoTarea.COMPLETADA)) == ["A1", "A3"]
+    assert not list(tmp_path.glob("*.cache"))
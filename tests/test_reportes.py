@@ -0,0 +1,87 @@
+from datetime import datetime
+
+import pytest
+
+from control.reportes import GeneradorReportes
+from modelo.Entidades.Equipo import Equipo
+from modelo.Entidades.EstadoTarea import EstadoTarea
+from modelo.Entidades.TareaMantenimiento import TareaMantenimiento
+from modelo.Entidades.Tecnico import Tecnico
+from modelo.Entidades.TipoMantenimiento import TipoMantenimiento
+from modelo.Entidades.Ubicacion import Ubicacion
+from modelo.SistemaMantenimiento import SistemaMantenimiento
+from modelo.persistencia_ndjson import PersistenciaNDJSON
+
+
+@pytest.fixture
+def sistema():
+    sistema = SistemaMantenimiento()
+    ubicacion = Ubicacion("U1", "Planta")
+    sistema.agregar_ubicacion(ubicacion)
+    torno = Equipo("E1", "Torno", ubicacion, datetime(2020, 1, 1))
+    fresa = Equipo("E2", "Fresa", ubicacion, datetime(2020, 1, 1))
+    sistema.agregar_equipo(torno)
+    sistema.agregar_equipo(fresa)
+    ana, bea = Tecnico("T1", "Ana", "Mecánica"), Tecnico("T2", "Bea", "Mecánica")
+    sistema.agregar_tecnico(ana)
+    sistema.agregar_tecnico(bea)
+    sistema.agregar_tarea(TareaMantenimiento("A1", TipoMantenimiento.CORRECTIVO, torno, datetime(2022, 1, 10),
+                                             ana, EstadoTarea.COMPLETADA, "Falla en el motor",
+                                             datetime(2022, 1, 10), 30))
+    sistema.agregar_tarea(TareaMantenimiento("A2", TipoMantenimiento.PREVENTIVO, torno, datetime(2022, 1, 20),
+                                             bea, EstadoTarea.COMPLETADA, "", datetime(2022, 1, 20), 90))
+    sistema.agregar_tarea(TareaMantenimiento("A3", TipoMantenimiento.CORRECTIVO, fresa, datetime(2022, 2, 1),
+                                             ana, EstadoTarea.CANCELADA, "Equipo roto"))
+    sistema.agregar_tarea(TareaMantenimiento("A4", TipoMantenimiento.PREVENTIVO, fresa, datetime(2022, 3, 1), bea))
+    return sistema
+
+
+def conteos(generador):
+    return (generador.mantenimientos_por_tipo(), generador.fallas_recurrentes(),
+            generador.tiempo_promedio_mantenimiento(),
+            [(e.id, n) for e, n in generador.equipos_con_mas_mantenimientos()],
+            [(t.id, n) for t, n in generador.tecnicos_mas_activos()])
+
+
+def test_los_agregados_siguen_las_ediciones_de_observaciones_y_duracion(sistema):
+    generador = GeneradorReportes(sistema)
+    assert generador.fallas_recurrentes() == {"Torno": 1, "Fresa": 1}
+    assert generador.tiempo_promedio_mantenimiento() == 60.0
+
+    sistema.obtener_tarea("A1").observaciones = "Cambio de aceite"
+    sistema.obtener_tarea("A2").duracion_minutos = 150
+
+    assert generador.fallas_recurrentes() == {"Fresa": 1}
+    assert generador.tiempo_promedio_mantenimiento() == 90.0
+    assert conteos(generador) == conteos(GeneradorReportes(sistema))
+
+
+def test_los_reportes_no_cargan_el_historial_diferido(sistema, tmp_path):
+    esperado = conteos(GeneradorReportes(sistema))
+    persistencia = PersistenciaNDJSON(str(tmp_path / "mantenimiento.ndjson"), None, carga_diferida=True)
+    persistencia.guardar(sistema)
+
+    diferido = persistencia.cargar()
+    generador = GeneradorReportes(diferido)
+    assert conteos(generador) == esperado
+    assert diferido.historial_diferido.cantidad() == 3
+
+    # Las tareas que se cargan pasan de los conteos del índice a los agregados
+    diferido.tareas_por_tecnico("T1")
+    assert conteos(generador) == esperado
+    diferido.tareas_por_equipo("E1")
+    assert conteos(generador) == esperado
+    assert diferido.historial_diferido.cantidad() == 0
+
+
+def test_los_conteos_del_indice_sobreviven_a_un_guardado(sistema, tmp_path):
+    esperado = conteos(GeneradorReportes(sistema))
+    persistencia = PersistenciaNDJSON(str(tmp_path / "mantenimiento.ndjson"), None, carga_diferida=True)
+    persistencia.guardar(sistema)
+    diferido = persistencia.cargar()
+    diferido.tareas_por_tecnico("T2")
+    persistencia.guardar(diferido)
+
+    assert conteos(GeneradorReportes(diferido)) == esperado
+    reabierto = PersistenciaNDJSON(str(tmp_path / "mantenimiento.ndjson"), None, carga_diferida=True).cargar()
+    assert conteos(GeneradorReportes(reabierto)) == esperado
@@ -1,9 +1,10 @@
 import tkinter as tk
 from datetime import datetime
-from random import randint
 from tkinter import ttk, messagebox
 from typing import Callable
 
+from modelo.identificadores import nuevo_id
+
 
 class EquipoForm:
     """
@@ -114,13 +115,13 @@ class EquipoForm:
         if self.gestor.sistema.ubicaciones:
             self.btn_guardar['state'] = 'normal'
 
-    def _id_aleatorio(self):
+    def _nuevo_id(self) -> str:
         """
-        Genera un ID aleatorio para el equipo.
+        Genera un ID único para el equipo, ordenable por fecha de creación.
 
-        :return: ID aleatorio como cadena.
+        :return: ID como cadena.
         """
-        return str(randint(100000, 999999))
+        return nuevo_id("EQ")
 
     def _guardar(self):
         """
@@ -131,7 +132,7 @@ class EquipoForm:
         """
         try:
             # Obtener valores del formulario
-            id_equipo = self._id_aleatorio()
+            id_equipo = self._nuevo_id()
             nombre = self.nombre_entry.get().strip()
             ubicacion_str = self.ubicacion_combobox.get()
             fecha_instalacion = datetime.strptime(self.fecha_entry.get(), "%Y-%m-%d")
@@ -144,7 +145,9 @@ class EquipoForm:
 
             # Obtener ubicación seleccionada
             ubicacion_id = ubicacion_str.split(" - ")[0]
-            ubicacion = next(u for u in self.gestor.sistema.ubicaciones if u.id == ubicacion_id)
+            ubicacion = self.gestor.sistema.obtener_ubicacion(ubicacion_id)
+            if ubicacion is None:
+                raise ValueError("La ubicación seleccionada no existe")
 
             # Registrar el equipo
             equipo = self.gestor.registrar_equipo(
@@ -110,12 +110,15 @@ class TareaForm:
 
     def _cargar_tecnicos(self):
         """
-        Carga los técnicos activos en el sistema y los muestra en el combobox.
+        Carga los técnicos activos en el sistema y los muestra en el combobox, del menos
+        al más cargado de trabajo, con el primero seleccionado.
 
         Si no hay técnicos activos, el combobox permanecerá vacío.
         """
-        tecnicos = [(t.id, t.nombre) for t in self.gestor.sistema.tecnicos if t.activo]
-        self.tecnico_combobox['values'] = [f"{id} - {nombre}" for id, nombre in tecnicos]
+        cargas = self.gestor.motor_asignacion.cargas()
+        tecnicos = sorted((t for t in self.gestor.sistema.tecnicos if t.activo), key=lambda t: cargas[t.id])
+        self.tecnico_combobox['values'] = [f"{t.id} - {t.nombre} ({t.especialidad}, {cargas[t.id]} min pendientes)"
+                                           for t in tecnicos]
         if tecnicos:
             self.tecnico_combobox.current(0)
 
@@ -156,13 +159,18 @@ class TareaForm:
 
             if tipo == "PREVENTIVO":
                 # Registrar mantenimiento preventivo
-                fecha_programada = datetime.strptime(self.fecha_entry.get(), "%Y-%m-%d")
+                # Solo se elige el día: la hora es la primera libre del técnico en su jornada
+                inicio_jornada = self.gestor.calendario.inicio_jornada
+                fecha_programada = datetime.strptime(self.fecha_entry.get(), "%Y-%m-%d").replace(
+                    hour=inicio_jornada.hour, minute=inicio_jornada.minute)
                 tarea = self.gestor.planificar_mantenimiento_preventivo(
                     equipo_id=equipo_id,
                     tecnico_id=tecnico_id,
-                    fecha_programada=fecha_programada
+                    fecha_programada=fecha_programada,
+                    ajustar_horario=True
                 )
-                mensaje = "Mantenimiento preventivo planificado correctamente"
+                mensaje = ("Mantenimiento preventivo planificado correctamente para el "
+                           f"{tarea.fecha_programada:%Y-%m-%d %H:%M}")
             else:
                 # Registrar mantenimiento correctivo
                 observaciones = self.obs_text.get("1.0", tk.END).strip()
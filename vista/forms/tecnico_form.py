@@ -1,8 +1,9 @@
 import tkinter as tk
-from random import randint
 from tkinter import ttk, messagebox
 from typing import Callable
 
+from modelo.identificadores import nuevo_id
+
 
 class TecnicoForm:
     """
@@ -73,7 +74,7 @@ class TecnicoForm:
         """
         try:
             # Obtener valores del formulario
-            id_tecnico = self._id_aleatorio()
+            id_tecnico = self._nuevo_id()
             nombre = self.nombre_entry.get().strip()
             especialidad = self.especialidad_entry.get().strip()
             activo = self.activo_var.get()
@@ -86,8 +87,9 @@ class TecnicoForm:
             self.gestor.registrar_tecnico(
                 id=id_tecnico,
                 nombre=nombre,
-                especialidad=especialidad
-            ).activo = activo
+                especialidad=especialidad,
+                activo=activo
+            )
 
             messagebox.showinfo("Éxito", "Técnico registrado correctamente")
             self.callback_actualizar()
@@ -98,10 +100,10 @@ class TecnicoForm:
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo registrar el técnico: {e}")
 
-    def _id_aleatorio(self):
+    def _nuevo_id(self) -> str:
         """
-        Genera un ID aleatorio para el técnico.
+        Genera un ID único para el técnico, ordenable por fecha de creación.
 
-        :return: ID aleatorio como cadena.
+        :return: ID como cadena.
         """
-        return str(randint(100000, 999999))
+        return nuevo_id("TEC")
@@ -1,8 +1,9 @@
 import tkinter as tk
-from random import randint
 from tkinter import ttk, messagebox
 from typing import Callable
 
+from modelo.identificadores import nuevo_id
+
 
 class UbicacionForm:
     """
@@ -63,7 +64,7 @@ class UbicacionForm:
         """
         try:
             ubicacion = self.gestor.registrar_ubicacion(
-                id=self._id_aleatorio(),
+                id=self._nuevo_id(),
                 nombre=self.nombre_entry.get().strip(),
                 descripcion=self.desc_entry.get().strip()
             )
@@ -73,10 +74,10 @@ class UbicacionForm:
         except ValueError as e:
             messagebox.showerror("Error", f"Datos inválidos: {e}")
 
-    def _id_aleatorio(self):
+    def _nuevo_id(self) -> str:
         """
-        Genera un ID aleatorio para la ubicación.
+        Genera un ID único para la ubicación, ordenable por fecha de creación.
 
-        :return: Id aleatorio como cadena.
+        :return: ID como cadena.
         """
-        return str(randint(100000, 999999))
+        return nuevo_id("UB")
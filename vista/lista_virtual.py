@@ -0,0 +1,362 @@
+"""
+Módulo que define un listado virtualizado basado en ttk.Treeview.
+
+Solo se crean en Tk las filas visibles en pantalla; el resto del listado se mantiene
+como una lista de IDs en memoria y, al ordenar por columna, como índices ordenados que
+se actualizan con búsqueda binaria.
+"""
+import tkinter as tk
+from bisect import bisect_left, insort
+from tkinter import ttk
+from typing import AbstractSet, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class _IndiceOrden:
+    """
+    IDs de un listado ordenados de forma ascendente por la clave de una columna.
+
+    La clave de cada ID se guarda al insertarlo, de modo que ubicarlo para quitarlo o
+    reinsertarlo es una búsqueda binaria que no vuelve a consultar las entidades, aunque
+    ya hayan cambiado. Cada entrada es (clave, ID): el ID desempata las claves iguales.
+    """
+
+    def __init__(self, clave: Callable[[str], object], ids: Iterable[str]):
+        """
+        Inicializador de la clase _IndiceOrden.
+
+        :param clave: Función que recibe un ID y devuelve su clave de orden.
+        :param ids: IDs a ordenar; la clave se calcula una vez por ID.
+        """
+        self.clave = clave
+        self._claves = {entidad_id: clave(entidad_id) for entidad_id in ids}
+        self.entradas: List[Tuple[object, str]] = sorted((c, i) for i, c in self._claves.items())
+
+    def __len__(self) -> int:
+        return len(self.entradas)
+
+    def __contains__(self, entidad_id: str) -> bool:
+        return entidad_id in self._claves
+
+    def ids(self) -> Iterable[str]:
+        """
+        Devuelve los IDs del índice, sin un orden particular.
+        """
+        return self._claves.keys()
+
+    def quitar(self, entidad_id: str) -> bool:
+        """
+        Quita un ID del índice, ubicándolo por la clave con la que se insertó.
+
+        :param entidad_id: ID a quitar.
+        :return: True si estaba en el índice.
+        """
+        if entidad_id not in self._claves:
+            return False
+        del self.entradas[bisect_left(self.entradas, (self._claves.pop(entidad_id), entidad_id))]
+        return True
+
+    def agregar(self, entidad_id: str):
+        """
+        Inserta un ID en su posición, con su clave actual.
+
+        :param entidad_id: ID a insertar; no debe estar en el índice.
+        """
+        entrada = (self.clave(entidad_id), entidad_id)
+        self._claves[entidad_id] = entrada[0]
+        insort(self.entradas, entrada)
+
+
+class ListaVirtual(ttk.Frame):
+    """
+    Clase que representa un listado paginado según el área visible.
+
+    Los datos se describen con una función que devuelve los valores de una fila a partir
+    del ID de la entidad. Cada fila materializada usa el ID como iid del Treeview.
+
+    Sin orden, los IDs se muestran en una lista en el orden en que llegaron. Al ordenar
+    por una columna se arma su índice ordenado (ver _IndiceOrden), que se conserva y se
+    actualiza con cada modificación: invertir el orden o volver a una columna ya
+    ordenada no reordena nada.
+    """
+
+    def __init__(self, parent, columnas: Sequence[Tuple[str, str]],
+                 valores_fila: Callable[[str], tuple],
+                 claves_orden: Optional[Dict[str, Callable[[str], object]]] = None):
+        """
+        Inicializa el listado virtual.
+
+        :param parent: Contenedor donde se ubicará el listado.
+        :param columnas: Secuencia de tuplas (columna, encabezado).
+        :param valores_fila: Función que recibe un ID y devuelve los valores de la fila.
+        :param claves_orden: Funciones que reciben un ID y devuelven la clave de orden
+            de cada columna. Las columnas sin clave no se pueden ordenar.
+        """
+        super().__init__(parent)
+        self.valores_fila = valores_fila
+        self.claves_orden = claves_orden or {}
+
+        # IDs en orden de llegada, mientras no se ordena por ninguna columna
+        self._ids: List[str] = []
+        # Índices ordenados de las columnas por las que ya se ordenó
+        self._indices: Dict[str, _IndiceOrden] = {}
+        self._inicio = 0
+        self._filas_visibles = 20
+        self._seleccion: Tuple[str, ...] = ()
+        self._orden: Optional[Tuple[str, bool]] = None
+        self._encabezados = dict(columnas)
+
+        self.tree = ttk.Treeview(self, columns=[c for c, _ in columnas], show='headings', selectmode='browse')
+        for columna, texto in columnas:
+            self.tree.heading(columna, text=texto, command=lambda c=columna: self.ordenar_por(c))
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._al_desplazar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        altura = ttk.Style().lookup('Treeview', 'rowheight')
+        self._altura_fila = int(float(altura)) if altura else 20
+
+        self.tree.bind('<Configure>', self._al_redimensionar)
+        self.tree.bind('<<TreeviewSelect>>', self._al_seleccionar)
+        self.tree.bind('<MouseWheel>', self._al_rueda)
+        self.tree.bind('<Button-4>', lambda e: self.desplazar(-3))
+        self.tree.bind('<Button-5>', lambda e: self.desplazar(3))
+
+    def cargar(self, ids: Iterable[str]):
+        """
+        Reemplaza el contenido del listado.
+
+        Solo se copian los IDs; las filas de Tk se crean al mostrarse. Con un orden activo
+        se vuelve a armar solo el índice de su columna.
+
+        :param ids: IDs de las entidades a listar.
+        """
+        if self._orden is None:
+            self._ids = list(ids)
+            presentes = set(self._ids)
+        else:
+            # Los índices de otras columnas quedarían desactualizados: se descartan
+            columna = self._orden[0]
+            presentes = _IndiceOrden(self.claves_orden[columna], ids)
+            self._indices = {columna: presentes}
+        if self._seleccion:
+            self._seleccion = tuple(i for i in self._seleccion if i in presentes)
+        self._inicio = min(self._inicio, self._inicio_maximo())
+        self.refrescar()
+
+    def refrescar(self):
+        """
+        Vuelve a materializar las filas del área visible.
+        """
+        visibles = self._visibles(self._inicio, self._inicio + self._filas_visibles)
+        self.tree.delete(*self.tree.get_children())
+        for entidad_id in visibles:
+            self.tree.insert('', 'end', iid=entidad_id, values=self.valores_fila(entidad_id))
+
+        # Restaurar la selección de las filas que siguen a la vista
+        seleccion = [i for i in self._seleccion if self.tree.exists(i)]
+        if seleccion:
+            self.tree.selection_set(seleccion)
+        self._actualizar_scrollbar()
+
+    def aplicar_cambios(self, altas: Iterable[str] = (), cambios: Iterable[str] = (),
+                        bajas: Iterable[str] = ()):
+        """
+        Aplica al listado un lote de altas, cambios y bajas sin recargarlo completo.
+
+        Las filas visibles se vuelven a materializar solo si la modificación las desplaza;
+        un cambio que no altera el orden actualiza únicamente su fila, si está visible.
+
+        :param altas: IDs de entidades nuevas.
+        :param cambios: IDs de entidades modificadas.
+        :param bajas: IDs de entidades eliminadas.
+        """
+        bajas = set(bajas)
+        cambios = [i for i in cambios if i not in bajas]
+        self._seleccion = tuple(i for i in self._seleccion if i not in bajas)
+        fin = self._inicio + self._filas_visibles
+        antes = self._visibles(self._inicio, fin)
+        if self._orden is None:
+            self._aplicar_sin_orden(altas, bajas)
+        else:
+            self._aplicar_en_indices(altas, cambios, bajas)
+
+        if self._visibles(self._inicio, fin) != antes or self._inicio > self._inicio_maximo():
+            self._inicio = min(self._inicio, self._inicio_maximo())
+            self.refrescar()
+            return
+
+        self._actualizar_scrollbar()
+        for entidad_id in cambios:
+            if self.tree.exists(entidad_id):
+                self.tree.item(entidad_id, values=self.valores_fila(entidad_id))
+
+    def selection(self) -> Tuple[str, ...]:
+        """
+        Devuelve los IDs seleccionados, aunque sus filas no estén materializadas.
+        """
+        return self._seleccion
+
+    def ordenar_por(self, columna: str):
+        """
+        Ordena el listado por una columna, alternando entre orden ascendente y descendente.
+
+        :param columna: Columna por la que se ordena.
+        """
+        if columna not in self.claves_orden:
+            return
+        descendente = self._orden == (columna, False)
+        self._orden = (columna, descendente)
+        for c, texto in self._encabezados.items():
+            marca = (" ▼" if descendente else " ▲") if c == columna else ""
+            self.tree.heading(c, text=texto + marca)
+        if columna not in self._indices:
+            ids = self._ids if not self._indices else next(iter(self._indices.values())).ids()
+            self._indices[columna] = _IndiceOrden(self.claves_orden[columna], ids)
+            self._ids = []
+        self.refrescar()
+
+    def desplazar(self, filas: int):
+        """
+        Desplaza el área visible una cantidad de filas.
+
+        :param filas: Filas a desplazar; negativas hacia arriba.
+        """
+        self._ir_a(self._inicio + filas)
+
+    def _aplicar_sin_orden(self, altas: Iterable[str], bajas: AbstractSet[str]):
+        """
+        Aplica altas y bajas a la lista de IDs en orden de llegada.
+
+        :param altas: IDs de entidades nuevas, que se agregan al final.
+        :param bajas: IDs de entidades eliminadas.
+        """
+        if len(bajas) > 32:
+            self._ids = [i for i in self._ids if i not in bajas]
+        else:
+            for entidad_id in bajas:
+                try:
+                    self._ids.remove(entidad_id)
+                except ValueError:
+                    pass
+        self._ids.extend(altas)
+
+    def _aplicar_en_indices(self, altas: Iterable[str], cambios: Iterable[str], bajas: AbstractSet[str]):
+        """
+        Aplica altas, cambios y bajas a todos los índices ordenados, con búsqueda binaria.
+
+        Un cambio se quita con su clave anterior y se vuelve a insertar con la nueva.
+
+        :param altas: IDs de entidades nuevas.
+        :param cambios: IDs de entidades modificadas.
+        :param bajas: IDs de entidades eliminadas.
+        """
+        altas = list(altas)
+        for indice in self._indices.values():
+            for entidad_id in bajas:
+                indice.quitar(entidad_id)
+            for entidad_id in cambios:
+                if indice.quitar(entidad_id):
+                    indice.agregar(entidad_id)
+            for entidad_id in altas:
+                if entidad_id not in indice:
+                    indice.agregar(entidad_id)
+
+    def _visibles(self, inicio: int, fin: int) -> List[str]:
+        """
+        Devuelve los IDs mostrados entre dos posiciones, según el orden activo.
+
+        :param inicio: Primera posición, inclusive.
+        :param fin: Última posición, exclusive.
+        :return: Lista de IDs.
+        """
+        if self._orden is None:
+            return self._ids[inicio:fin]
+        columna, descendente = self._orden
+        entradas = self._indices[columna].entradas
+        if descendente:
+            total = len(entradas)
+            return [i for _, i in reversed(entradas[max(0, total - fin):max(0, total - inicio)])]
+        return [i for _, i in entradas[inicio:fin]]
+
+    def _cantidad(self) -> int:
+        """
+        Devuelve la cantidad de filas del listado.
+        """
+        if self._orden is None:
+            return len(self._ids)
+        return len(self._indices[self._orden[0]])
+
+    def _ir_a(self, inicio: int):
+        """
+        Mueve el área visible para que comience en la posición indicada.
+
+        :param inicio: Índice de la primera fila visible.
+        """
+        inicio = max(0, min(inicio, self._inicio_maximo()))
+        if inicio != self._inicio:
+            self._inicio = inicio
+            self.refrescar()
+
+    def _inicio_maximo(self) -> int:
+        """
+        Devuelve el mayor índice posible para la primera fila visible.
+        """
+        return max(0, self._cantidad() - self._filas_visibles)
+
+    def _actualizar_scrollbar(self):
+        """
+        Ajusta la barra de desplazamiento a la porción visible del listado.
+        """
+        total = self._cantidad()
+        if not total:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        fin = min(total, self._inicio + self._filas_visibles)
+        self.scrollbar.set(self._inicio / total, fin / total)
+
+    def _al_desplazar(self, accion: str, cantidad: str, unidad: str = None):
+        """
+        Atiende los comandos de la barra de desplazamiento.
+
+        :param accion: "moveto" o "scroll".
+        :param cantidad: Fracción destino o cantidad de unidades.
+        :param unidad: "units" o "pages" cuando la acción es "scroll".
+        """
+        if accion == 'moveto':
+            self._ir_a(int(float(cantidad) * self._cantidad()))
+        elif accion == 'scroll':
+            paso = self._filas_visibles if unidad == 'pages' else 1
+            self.desplazar(int(cantidad) * paso)
+
+    def _al_rueda(self, evento):
+        """
+        Desplaza el listado con la rueda del ratón.
+
+        :param evento: Evento de Tk.
+        """
+        self.desplazar(-3 if evento.delta > 0 else 3)
+
+    def _al_redimensionar(self, evento):
+        """
+        Recalcula cuántas filas caben en el área visible.
+
+        :param evento: Evento de Tk.
+        """
+        # Se descuenta una fila para el encabezado
+        filas = max(1, evento.height // self._altura_fila - 1)
+        if filas != self._filas_visibles:
+            self._filas_visibles = filas
+            self._inicio = min(self._inicio, self._inicio_maximo())
+            self.refrescar()
+
+    def _al_seleccionar(self, evento):
+        """
+        Guarda la selección para conservarla al desplazar el listado.
+
+        Una selección vacía proviene de borrar filas al desplazar, por lo que se ignora.
+
+        :param evento: Evento de Tk.
+        """
+        seleccion = self.tree.selection()
+        if seleccion:
+            self._seleccion = seleccion
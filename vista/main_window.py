@@ -5,18 +5,28 @@ Proporciona la interfaz gráfica principal para interactuar con el sistema, perm
 gestionar equipos, técnicos, tareas y reportes.
 """
 
+import threading
 import tkinter as tk
 from tkinter import ttk, messagebox
 
+from control.archivo_historico import ArchivoHistorico
 from control.gestor_mantenimiento import GestorMantenimiento
 from control.reportes import GeneradorReportes
+from control.telemetria import IngestaTelemetria
+from control.trabajos import EjecutorTrabajos, Trabajo
 from modelo.Entidades.EstadoTarea import EstadoTarea
+from modelo.guardado_diferido import GuardadoDiferido
 from modelo.persistencia import PersistenciaJSON
 from vista.forms.equipo_form import EquipoForm
 from vista.forms.tarea_form import TareaForm
 from vista.forms.tecnico_form import TecnicoForm
 from vista.forms.ubicacion_form import UbicacionForm
-from vista.reportes_view import ReportesView
+from vista.lista_virtual import ListaVirtual
+from vista.recorridos_view import RecorridosView
+from vista.reportes_view import ReportesView, calcular_reportes
+
+# Cada cuántos milisegundos se atienden los resultados de los trabajos en segundo plano
+INTERVALO_TRABAJOS = 50
 
 
 class MainWindow:
@@ -27,15 +37,32 @@ class MainWindow:
     de mantenimiento y realizar operaciones como agregar, editar o eliminar registros.
     """
 
-    def __init__(self, gestor: GestorMantenimiento, generador_reportes: GeneradorReportes):
+    def __init__(self, gestor: GestorMantenimiento, generador_reportes: GeneradorReportes,
+                 persistencia: PersistenciaJSON = None, guardado: GuardadoDiferido = None,
+                 archivo_historico: ArchivoHistorico = None, telemetria: IngestaTelemetria = None):
         """
         Inicializa la ventana principal del sistema.
 
         :param gestor: Objeto que gestiona la lógica del sistema.
         :param generador_reportes: Objeto que genera reportes del sistema.
+        :param persistencia: Objeto usado para cargar y guardar los datos. Por defecto PersistenciaJSON.
+        :param guardado: Guardado diferido que agrupa los cambios en escrituras de la
+            persistencia. Por defecto uno en modo por lotes.
+        :param archivo_historico: Archivo de las tareas antiguas. Por defecto ArchivoHistorico.
+        :param telemetria: Ingesta de lecturas de horas de uso, opcional. Empieza a aplicar
+            las lecturas cuando termina la carga de los datos.
         """
         self.gestor = gestor
         self.generador_reportes = generador_reportes
+        self.persistencia = persistencia or PersistenciaJSON()
+        self.guardado = guardado or GuardadoDiferido(self.persistencia)
+        if self.guardado.al_error is None:
+            self.guardado.al_error = self._al_error_guardado
+        self.archivo_historico = archivo_historico or ArchivoHistorico()
+        self.telemetria = telemetria
+        self.trabajos = EjecutorTrabajos()
+        # Hasta que termine cargar_datos no se permiten modificaciones
+        self.datos_cargados = True
 
         self.root = tk.Tk()
         self.root.title("Sistema de Gestión de Mantenimiento Industrial")
@@ -44,8 +71,24 @@ class MainWindow:
         self._crear_menu()
         self._crear_boton_ubicacion()
         self._crear_interfaz()
+        self._crear_barra_estado()
+
+        # Cambios del modelo pendientes de reflejar: colección -> {ID: operación}
+        self._listados = {
+            "equipos": self.tree_equipos,
+            "tecnicos": self.tree_tecnicos,
+            "tareas": self.tree_tareas,
+        }
+        self._cambios_pendientes = {}
+        self._refresco_programado = False
+        self._alertas_mostradas = []
+        self._trabajo_alertas = None
+        self._repetir_alertas = False
+        self._trabajo_visible = None
+        self.gestor.sistema.suscribir(self._al_modificar_sistema)
 
         self.actualizar_listados()
+        self.root.after(INTERVALO_TRABAJOS, self._atender_trabajos)
 
     def _crear_menu(self):
         """
@@ -56,6 +99,8 @@ class MainWindow:
 
         # Menú Archivo
         menu_archivo = tk.Menu(menubar, tearoff=0)
+        menu_archivo.add_command(label="Archivar tareas antiguas", command=self.archivar_tareas)
+        menu_archivo.add_separator()
         menu_archivo.add_command(label="Salir", command=self.root.quit)
         menubar.add_cascade(label="Archivo", menu=menu_archivo)
 
@@ -64,11 +109,14 @@ class MainWindow:
         menu_registros.add_command(label="Nuevo Equipo", command=self.abrir_form_equipo)
         menu_registros.add_command(label="Nuevo Técnico", command=self.abrir_form_tecnico)
         menu_registros.add_command(label="Nueva Tarea", command=self.abrir_form_tarea)
+        menu_registros.add_separator()
+        menu_registros.add_command(label="Asignar técnicos a tareas pendientes", command=self.asignar_tecnicos)
         menubar.add_cascade(label="Registros", menu=menu_registros)
 
         # Menú Reportes
         menu_reportes = tk.Menu(menubar, tearoff=0)
         menu_reportes.add_command(label="Ver Reportes", command=self.mostrar_reportes)
+        menu_reportes.add_command(label="Plan de recorridos por ubicación", command=self.mostrar_recorridos)
         menubar.add_cascade(label="Reportes", menu=menu_reportes)
 
         self.root.config(menu=menubar)
@@ -92,9 +140,17 @@ class MainWindow:
 
         # Pestaña de equipos
         frame_equipos = ttk.Frame(notebook)
-        self.tree_equipos = ttk.Treeview(frame_equipos, columns=('nombre', 'ubicacion'), show='headings')
-        self.tree_equipos.heading('nombre', text='Nombre')
-        self.tree_equipos.heading('ubicacion', text='Ubicación')
+        # El sistema se consulta en cada llamada porque cambia al terminar la carga
+        sistema = lambda: self.gestor.sistema
+        self.tree_equipos = ListaVirtual(
+            frame_equipos,
+            columnas=(('nombre', 'Nombre'), ('ubicacion', 'Ubicación')),
+            valores_fila=lambda i: self._valores_equipo(sistema().obtener_equipo(i)),
+            claves_orden={
+                'nombre': lambda i: sistema().obtener_equipo(i).nombre.lower(),
+                'ubicacion': lambda i: sistema().obtener_equipo(i).ubicacion.nombre.lower(),
+            }
+        )
         self.tree_equipos.pack(fill=tk.BOTH, expand=True)
 
         # Botón de eliminación de equipos
@@ -105,9 +161,15 @@ class MainWindow:
 
         # Pestaña de técnicos
         frame_tecnicos = ttk.Frame(notebook)
-        self.tree_tecnicos = ttk.Treeview(frame_tecnicos, columns=('nombre', 'especialidad'), show='headings')
-        self.tree_tecnicos.heading('nombre', text='Nombre')
-        self.tree_tecnicos.heading('especialidad', text='Especialidad')
+        self.tree_tecnicos = ListaVirtual(
+            frame_tecnicos,
+            columnas=(('nombre', 'Nombre'), ('especialidad', 'Especialidad')),
+            valores_fila=lambda i: self._valores_tecnico(sistema().obtener_tecnico(i)),
+            claves_orden={
+                'nombre': lambda i: sistema().obtener_tecnico(i).nombre.lower(),
+                'especialidad': lambda i: sistema().obtener_tecnico(i).especialidad.lower(),
+            }
+        )
         self.tree_tecnicos.pack(fill=tk.BOTH, expand=True)
 
         # Botón de eliminación de técnicos
@@ -118,11 +180,17 @@ class MainWindow:
 
         # Pestaña de tareas
         frame_tareas = ttk.Frame(notebook)
-        self.tree_tareas = ttk.Treeview(frame_tareas, columns=('id', 'equipo', 'tipo', 'estado'), show='headings')
-        self.tree_tareas.heading('id', text='ID')
-        self.tree_tareas.heading('equipo', text='Equipo')
-        self.tree_tareas.heading('tipo', text='Tipo')
-        self.tree_tareas.heading('estado', text='Estado')
+        self.tree_tareas = ListaVirtual(
+            frame_tareas,
+            columnas=(('id', 'ID'), ('equipo', 'Equipo'), ('tipo', 'Tipo'), ('estado', 'Estado')),
+            valores_fila=lambda i: self._valores_tarea(sistema().obtener_tarea(i)),
+            claves_orden={
+                'id': lambda i: i,
+                'equipo': lambda i: sistema().obtener_tarea(i).equipo.nombre.lower(),
+                'tipo': lambda i: sistema().obtener_tarea(i).tipo.name,
+                'estado': lambda i: sistema().obtener_tarea(i).estado.name,
+            }
+        )
         self.tree_tareas.pack(fill=tk.BOTH, expand=True)
 
         # Botones específicos para la pestaña de tareas
@@ -145,35 +213,342 @@ class MainWindow:
         self.lista_alertas = tk.Listbox(frame_alertas)
         self.lista_alertas.pack(fill=tk.BOTH, expand=True)
 
+    def _crear_barra_estado(self):
+        """
+        Crea la barra inferior que muestra el avance de los trabajos en segundo plano.
+        """
+        frame_estado = ttk.Frame(self.root)
+        frame_estado.pack(fill=tk.X, side=tk.BOTTOM, padx=5, pady=2)
+
+        self.etiqueta_estado = ttk.Label(frame_estado, text="")
+        self.etiqueta_estado.pack(side=tk.LEFT)
+        self.btn_cancelar = ttk.Button(frame_estado, text="Cancelar", command=self.cancelar_trabajo,
+                                       state=tk.DISABLED)
+        self.btn_cancelar.pack(side=tk.RIGHT)
+        self.barra_progreso = ttk.Progressbar(frame_estado, length=150, maximum=1.0)
+        self.barra_progreso.pack(side=tk.RIGHT, padx=5)
+
+    def _enviar_trabajo(self, funcion, descripcion: str, al_terminar=None, al_error=None,
+                        al_cancelar=None, cancelable: bool = True, determinado: bool = False,
+                        usar_bloqueo: bool = True) -> Trabajo:
+        """
+        Envía un trabajo en segundo plano y lo muestra en la barra de estado.
+
+        :param funcion: Función a ejecutar; recibe el trabajo.
+        :param descripcion: Texto mostrado mientras el trabajo está en curso.
+        :param al_terminar: Función que recibe el resultado.
+        :param al_error: Función que recibe la excepción. Por defecto muestra un mensaje de error.
+        :param al_cancelar: Función llamada si el trabajo se cancela.
+        :param cancelable: Indica si el botón Cancelar puede detener el trabajo.
+        :param determinado: Indica si el trabajo reporta su avance.
+        :param usar_bloqueo: Indica si el trabajo mantiene el bloqueo del sistema mientras corre.
+        :return: El trabajo enviado.
+        """
+        def terminar(resultado):
+            self._quitar_trabajo_visible(trabajo)
+            if al_terminar is not None:
+                al_terminar(resultado)
+
+        def fallar(error):
+            self._quitar_trabajo_visible(trabajo)
+            if al_error is not None:
+                al_error(error)
+            else:
+                messagebox.showerror("Error", f"{descripcion} falló: {error}")
+
+        def cancelar():
+            self._quitar_trabajo_visible(trabajo)
+            if al_cancelar is not None:
+                al_cancelar()
+
+        def avanzar(avance, mensaje):
+            if trabajo is self._trabajo_visible:
+                self.barra_progreso.config(value=avance)
+                self.etiqueta_estado.config(text=f"{descripcion}... {mensaje}")
+
+        trabajo = self.trabajos.enviar(
+            funcion, descripcion=descripcion, cancelable=cancelable,
+            bloqueo=self.gestor.sistema.bloqueo if usar_bloqueo else None,
+            al_terminar=terminar, al_error=fallar, al_cancelar=cancelar, al_progreso=avanzar
+        )
+        self._mostrar_trabajo(trabajo, determinado)
+        return trabajo
+
+    def _mostrar_trabajo(self, trabajo: Trabajo, determinado: bool):
+        """
+        Muestra un trabajo en la barra de estado.
+
+        :param trabajo: Trabajo a mostrar.
+        :param determinado: Indica si el trabajo reporta su avance.
+        """
+        self._trabajo_visible = trabajo
+        self.etiqueta_estado.config(text=f"{trabajo.descripcion}...")
+        self.barra_progreso.stop()
+        if determinado:
+            self.barra_progreso.config(mode='determinate', value=0)
+        else:
+            self.barra_progreso.config(mode='indeterminate')
+            self.barra_progreso.start()
+        self.btn_cancelar.config(state=tk.NORMAL if trabajo.cancelable else tk.DISABLED)
+
+    def _quitar_trabajo_visible(self, trabajo: Trabajo):
+        """
+        Limpia la barra de estado si mostraba el trabajo indicado.
+
+        :param trabajo: Trabajo finalizado.
+        """
+        if trabajo is not self._trabajo_visible:
+            return
+        self._trabajo_visible = None
+        self.barra_progreso.stop()
+        self.barra_progreso.config(mode='determinate', value=0)
+        self.etiqueta_estado.config(text="")
+        self.btn_cancelar.config(state=tk.DISABLED)
+
+    def cancelar_trabajo(self):
+        """
+        Cancela el trabajo mostrado en la barra de estado.
+        """
+        if self._trabajo_visible is not None:
+            self._trabajo_visible.cancelar()
+
+    def _atender_trabajos(self):
+        """
+        Procesa los resultados de los trabajos en segundo plano y vuelve a programarse.
+        """
+        self.trabajos.procesar_pendientes()
+        self.root.after(INTERVALO_TRABAJOS, self._atender_trabajos)
+
+    def cargar_datos(self):
+        """
+        Carga los datos desde la persistencia en segundo plano.
+
+        Mientras dura la carga la ventana responde, pero no se permiten modificaciones.
+        Al terminar, el sistema cargado reemplaza al actual.
+        """
+        self.datos_cargados = False
+
+        def cargar(trabajo):
+            sistema = self.persistencia.cargar()
+            # El gestor y los reportes recorren todo el sistema al crearse
+            return GestorMantenimiento(sistema), GeneradorReportes(sistema, archivo=self.archivo_historico)
+
+        # La carga usa un sistema nuevo, así que no necesita el bloqueo del actual
+        self._enviar_trabajo(cargar, "Cargando datos", al_terminar=self._conectar_sistema,
+                             cancelable=False, usar_bloqueo=False)
+
+    def _conectar_sistema(self, componentes):
+        """
+        Reemplaza el sistema mostrado por uno recién cargado.
+
+        :param componentes: Tupla (gestor, generador de reportes) del sistema cargado.
+        """
+        self.gestor.sistema.desuscribir(self._al_modificar_sistema)
+        self.gestor, self.generador_reportes = componentes
+        self.gestor.sistema.suscribir(self._al_modificar_sistema)
+        self.datos_cargados = True
+        # A partir de aquí cada modificación se guarda sin intervención de la ventana
+        self.guardado.vincular(self.gestor.sistema)
+        if self.telemetria is not None:
+            self.telemetria.vincular(self.gestor)
+        self.actualizar_listados()
+
+    def archivar_tareas(self):
+        """
+        Mueve al archivo histórico, en segundo plano, las tareas completadas o canceladas
+        de hace más de un año. Los reportes siguen contándolas.
+        """
+        if not self._verificar_datos_cargados():
+            return
+        if not messagebox.askyesno("Confirmar", "¿Archivar las tareas completadas o canceladas "
+                                                "de hace más de un año?"):
+            return
+
+        sistema = self.gestor.sistema
+        self._enviar_trabajo(
+            lambda trabajo: self.archivo_historico.archivar(sistema, guardar=self.guardado.guardar_ahora),
+            "Archivando tareas",
+            al_terminar=lambda cantidad: messagebox.showinfo("Éxito", f"{cantidad} tareas archivadas"),
+            cancelable=False)
+
+    def asignar_tecnicos(self):
+        """
+        Reparte en segundo plano las tareas pendientes entre los técnicos activos de su
+        especialidad, según la carga de trabajo de cada uno.
+        """
+        if not self._verificar_datos_cargados():
+            return
+        if not messagebox.askyesno("Confirmar", "¿Reasignar los técnicos de todas las tareas "
+                                                "pendientes según su carga de trabajo?"):
+            return
+
+        def informar(resultado):
+            asignadas, sin_tecnico = resultado
+            mensaje = f"{len(asignadas)} tareas asignadas"
+            if sin_tecnico:
+                mensaje += f"; {len(sin_tecnico)} sin técnicos activos de su especialidad libres en su horario"
+            messagebox.showinfo("Éxito", mensaje)
+
+        self._enviar_trabajo(lambda trabajo: self.gestor.asignar_tecnicos(), "Asignando técnicos",
+                             al_terminar=informar, cancelable=False)
+
+    def _verificar_datos_cargados(self) -> bool:
+        """
+        Indica si ya se pueden modificar los datos, avisando al usuario si no.
+        """
+        if not self.datos_cargados:
+            messagebox.showwarning("Advertencia", "Los datos aún se están cargando")
+        return self.datos_cargados
+
+    def _al_error_guardado(self, error: Exception):
+        """
+        Informa un error del guardado diferido. Se llama desde el hilo de guardado.
+
+        :param error: Excepción producida al guardar.
+        """
+        self.trabajos.en_hilo_principal(
+            messagebox.showerror, "Error", f"No se pudieron guardar los cambios: {error}")
+
     def actualizar_listados(self):
         """
         Actualiza los listados de equipos, técnicos, tareas y alertas en la interfaz.
         """
-        # Actualizar listado de equipos
-        self.tree_equipos.delete(*self.tree_equipos.get_children())
-        for equipo in self.gestor.sistema.equipos:
-            self.tree_equipos.insert('', 'end', values=(equipo.nombre, equipo.ubicacion.nombre))
-
-        # Actualizar listado de técnicos
-        self.tree_tecnicos.delete(*self.tree_tecnicos.get_children())
-        for tecnico in self.gestor.sistema.tecnicos:
-            self.tree_tecnicos.insert('', 'end', values=(tecnico.nombre, tecnico.especialidad))
-
-        # Actualizar listado de tareas
-        self.tree_tareas.delete(*self.tree_tareas.get_children())
-        for tarea in self.gestor.sistema.tareas:
-            self.tree_tareas.insert('', 'end', values=(
-                tarea.id,  # Incluye el ID como primer valor
-                tarea.equipo.nombre,
-                tarea.tipo.name,
-                tarea.estado.name
-            ))
+        # La recarga completa ya incluye cualquier cambio pendiente
+        self._cambios_pendientes = {}
+        # Los listados virtuales solo crean las filas visibles
+        self.tree_equipos.cargar(e.id for e in self.gestor.sistema.equipos)
+        self.tree_tecnicos.cargar(t.id for t in self.gestor.sistema.tecnicos)
+        self.tree_tareas.cargar(t.id for t in self.gestor.sistema.tareas)
 
         # Actualizar alertas
         self.lista_alertas.delete(0, tk.END)
-        alertas = self.gestor.verificar_alertas_mantenimiento()
-        for equipo in alertas:
-            self.lista_alertas.insert(tk.END, f"{equipo.nombre} necesita mantenimiento")
+        self._alertas_mostradas = []
+        self.actualizar_alertas()
+
+    def actualizar_alertas(self):
+        """
+        Calcula las alertas en segundo plano y las muestra al terminar.
+
+        Si ya hay un cálculo en curso, se repite una sola vez cuando este termine.
+        """
+        if self._trabajo_alertas is not None:
+            self._repetir_alertas = True
+            return
+
+        def terminar(alertas):
+            self._trabajo_alertas = None
+            self._mostrar_alertas(alertas)
+            if self._repetir_alertas:
+                self._repetir_alertas = False
+                self.actualizar_alertas()
+
+        def cancelar():
+            self._trabajo_alertas = None
+            self._repetir_alertas = False
+
+        # Es un trabajo breve y frecuente, así que no se muestra en la barra de estado
+        gestor = self.gestor
+        self._trabajo_alertas = self.trabajos.enviar(
+            lambda trabajo: gestor.verificar_alertas_mantenimiento(), descripcion="Verificando alertas",
+            bloqueo=gestor.sistema.bloqueo, al_terminar=terminar, al_error=lambda error: cancelar(),
+            al_cancelar=cancelar
+        )
+
+    def _mostrar_alertas(self, alertas):
+        """
+        Actualiza la lista de alertas insertando y quitando solo las entradas que cambiaron.
+
+        :param alertas: Equipos que requieren mantenimiento, en orden de registro.
+        """
+        nuevas = [equipo.id for equipo in alertas]
+        if nuevas == self._alertas_mostradas:
+            return
+
+        # Ambas listas siguen el orden de registro de los equipos, así que basta con
+        # quitar las que ya no están y luego insertar las nuevas en su posición.
+        conjunto_nuevas = set(nuevas)
+        for indice in range(len(self._alertas_mostradas) - 1, -1, -1):
+            if self._alertas_mostradas[indice] not in conjunto_nuevas:
+                self.lista_alertas.delete(indice)
+        conjunto_anteriores = set(self._alertas_mostradas)
+        for indice, equipo in enumerate(alertas):
+            if equipo.id not in conjunto_anteriores:
+                self.lista_alertas.insert(indice, f"{equipo.nombre} necesita mantenimiento")
+        self._alertas_mostradas = nuevas
+
+    def _al_modificar_sistema(self, operacion: str, coleccion: str, entidad):
+        """
+        Acumula una modificación del modelo para reflejarla cuando la interfaz esté ociosa.
+
+        :param operacion: "alta", "cambio", "baja" o "carga".
+        :param coleccion: Colección afectada.
+        :param entidad: Entidad afectada.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            # Tk solo puede usarse desde el hilo principal
+            self.trabajos.en_hilo_principal(self._al_modificar_sistema, operacion, coleccion, entidad)
+            return
+
+        if operacion == "carga":
+            # Para la lista, una tarea recién leída del historial es una fila nueva
+            operacion = "alta"
+        pendientes = self._cambios_pendientes.setdefault(coleccion, {})
+        anterior = pendientes.get(entidad.id)
+        if anterior == "alta" and operacion == "baja":
+            # Nunca llegó a mostrarse
+            del pendientes[entidad.id]
+        elif anterior == "alta":
+            pass
+        elif anterior == "baja" and operacion == "alta":
+            pendientes[entidad.id] = "cambio"
+        else:
+            pendientes[entidad.id] = operacion
+
+        if not self._refresco_programado:
+            self._refresco_programado = True
+            self.root.after_idle(self.aplicar_cambios_pendientes)
+
+    def aplicar_cambios_pendientes(self):
+        """
+        Refleja en los listados y en las alertas las modificaciones acumuladas del modelo.
+        """
+        self._refresco_programado = False
+        pendientes, self._cambios_pendientes = self._cambios_pendientes, {}
+        for coleccion, operaciones in pendientes.items():
+            listado = self._listados.get(coleccion)
+            if listado is None or not operaciones:
+                continue
+            listado.aplicar_cambios(
+                altas=[i for i, op in operaciones.items() if op == "alta"],
+                cambios=[i for i, op in operaciones.items() if op == "cambio"],
+                bajas=[i for i, op in operaciones.items() if op == "baja"]
+            )
+        if pendientes:
+            self.actualizar_alertas()
+
+    def _valores_equipo(self, equipo) -> tuple:
+        """
+        Devuelve los valores mostrados en la fila de un equipo.
+
+        :param equipo: Equipo a mostrar.
+        """
+        return equipo.nombre, equipo.ubicacion.nombre
+
+    def _valores_tecnico(self, tecnico) -> tuple:
+        """
+        Devuelve los valores mostrados en la fila de un técnico.
+
+        :param tecnico: Técnico a mostrar.
+        """
+        return tecnico.nombre, tecnico.especialidad
+
+    def _valores_tarea(self, tarea) -> tuple:
+        """
+        Devuelve los valores mostrados en la fila de una tarea.
+
+        :param tarea: Tarea a mostrar.
+        """
+        return tarea.id, tarea.equipo.nombre, tarea.tipo.name, tarea.estado.name
 
     def cambiar_estado_tarea(self):
         """
@@ -181,32 +556,27 @@ class MainWindow:
 
         Alterna entre los estados 'PENDIENTE' y 'COMPLETADA'.
         """
+        if not self._verificar_datos_cargados():
+            return
+
         # Obtener tarea seleccionada
         selected_item = self.tree_tareas.selection()
         if not selected_item:
             messagebox.showwarning("Advertencia", "No hay tarea seleccionada")
             return  # No hay tarea seleccionada
 
-        # Acceder al ID de la tarea desde el primer valor
-        tarea_id = self.tree_tareas.item(selected_item, 'values')[0]
-
-        tarea = next((t for t in self.gestor.sistema.tareas if t.id == tarea_id), None)
+        # El iid de cada fila es el ID de la tarea
+        tarea = self.gestor.sistema.obtener_tarea(selected_item[0])
 
         if tarea:
             # Alternar estado
-            if tarea.estado == EstadoTarea.PENDIENTE:
-                tarea.estado = EstadoTarea.COMPLETADA
-            elif tarea.estado == EstadoTarea.COMPLETADA:
-                tarea.estado = EstadoTarea.PENDIENTE
+            with self.gestor.sistema.bloqueo:
+                if tarea.estado == EstadoTarea.PENDIENTE:
+                    tarea.estado = EstadoTarea.COMPLETADA
+                elif tarea.estado == EstadoTarea.COMPLETADA:
+                    tarea.estado = EstadoTarea.PENDIENTE
             messagebox.showinfo("Éxito", f"Nuevo Estado: '{tarea.estado.name}'")
 
-            # Actualizar Treeview
-            self.actualizar_listados()
-
-            # Guardar cambios en el archivo JSON
-            persistencia = PersistenciaJSON()
-            persistencia.guardar(self.gestor.sistema)
-
     def _crear_boton_ubicacion(self):
         """
         Crea un botón destacado para registrar nuevas ubicaciones.
@@ -230,25 +600,18 @@ class MainWindow:
 
         Si la tarea no existe o no está seleccionada, muestra un mensaje de error.
         """
+        if not self._verificar_datos_cargados():
+            return
+
         # Obtener tarea seleccionada
         selected_item = self.tree_tareas.selection()
         if not selected_item:
             messagebox.showwarning("Advertencia", "No hay tarea seleccionada")
             return
 
-        # Obtener el ID de la tarea seleccionada
-        tarea_id = self.tree_tareas.item(selected_item, 'values')[0]
-
         # Buscar y eliminar la tarea del sistema
-        tarea = next((t for t in self.gestor.sistema.tareas if t.id == tarea_id), None)
+        tarea = self.gestor.sistema.eliminar_tarea(selected_item[0])
         if tarea:
-            self.gestor.sistema.tareas.remove(tarea)
-            # Guardar cambios en el archivo JSON
-            persistencia = PersistenciaJSON()
-            persistencia.guardar(self.gestor.sistema)
-
-            # Actualizar la tabla de tareas
-            self.actualizar_listados()
             messagebox.showinfo("Éxito", f"Tarea '{tarea.tipo.name}' eliminada correctamente")
         else:
             messagebox.showerror("Error", "Tarea no encontrada")
@@ -259,19 +622,21 @@ class MainWindow:
 
         Si el equipo tiene tareas asociadas, muestra un mensaje de error.
         """
+        if not self._verificar_datos_cargados():
+            return
+
         selected_item = self.tree_equipos.selection()
         if not selected_item:
             messagebox.showwarning("Advertencia", "No hay equipo seleccionado")
             return
 
-        equipo_id = self.tree_equipos.item(selected_item, 'values')[0]
-        equipo = next((e for e in self.gestor.sistema.equipos if e.nombre == equipo_id), None)
+        equipo = self.gestor.sistema.obtener_equipo(selected_item[0])
 
-        if equipo and not self.gestor.obtener_tareas_por_equipo(equipo.id):
-            self.gestor.sistema.equipos.remove(equipo)
+        # Las tareas archivadas también lo referencian: eliminarlo las dejaría ilegibles
+        if (equipo and not self.gestor.sistema.equipo_tiene_tareas(equipo.id)
+                and not self.archivo_historico.equipo_tiene_tareas(equipo.id)):
+            self.gestor.sistema.eliminar_equipo(equipo.id)
             messagebox.showinfo("Éxito", f"Equipo '{equipo.nombre}' eliminado correctamente")
-            PersistenciaJSON().guardar(self.gestor.sistema)
-            self.actualizar_listados()
         else:
             messagebox.showerror("Error", "No se puede eliminar el equipo porque tiene tareas asociadas")
 
@@ -281,19 +646,20 @@ class MainWindow:
 
         Si el técnico tiene tareas asociadas, muestra un mensaje de error.
         """
+        if not self._verificar_datos_cargados():
+            return
+
         selected_item = self.tree_tecnicos.selection()
         if not selected_item:
             messagebox.showwarning("Advertencia", "No hay técnico seleccionado")
             return
 
-        tecnico_id = self.tree_tecnicos.item(selected_item, 'values')[0]
-        tecnico = next((t for t in self.gestor.sistema.tecnicos if t.nombre == tecnico_id), None)
+        tecnico = self.gestor.sistema.obtener_tecnico(selected_item[0])
 
-        if tecnico and not self.gestor.obtener_tareas_por_tecnico(tecnico.id):
-            self.gestor.sistema.tecnicos.remove(tecnico)
+        if (tecnico and not self.gestor.sistema.tecnico_tiene_tareas(tecnico.id)
+                and not self.archivo_historico.tecnico_tiene_tareas(tecnico.id)):
+            self.gestor.sistema.eliminar_tecnico(tecnico.id)
             messagebox.showinfo("Éxito", f"Técnico '{tecnico.nombre}' eliminado correctamente")
-            PersistenciaJSON().guardar(self.gestor.sistema)
-            self.actualizar_listados()
         else:
             messagebox.showerror("Error", "No se puede eliminar el técnico porque tiene tareas asociadas")
 
@@ -301,34 +667,63 @@ class MainWindow:
         """
         Abre el formulario para registrar un nuevo equipo.
         """
-        EquipoForm(self.root, self.gestor, self.actualizar_listados)
+        if self._verificar_datos_cargados():
+            EquipoForm(self.root, self.gestor, self.aplicar_cambios_pendientes)
 
     def abrir_form_tecnico(self):
         """
         Abre el formulario para registrar un nuevo técnico.
         """
-        TecnicoForm(self.root, self.gestor, self.actualizar_listados)
+        if self._verificar_datos_cargados():
+            TecnicoForm(self.root, self.gestor, self.aplicar_cambios_pendientes)
 
     def abrir_form_tarea(self):
         """
         Abre el formulario para registrar una nueva tarea.
         """
-        TareaForm(self.root, self.gestor, self.actualizar_listados)
+        if self._verificar_datos_cargados():
+            TareaForm(self.root, self.gestor, self.aplicar_cambios_pendientes)
 
     def mostrar_reportes(self):
         """
         Muestra la vista de reportes generados por el sistema.
         """
-        ReportesView(self.root, self.generador_reportes)
+        generador = self.generador_reportes
+        self._enviar_trabajo(
+            lambda trabajo: calcular_reportes(generador, trabajo), "Calculando reportes",
+            al_terminar=lambda reportes: ReportesView(self.root, generador, reportes), determinado=True
+        )
+
+    def mostrar_recorridos(self):
+        """
+        Muestra los planes diarios de cada técnico con las tareas pendientes agrupadas
+        por ubicación.
+        """
+        self._enviar_trabajo(
+            lambda trabajo: self.gestor.planificar_recorridos(), "Planificando recorridos",
+            al_terminar=lambda planes: RecorridosView(self.root, planes), cancelable=False
+        )
 
     def abrir_form_ubicacion(self):
         """
         Abre el formulario para registrar una nueva ubicación.
         """
-        UbicacionForm(self.root, self.gestor, self.actualizar_listados)
+        if self._verificar_datos_cargados():
+            UbicacionForm(self.root, self.gestor, self.aplicar_cambios_pendientes)
 
     def ejecutar(self):
         """
         Inicia el bucle principal de la interfaz gráfica.
         """
         self.root.mainloop()
+
+    def finalizar(self):
+        """
+        Detiene los trabajos en segundo plano, esperando a los que no se pueden cancelar,
+        y escribe los cambios pendientes del guardado diferido si la carga llegó a completarse.
+        """
+        self.trabajos.cerrar()
+        if self.telemetria is not None:
+            # Las lecturas pendientes se aplican antes del último guardado
+            self.telemetria.cerrar()
+        self.guardado.cerrar(guardar=self.datos_cargados)
@@ -0,0 +1,74 @@
+"""
+Módulo que define la vista de los planes de recorridos por ubicación.
+
+Muestra, por técnico y por día, las ubicaciones que el técnico visita y las tareas
+pendientes que hace en cada una.
+"""
+import tkinter as tk
+from tkinter import ttk
+from typing import Dict, List
+
+from control.recorridos import PlanDia
+
+
+class RecorridosView:
+    """
+    Clase que representa la vista de los planes de recorridos.
+
+    Presenta un árbol con un nodo por técnico, uno por día dentro de cada técnico y una
+    fila por ubicación visitada en el día.
+    """
+
+    def __init__(self, parent, planes: Dict[str, List[PlanDia]]):
+        """
+        Inicializa la vista de recorridos.
+
+        :param parent: Ventana padre donde se abrirá la vista.
+        :param planes: Planes diarios por ID de técnico, como los devuelve
+            GestorMantenimiento.planificar_recorridos.
+        """
+        self.planes = planes
+
+        self.window = tk.Toplevel(parent)
+        self.window.title("Plan de Recorridos por Ubicación")
+        self.window.geometry("800x600")
+
+        self._crear_interfaz()
+        self._cargar_planes()
+
+    def _crear_interfaz(self):
+        """
+        Crea el árbol de planes con su barra de desplazamiento.
+        """
+        frame = ttk.Frame(self.window, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        self.tree = ttk.Treeview(frame, columns=('ubicaciones', 'tareas', 'detalle'))
+        self.tree.heading('#0', text='Técnico / Día / Ubicación')
+        self.tree.heading('ubicaciones', text='Ubicaciones')
+        self.tree.heading('tareas', text='Tareas')
+        self.tree.heading('detalle', text='Equipos')
+        self.tree.column('ubicaciones', width=90, anchor=tk.CENTER)
+        self.tree.column('tareas', width=70, anchor=tk.CENTER)
+
+        barra = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=barra.set)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        barra.pack(side=tk.RIGHT, fill=tk.Y)
+
+    def _cargar_planes(self):
+        """
+        Carga los planes en el árbol, ordenando los técnicos por nombre.
+        """
+        for planes in sorted(self.planes.values(), key=lambda p: p[0].tecnico.nombre):
+            tecnico = planes[0].tecnico
+            tareas = sum(len(plan.tareas) for plan in planes)
+            nodo_tecnico = self.tree.insert('', tk.END, text=f"{tecnico.id} - {tecnico.nombre}",
+                                            values=('', tareas, f"{len(planes)} días"))
+            for plan in planes:
+                nodo_dia = self.tree.insert(nodo_tecnico, tk.END, text=plan.fecha.strftime("%Y-%m-%d"),
+                                            values=(len(plan.visitas), len(plan.tareas), ''))
+                for ubicacion, tareas_ubicacion in plan.visitas:
+                    equipos = ", ".join(sorted({tarea.equipo.nombre for tarea in tareas_ubicacion}))
+                    self.tree.insert(nodo_dia, tk.END, text=ubicacion.nombre,
+                                     values=('', len(tareas_ubicacion), equipos))
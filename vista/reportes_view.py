@@ -17,6 +17,36 @@ from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
 
 
+# Reportes que se muestran en la vista: (clave, método del generador)
+REPORTES = (
+    ("equipos_top", "equipos_con_mas_mantenimientos"),
+    ("tecnicos_top", "tecnicos_mas_activos"),
+    ("fallas", "fallas_recurrentes"),
+    ("tipos", "mantenimientos_por_tipo"),
+)
+
+
+def calcular_reportes(generador_reportes, trabajo=None) -> dict:
+    """
+    Calcula los datos de todos los reportes de la vista.
+
+    Puede ejecutarse en un hilo de trabajo; en ese caso reporta el avance y se detiene
+    entre reportes si el trabajo fue cancelado.
+
+    :param generador_reportes: Objeto encargado de generar los reportes del sistema.
+    :param trabajo: Trabajo en segundo plano que ejecuta el cálculo, si lo hay.
+    :return: Diccionario con el resultado de cada reporte.
+    """
+    reportes = {}
+    for n, (clave, metodo) in enumerate(REPORTES, start=1):
+        if trabajo is not None:
+            trabajo.verificar_cancelacion()
+        reportes[clave] = getattr(generador_reportes, metodo)()
+        if trabajo is not None:
+            trabajo.reportar_progreso(n / len(REPORTES), f"Reporte {n} de {len(REPORTES)}")
+    return reportes
+
+
 class ReportesView:
     """
        Clase que representa la vista de reportes del sistema.
@@ -26,14 +56,17 @@ class ReportesView:
        reportes en formato PDF.
     """
 
-    def __init__(self, parent, generador_reportes):
+    def __init__(self, parent, generador_reportes, reportes: dict = None):
         """
                 Inicializa la vista de reportes.
 
                 :param parent: Ventana padre donde se abrirá la vista de reportes.
                 :param generador_reportes: Objeto encargado de generar los reportes del sistema.
+                :param reportes: Datos de los reportes ya calculados con calcular_reportes.
+                    Si no se indican, se calculan al abrir la vista.
         """
         self.generador = generador_reportes
+        self.reportes = reportes or calcular_reportes(generador_reportes)
 
         self.window = tk.Toplevel(parent)
         self.window.title("Reportes de Mantenimiento")
@@ -100,21 +133,21 @@ class ReportesView:
                 - Fallas recurrentes.
                 - Estadísticas generales.
         """
-        equipos_top = self.generador.equipos_con_mas_mantenimientos()
+        equipos_top = self.reportes["equipos_top"]
         for equipo, count in equipos_top:
             self.tree_equipos.insert('', 'end', values=(equipo.nombre, count))
 
         # Técnicos más activos
-        tecnicos_top = self.generador.tecnicos_mas_activos()
+        tecnicos_top = self.reportes["tecnicos_top"]
         for tecnico, count in tecnicos_top:
             self.tree_tecnicos.insert('', 'end', values=(tecnico.nombre, count))
 
         # Fallas recurrentes
-        fallas = self.generador.fallas_recurrentes()
+        fallas = self.reportes["fallas"]
         for equipo, count in fallas.items():
             self.tree_fallas.insert('', 'end', values=(equipo, count))
 
-        tipos = self.generador.mantenimientos_por_tipo()
+        tipos = self.reportes["tipos"]
         for tipo, count in tipos.items():
             frame = ttk.Frame(self.tipo_frame)
             frame.pack(fill=tk.X, pady=2)
@@ -226,9 +259,10 @@ class ReportesView:
         chart.width = 300
 
         # Datos de la gráfica
-        data = [list(self.generador.mantenimientos_por_tipo().values())]
+        tipos = self.reportes["tipos"]
+        data = [list(tipos.values())]
         chart.data = data
-        chart.categoryAxis.categoryNames = list(self.generador.mantenimientos_por_tipo().keys())
+        chart.categoryAxis.categoryNames = list(tipos.keys())
         chart.bars[0].fillColor = colors.blue
 
         # Configuración del eje Y